@@ -28,6 +28,8 @@ from . import (
     metrics,
     models,
     nn,
+    onnx,
+    parallel,
     plot,
     spect,
     tensorboard,
@@ -59,6 +61,8 @@ __all__ = [
     "Model",
     "models",
     "nn",
+    "onnx",
+    "parallel",
     "plot",
     "spect",
     "split",
@@ -29,6 +29,19 @@ def get_parser():
         help="name of config.toml file to use \n"
         "$ vak train ./configs/config_2018-12-17.toml",
     )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="for prep: add files in data_dir that are not already in the dataset\n"
+        "specified by the csv_path option, instead of making a new dataset\n"
+        "$ vak prep ./configs/config_2018-12-17.toml --append",
+    )
+    parser.add_argument(
+        "--resplit",
+        action="store_true",
+        help="for prep with --append: split the dataset with added files again,\n"
+        "instead of keeping the splits of files already in the dataset",
+    )
     return parser
 
 
@@ -42,7 +55,12 @@ def main():
 
     parser = get_parser()
     args = parser.parse_args()
-    cli.cli(command=args.command, config_file=args.configfile)
+    cli.cli(
+        command=args.command,
+        config_file=args.configfile,
+        append=args.append,
+        resplit=args.resplit,
+    )
 
 
 if __name__ == "__main__":
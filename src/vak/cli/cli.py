@@ -1,4 +1,5 @@
 from .eval import eval
+from .export_onnx import export_onnx
 from .train import train
 from .learncurve import learning_curve
 from .predict import predict
@@ -11,22 +12,36 @@ COMMAND_FUNCTION_MAP = {
     "eval": eval,
     "predict": predict,
     "learncurve": learning_curve,
+    "export-onnx": export_onnx,
 }
 
 CLI_COMMANDS = tuple(COMMAND_FUNCTION_MAP.keys())
 
 
-def cli(command, config_file):
+def cli(command, config_file, append=False, resplit=False):
     """command-line interface
 
     Parameters
     ----------
     command : string
-        One of {'prep', 'train', 'eval', 'predict', 'learncurve'}
+        One of {'prep', 'train', 'eval', 'predict', 'learncurve', 'export-onnx'}
     config_file : str, Path
         path to a config.toml file
+    append : bool
+        if True, ``prep`` adds new files to the dataset specified by 'csv_path'
+        in the config file. Only valid for 'prep'. Default is False.
+    resplit : bool
+        if True, ``prep`` splits the dataset again after adding new files.
+        Only valid for 'prep'. Default is False.
     """
-    if command in COMMAND_FUNCTION_MAP:
-        COMMAND_FUNCTION_MAP[command](toml_path=config_file)
-    else:
+    if command not in COMMAND_FUNCTION_MAP:
         raise ValueError(f"command not recognized: {command}")
+
+    kwargs = {}
+    if append or resplit:
+        if command != "prep":
+            raise ValueError(
+                f"--append and --resplit can only be used with 'prep', not '{command}'"
+            )
+        kwargs = {"append": append, "resplit": resplit}
+    COMMAND_FUNCTION_MAP[command](toml_path=config_file, **kwargs)
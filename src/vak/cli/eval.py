@@ -51,5 +51,9 @@ def eval(toml_path):
         spect_key=cfg.spect_params.spect_key,
         timebins_key=cfg.spect_params.timebins_key,
         device=cfg.eval.device,
+        max_windows_per_batch=cfg.eval.max_windows_per_batch,
+        average_logits=cfg.eval.average_logits,
+        compile=cfg.eval.compile,
+        amp=cfg.eval.amp,
         logger=logger,
     )
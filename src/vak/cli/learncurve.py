@@ -70,5 +70,14 @@ def learning_curve(toml_path):
         ckpt_step=cfg.learncurve.ckpt_step,
         patience=cfg.learncurve.patience,
         device=cfg.learncurve.device,
+        spect_cache_max_bytes=cfg.learncurve.spect_cache_max_bytes,
+        use_spect_store=cfg.learncurve.use_spect_store,
+        shuffle_files_per_group=cfg.learncurve.shuffle_files_per_group,
+        max_windows_per_batch=cfg.learncurve.max_windows_per_batch,
+        compile=cfg.learncurve.compile,
+        amp=cfg.learncurve.amp,
+        log_step=cfg.learncurve.log_step,
+        async_validation=cfg.learncurve.async_validation,
+        val_cache_max_bytes=cfg.learncurve.val_cache_max_bytes,
         logger=logger,
     )
@@ -37,6 +37,22 @@ def predict(toml_path):
     )
     logger.info("Logging results to {}".format(cfg.prep.output_dir))
 
+    if cfg.predict.onnx_path is not None:
+        # graph includes labelmap, window size, and spect scaler
+        core.predict_onnx(
+            csv_path=cfg.predict.csv_path,
+            onnx_path=cfg.predict.onnx_path,
+            spect_key=cfg.spect_params.spect_key,
+            timebins_key=cfg.spect_params.timebins_key,
+            annot_csv_filename=cfg.predict.annot_csv_filename,
+            output_dir=cfg.predict.output_dir,
+            min_segment_dur=cfg.predict.min_segment_dur,
+            majority_vote=cfg.predict.majority_vote,
+            save_net_outputs=cfg.predict.save_net_outputs,
+            logger=logger,
+        )
+        return
+
     model_config_map = config.models.map_from_path(toml_path, cfg.predict.models)
 
     core.predict(
@@ -55,5 +71,10 @@ def predict(toml_path):
         min_segment_dur=cfg.predict.min_segment_dur,
         majority_vote=cfg.predict.majority_vote,
         save_net_outputs=cfg.predict.save_net_outputs,
+        max_windows_per_batch=cfg.predict.max_windows_per_batch,
+        average_logits=cfg.predict.average_logits,
+        quantize=cfg.predict.quantize,
+        compile=cfg.predict.compile,
+        amp=cfg.predict.amp,
         logger=logger,
     )
@@ -38,7 +38,7 @@ def purpose_from_toml(config_toml, toml_path=None):
 SECTIONS_PREP_SHOULD_PARSE = ("PREP", "SPECT_PARAMS")
 
 
-def prep(toml_path):
+def prep(toml_path, append=False, resplit=False):
     """prepare datasets from vocalizations.
     Function called by command-line interface.
 
@@ -47,6 +47,16 @@ def prep(toml_path):
     toml_path : str, Path
         path to a configuration file in TOML format.
         Used to rewrite file with options determined by this function and needed for other functions
+    append : bool
+        if True, add files in 'data_dir' that are not already in the dataset
+        specified by the 'csv_path' option in the config file,
+        instead of making a new dataset. The dataset with the added files
+        is saved as a new .csv file, and the 'csv_path' option is changed to it.
+        Default is False.
+    resplit : bool
+        if True, when ``append`` is True, split the dataset with the added files
+        into training, validation, and test sets again. Default is False,
+        in which case files already in the dataset keep their split.
 
     Returns
     -------
@@ -84,10 +94,20 @@ def prep(toml_path):
     config_toml = _load_toml_from_path(toml_path)
     # ---- figure out purpose of config file from sections; will save csv path in that section -------------------------
     purpose = purpose_from_toml(config_toml, toml_path)
-    if (
+    has_csv_path = (
         "csv_path" in config_toml[purpose.upper()]
         and config_toml[purpose.upper()]["csv_path"] is not None
-    ):
+    )
+    if resplit and not append:
+        raise ValueError("resplit can only be used when appending to a dataset")
+    if append:
+        if not has_csv_path:
+            raise ValueError(
+                f"to append to a dataset, the '{purpose.upper()}' section of the config file "
+                f"must have a 'csv_path' option with the path to the dataset:\n{toml_path}"
+            )
+        append_csv_path = config_toml[purpose.upper()]["csv_path"]
+    elif has_csv_path:
         raise ValueError(
             f"config .toml file already has a 'csv_path' option in the '{purpose.upper()}' section, "
             f"and running `prep` would overwrite that value. To `prep` a new dataset, please remove "
@@ -143,6 +163,16 @@ def prep(toml_path):
         train_dur=cfg.prep.train_dur,
         val_dur=cfg.prep.val_dur,
         test_dur=cfg.prep.test_dur,
+        scheduler=cfg.prep.scheduler,
+        num_workers=cfg.prep.num_workers,
+        partition_size=cfg.prep.partition_size,
+        memory_limit=cfg.prep.memory_limit,
+        spect_cache_dir=cfg.prep.spect_cache_dir,
+        spect_cache_max_bytes=cfg.prep.spect_cache_max_bytes,
+        spect_cache_max_age_days=cfg.prep.spect_cache_max_age_days,
+        spect_cache_hash_audio=cfg.prep.spect_cache_hash_audio,
+        append_csv_path=append_csv_path if append else None,
+        resplit=resplit,
         logger=logger,
     )
 
@@ -66,5 +66,14 @@ def train(toml_path):
         ckpt_step=cfg.train.ckpt_step,
         patience=cfg.train.patience,
         device=cfg.train.device,
+        spect_cache_max_bytes=cfg.train.spect_cache_max_bytes,
+        use_spect_store=cfg.train.use_spect_store,
+        shuffle_files_per_group=cfg.train.shuffle_files_per_group,
+        max_windows_per_batch=cfg.train.max_windows_per_batch,
+        compile=cfg.train.compile,
+        amp=cfg.train.amp,
+        log_step=cfg.train.log_step,
+        async_validation=cfg.train.async_validation,
+        val_cache_max_bytes=cfg.train.val_cache_max_bytes,
         logger=logger,
     )
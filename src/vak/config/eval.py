@@ -3,9 +3,20 @@ import attr
 from attr import converters, validators
 from attr.validators import instance_of
 
-from .validators import is_a_directory, is_a_file, is_valid_model_name
+from .validators import (
+    is_a_directory,
+    is_a_file,
+    is_a_file_or_list_of_files,
+    is_valid_model_name,
+)
 from .. import device
-from ..converters import comma_separated_list, expanded_user_path
+from ..constants import VALID_AMP_DTYPES, VALID_COMPILE_MODES
+from ..converters import (
+    bool_from_str,
+    comma_separated_list,
+    expanded_user_path,
+    expanded_user_path_or_list,
+)
 
 
 @attr.s
@@ -16,8 +27,10 @@ class EvalConfig:
     ----------
     csv_path : str
         path to where dataset was saved as a csv.
-    checkpoint_path : str
-        path to directory with checkpoint files saved by Torch, to reload model
+    checkpoint_path : str, list
+        path to directory with checkpoint files saved by Torch, to reload model.
+        Can be a list of paths, in which case every model is loaded from each
+        checkpoint, and all are run with one pass through the dataset.
     output_dir : str
         Path to location where .csv files with evaluation metrics should be saved.
     labelmap_path : str
@@ -36,10 +49,36 @@ class EvalConfig:
         path to a saved SpectScaler object used to normalize spectrograms.
         If spectrograms were normalized and this is not provided, will give
         incorrect results.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network during evaluation,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    average_logits : bool
+        if True, and there is more than one model or checkpoint,
+        also evaluate an ensemble that averages the outputs of all models.
+        Default is False.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints. Networks compiled with
+        'script' are saved there too, and loaded by later runs with the same checkpoint.
+        If compiling fails, networks are run in eager mode.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision
+        with ``torch.autocast``. 'bfloat16' is supported by recent CPUs,
+        and needs less memory bandwidth than float32.
+        Default is None, in which case networks are run in float32.
     """
 
     # required, external files
-    checkpoint_path = attr.ib(converter=expanded_user_path, validator=is_a_file)
+    checkpoint_path = attr.ib(
+        converter=expanded_user_path_or_list, validator=is_a_file_or_list_of_files
+    )
     labelmap_path = attr.ib(converter=expanded_user_path, validator=is_a_file)
     output_dir = attr.ib(converter=expanded_user_path, validator=is_a_directory)
 
@@ -68,3 +107,19 @@ class EvalConfig:
     # optional, data loader
     num_workers = attr.ib(validator=instance_of(int), default=2)
     device = attr.ib(validator=instance_of(str), default=device.get_default())
+    max_windows_per_batch = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    average_logits = attr.ib(
+        converter=bool_from_str, validator=instance_of(bool), default=False
+    )
+    compile = attr.ib(
+        validator=validators.optional(validators.in_(VALID_COMPILE_MODES)),
+        default=None,
+    )
+    amp = attr.ib(
+        validator=validators.optional(validators.in_(VALID_AMP_DTYPES)),
+        default=None,
+    )
@@ -38,8 +38,8 @@ REQUIRED_OPTIONS = {
         "num_replicates",
     ],
     "PREDICT": [
-        "checkpoint_path",
-        "labelmap_path",
+        # checkpoint_path and labelmap_path are not required with onnx_path,
+        # PredictConfig checks for them
         "models",
     ],
     "PREP": [
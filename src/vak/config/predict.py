@@ -6,9 +6,20 @@ import attr
 from attr import converters, validators
 from attr.validators import instance_of
 
-from .validators import is_a_directory, is_a_file, is_valid_model_name
+from .validators import (
+    is_a_directory,
+    is_a_file,
+    is_a_file_or_list_of_files,
+    is_valid_model_name,
+)
 from .. import device
-from ..converters import comma_separated_list, expanded_user_path
+from ..constants import VALID_AMP_DTYPES, VALID_COMPILE_MODES, VALID_QUANTIZE_MODES
+from ..converters import (
+    bool_from_str,
+    comma_separated_list,
+    expanded_user_path,
+    expanded_user_path_or_list,
+)
 
 
 @attr.s
@@ -19,10 +30,14 @@ class PredictConfig:
      ----------
      csv_path : str
          path to where dataset was saved as a csv.
-     checkpoint_path : str
-         path to directory with checkpoint files saved by Torch, to reload model
+     checkpoint_path : str, list
+         path to directory with checkpoint files saved by Torch, to reload model.
+         Can be a list of paths, in which case every model is loaded from each
+         checkpoint, and all are run with one pass through the dataset.
+         Required unless ``onnx_path`` is specified.
      labelmap_path : str
          path to 'labelmap.json' file.
+         Required unless ``onnx_path`` is specified.
      models : list
          of model names. e.g., 'models = TweetyNet, GRUNet, ConvNet'
      batch_size : int
@@ -68,12 +83,44 @@ class PredictConfig:
          spectrogram with `spect_path` filename `gy6or6_032312_081416.npz`,
          and the network is `TweetyNet`, then the net output file
          will be `gy6or6_032312_081416.tweetynet.output.npz`.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network to make predictions,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    average_logits : bool
+        if True, and there is more than one model or checkpoint,
+        also make predictions with an ensemble that averages the outputs of all models.
+        Default is False.
+    onnx_path : str
+        path to a graph saved by `vak export-onnx`. If specified,
+        predictions are made with the graph using onnxruntime on the CPU,
+        instead of with models loaded from `checkpoint_path`.
+        The labelmap and spectrogram scaler saved in the graph are used,
+        and ``checkpoint_path`` and ``labelmap_path`` are not required.
+        Default is None.
+    quantize : str
+        if 'dynamic', apply dynamic int8 quantization to the LSTM and linear layers
+        of networks before making predictions on the CPU, and log how often
+        frame labels agree with the original networks on a sample of files.
+        Default is None, in which case networks are not quantized.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints. Networks compiled with
+        'script' are saved there too, and loaded by later runs with the same checkpoint.
+        If compiling fails, networks are run in eager mode.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision
+        with ``torch.autocast``. 'bfloat16' is supported by recent CPUs,
+        and needs less memory bandwidth than float32.
+        Default is None, in which case networks are run in float32.
     """
 
-    # required, external files
-    checkpoint_path = attr.ib(converter=expanded_user_path, validator=is_a_file)
-    labelmap_path = attr.ib(converter=expanded_user_path, validator=is_a_file)
-
     # required, model / dataloader
     models = attr.ib(
         converter=comma_separated_list,
@@ -81,6 +128,18 @@ class PredictConfig:
     )
     batch_size = attr.ib(converter=int, validator=instance_of(int))
 
+    # required unless onnx_path is specified, external files
+    checkpoint_path = attr.ib(
+        converter=converters.optional(expanded_user_path_or_list),
+        validator=validators.optional(is_a_file_or_list_of_files),
+        default=None,
+    )
+    labelmap_path = attr.ib(
+        converter=converters.optional(expanded_user_path),
+        validator=validators.optional(is_a_file),
+        default=None,
+    )
+
     # csv_path is actually 'required' but we can't enforce that here because cli.prep looks at
     # what sections are defined to figure out where to add csv_path after it creates the csv
     csv_path = attr.ib(
@@ -113,3 +172,36 @@ class PredictConfig:
     )
     majority_vote = attr.ib(validator=instance_of(bool), default=True)
     save_net_outputs = attr.ib(validator=instance_of(bool), default=False)
+    max_windows_per_batch = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    average_logits = attr.ib(
+        converter=bool_from_str, validator=instance_of(bool), default=False
+    )
+    onnx_path = attr.ib(
+        converter=converters.optional(expanded_user_path),
+        validator=validators.optional(is_a_file),
+        default=None,
+    )
+    quantize = attr.ib(
+        validator=validators.optional(validators.in_(VALID_QUANTIZE_MODES)),
+        default=None,
+    )
+    compile = attr.ib(
+        validator=validators.optional(validators.in_(VALID_COMPILE_MODES)),
+        default=None,
+    )
+    amp = attr.ib(
+        validator=validators.optional(validators.in_(VALID_AMP_DTYPES)),
+        default=None,
+    )
+
+    def __attrs_post_init__(self):
+        if self.onnx_path is None:
+            for option in ("checkpoint_path", "labelmap_path"):
+                if getattr(self, option) is None:
+                    raise ValueError(
+                        f"must specify {option} when onnx_path is not specified"
+                    )
@@ -3,6 +3,7 @@ import attr
 from attr import converters, validators
 from attr.validators import instance_of
 
+from .. import constants
 from .validators import (
     is_a_directory,
     is_a_file,
@@ -10,7 +11,7 @@ from .validators import (
     is_annot_format,
     is_spect_format,
 )
-from ..converters import expanded_user_path, labelset_to_set
+from ..converters import bool_from_str, expanded_user_path, labelset_to_set
 
 
 def duration_from_toml_value(value):
@@ -84,6 +85,36 @@ class PrepConfig:
         total duration of validation set, in seconds.
     test_dur : float
         total duration of test set, in seconds.
+    scheduler : str
+        dask scheduler used to make spectrograms, validate files, and make records
+        in parallel. One of {'threads', 'processes', 'distributed'}.
+        'distributed' starts a local cluster and requires the ``distributed`` package.
+        Default is None, in which case the default scheduler for dask bags is used,
+        a pool of processes.
+    num_workers : int
+        number of threads or processes used by ``scheduler``.
+        Default is None, in which case dask uses the number of CPU cores.
+    partition_size : int
+        number of files in each partition of dask bags, i.e. in each task
+        sent to a worker. Default is None, in which case dask divides files
+        into at most 100 partitions.
+    memory_limit : str, int
+        memory limit for each worker when ``scheduler`` is 'distributed',
+        in bytes or as a string, e.g. '4GB'. Default is None, in which case
+        the memory of the machine is divided between workers.
+    spect_cache_dir : str
+        path to directory where spectrogram files made from audio files are cached,
+        so they are not made again when the audio files and [SPECT_PARAMS]
+        are the same. Default is None, in which case no cache is used.
+    spect_cache_max_bytes : int
+        maximum size of spectrogram cache, in bytes. When the cache is larger,
+        least recently used files are removed. Default is None.
+    spect_cache_max_age_days : float
+        number of days after which unused files are removed from spectrogram cache.
+        Default is None.
+    spect_cache_hash_audio : bool
+        if True, detect changes to audio files with a hash of their contents,
+        instead of their size and modification time. Default is False.
     """
 
     data_dir = attr.ib(converter=expanded_user_path, validator=is_a_directory)
@@ -124,6 +155,41 @@ class PrepConfig:
         validator=validators.optional(is_valid_duration),
         default=None,
     )
+    scheduler = attr.ib(
+        validator=validators.optional(validators.in_(constants.VALID_DASK_SCHEDULERS)),
+        default=None,
+    )
+    num_workers = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    partition_size = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    memory_limit = attr.ib(
+        validator=validators.optional(instance_of((str, int))), default=None
+    )
+    spect_cache_dir = attr.ib(
+        converter=converters.optional(expanded_user_path),
+        validator=validators.optional(is_a_directory),
+        default=None,
+    )
+    spect_cache_max_bytes = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    spect_cache_max_age_days = attr.ib(
+        converter=converters.optional(float),
+        validator=validators.optional(instance_of(float)),
+        default=None,
+    )
+    spect_cache_hash_audio = attr.ib(
+        converter=bool_from_str, validator=instance_of(bool), default=False
+    )
 
     def __attrs_post_init__(self):
         if self.audio_format is not None and self.spect_format is not None:
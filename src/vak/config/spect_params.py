@@ -27,6 +27,9 @@ def is_valid_transform_type(instance, attribute, value):
         )
 
 
+VALID_DTYPES = {"float32", "float64"}
+
+
 @attr.s
 class SpectParamsConfig:
     """represents parameters for making spectrograms from audio and saving in files
@@ -57,6 +60,15 @@ class SpectParamsConfig:
     audio_path_key : str
         key for accessing path to source audio file for spectogram in files.
         Default is 'audio_path'.
+    dtype : str
+        floating point type of spectrograms, one of {'float32', 'float64'}.
+        Default is 'float32'.
+    block_size : int
+        number of audio samples read from files at a time to make spectrograms.
+        Columns of spectrograms are computed from each block and written to files,
+        so that long audio files can be converted without loading them into memory.
+        Spectrograms are the same as when files are loaded all at once.
+        Default is None, in which case each audio file is loaded all at once.
     """
 
     fft_size = attr.ib(converter=int, validator=instance_of(int), default=512)
@@ -77,3 +89,9 @@ class SpectParamsConfig:
     freqbins_key = attr.ib(validator=instance_of(str), default="f")
     timebins_key = attr.ib(validator=instance_of(str), default="t")
     audio_path_key = attr.ib(validator=instance_of(str), default="audio_path")
+    dtype = attr.ib(validator=validators.in_(VALID_DTYPES), default="float32")
+    block_size = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
@@ -5,6 +5,7 @@ from attr.validators import instance_of
 
 from .validators import is_a_directory, is_a_file, is_valid_model_name
 from .. import device
+from ..constants import VALID_AMP_DTYPES, VALID_COMPILE_MODES
 from ..converters import bool_from_str, comma_separated_list, expanded_user_path
 
 
@@ -55,6 +56,60 @@ class TrainConfig:
         number of validation steps to wait without performance on the
         validation set improving before stopping the training.
         Default is None, in which case training only stops after the specified number of epochs.
+    spect_cache_max_bytes : int
+        maximum size in bytes of the cache of spectrograms that each
+        process loading training data keeps in memory, so that windows
+        from the same file do not each require loading that file.
+        Default is None, in which case spectrograms are not cached.
+    use_spect_store : bool
+        if True, write all spectrograms in the training split to a single
+        file in the results directory, and read windows from that file
+        with a memory map instead of loading individual spectrogram files.
+        Default is False.
+    shuffle_files_per_group : int
+        if specified, shuffle training data by splitting files into groups of
+        this size, and then shuffling windows only within each group,
+        so that each batch contains windows from only a few files.
+        See ``vak.datasets.FileLocalityBatchSampler``.
+        Only used if shuffle is True. Default is None, in which case
+        windows are shuffled across all files.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network when computing metrics on the validation set,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints.
+        If compiling fails, networks are run in eager mode.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision
+        with ``torch.autocast``. 'bfloat16' is supported by recent CPUs,
+        and needs less memory bandwidth than float32.
+        Default is None, in which case networks are run in float32.
+    log_step : int
+        number of training steps between updates of the progress bar
+        and writes of the training loss to TensorBoard. The loss is kept on the device
+        between these steps, so training does not wait to copy it on every step.
+        The loss from every step is still written to TensorBoard.
+        Default is None, in which case the loss is logged on every step.
+    async_validation : bool
+        if True, on each validation step take a snapshot of the network,
+        and compute metrics on the validation set for the snapshot in a background
+        thread while training continues. The max-val-acc checkpoint is saved
+        from the snapshot, and early stopping with ``patience`` is applied
+        when the validation step finishes. Default is False.
+    val_cache_max_bytes : int
+        maximum size in bytes of validation items kept in memory.
+        If specified, validation spectrograms are loaded and transformed once,
+        before training starts, and re-used every validation step.
+        Items that do not fit are loaded from files on every validation step.
+        Default is None, in which case validation items are not cached.
     """
 
     # required
@@ -108,3 +163,42 @@ class TrainConfig:
         validator=validators.optional(instance_of(int)),
         default=None,
     )
+    spect_cache_max_bytes = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    use_spect_store = attr.ib(
+        converter=bool_from_str, validator=instance_of(bool), default=False
+    )
+    shuffle_files_per_group = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    max_windows_per_batch = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    compile = attr.ib(
+        validator=validators.optional(validators.in_(VALID_COMPILE_MODES)),
+        default=None,
+    )
+    amp = attr.ib(
+        validator=validators.optional(validators.in_(VALID_AMP_DTYPES)),
+        default=None,
+    )
+    log_step = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
+    async_validation = attr.ib(
+        converter=bool_from_str, validator=instance_of(bool), default=False
+    )
+    val_cache_max_bytes = attr.ib(
+        converter=converters.optional(int),
+        validator=validators.optional(instance_of(int)),
+        default=None,
+    )
@@ -25,6 +25,15 @@ def is_a_file(instance, attribute, value):
         )
 
 
+def is_a_file_or_list_of_files(instance, attribute, value):
+    """check if given path is a file, or if every path in a list is a file"""
+    if type(value) is list:
+        for element in value:
+            is_a_file(instance, attribute, element)
+    else:
+        is_a_file(instance, attribute, value)
+
+
 def is_valid_model_name(instance, attribute, value):
     MODEL_NAMES = [model_name for model_name, model_builder in models.find()]
     for model_name in value:
@@ -25,6 +25,23 @@ VALID_SPECT_FORMATS = list(SPECT_FORMAT_LOAD_FUNCTION_MAP.keys())
 VALID_ANNOT_FORMATS = crowsetta.formats._INSTALLED
 NO_ANNOTATION_FORMAT = "none"
 
+# ---- compiling networks, used by vak.Model ----
+VALID_COMPILE_MODES = ("script", "compile")
+# name of directory next to checkpoints where compiled kernels and networks are cached
+COMPILE_CACHE_DIRNAME = "compile_cache"
+# suffix of networks compiled with torch.jit.script, saved in COMPILE_CACHE_DIRNAME
+COMPILE_SCRIPT_SUFFIX = ".script.pt"
+
+# ---- mixed precision, used by vak.Model ----
+# reduced-precision dtypes that networks can be run in with torch.autocast
+VALID_AMP_DTYPES = ("bfloat16", "float16")
+
+# ---- quantization of trained networks, used by predict ----
+VALID_QUANTIZE_MODES = ("dynamic",)
+
+# ---- dask schedulers used to prepare datasets in parallel, used by prep ----
+VALID_DASK_SCHEDULERS = ("threads", "processes", "distributed")
+
 # format for timestamps
 STRFTIME_TIMESTAMP = "%y%m%d_%H%M%S"
 
@@ -34,3 +51,4 @@ RESULTS_DIR_PREFIX = "results_"
 # ---- output (default) file extensions. Using the `pathlib` name "suffix" ----
 ANNOT_CSV_SUFFIX = ".annot.csv"
 NET_OUTPUT_SUFFIX = ".output.npz"
+ONNX_SUFFIX = ".onnx"
@@ -24,6 +24,13 @@ def expanded_user_path(value):
     return Path(value).expanduser()
 
 
+def expanded_user_path_or_list(value):
+    if type(value) is list:
+        return [expanded_user_path(element) for element in value]
+    else:
+        return expanded_user_path(value)
+
+
 def range_str(range_str, sort=True):
     """Generate range of ints from a formatted string,
     then convert range from int to str
@@ -1,5 +1,7 @@
 from .eval import eval
+from .export_onnx import export_onnx
 from .learncurve import learning_curve
 from .predict import predict
+from .predict_onnx import predict_onnx
 from .prep import prep
 from .train import train
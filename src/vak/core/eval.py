@@ -7,7 +7,10 @@ import pandas as pd
 import torch.utils.data
 
 from .. import models
+from ..engine import ensemble
 from .. import transforms
+from ..datasets.collate import collate_window_batch
+from ..datasets.samplers import WindowPackingBatchSampler
 from ..datasets.vocal_dataset import VocalDataset
 from ..logging import log_or_print
 
@@ -25,6 +28,10 @@ def eval(
     spect_key="s",
     timebins_key="t",
     device=None,
+    max_windows_per_batch=None,
+    average_logits=False,
+    compile=None,
+    amp=None,
     logger=None,
 ):
     """evaluate a trained model
@@ -35,8 +42,11 @@ def eval(
         path to where dataset was saved as a csv.
     model_config_map : dict
         where each key-value pair is model name : dict of config parameters
-    checkpoint_path : str, pathlib.Path
-        path to directory with checkpoint files saved by Torch, to reload model
+    checkpoint_path : str, pathlib.Path, list
+        path to directory with checkpoint files saved by Torch, to reload model.
+        Can be a list of paths, in which case every model
+        is loaded from each checkpoint,
+        and all are evaluated in a single pass through the dataset.
     output_dir : str, pathlib.Path
         Path to location where .csv files with evaluation metrics should be saved.
     window_size : int
@@ -66,6 +76,31 @@ def eval(
     device : str
         Device on which to work with model + data.
         Defaults to 'cuda' if torch.cuda.is_available is True.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network during evaluation,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    average_logits : bool
+        if True, and more than one model is evaluated,
+        also evaluate the average of the outputs of all the models.
+        Metrics for the average are saved in a .csv with 'ensemble' in its name.
+        Default is False.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints. Networks compiled with
+        'script' are saved there too, and loaded by later runs with the same checkpoint.
+        If compiling fails, networks are run in eager mode.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision with
+        ``torch.autocast``, casting windows to that dtype before they are fed
+        to networks. Outputs of networks are converted back to float32.
+        Default is None, in which case networks are run in float32.
 
     Other Parameters
     ----------------
@@ -120,13 +155,26 @@ def eval(
         timebins_key=timebins_key,
         item_transform=item_transform,
     )
-    val_data = torch.utils.data.DataLoader(
-        dataset=val_dataset,
-        shuffle=False,
-        # batch size 1 because each spectrogram reshaped into a batch of windows
-        batch_size=1,
-        num_workers=num_workers,
-    )
+    if max_windows_per_batch is not None:
+        val_data = torch.utils.data.DataLoader(
+            dataset=val_dataset,
+            batch_sampler=WindowPackingBatchSampler.from_dataset(
+                val_dataset,
+                window_size=window_size,
+                max_windows=max_windows_per_batch,
+                spect_key=spect_key,
+            ),
+            collate_fn=collate_window_batch,
+            num_workers=num_workers,
+        )
+    else:
+        val_data = torch.utils.data.DataLoader(
+            dataset=val_dataset,
+            shuffle=False,
+            # batch size 1 because each spectrogram reshaped into a batch of windows
+            batch_size=1,
+            num_workers=num_workers,
+        )
 
     # ---------------- do the actual evaluating ------------------------------------------------------------------------
     input_shape = val_dataset.shape
@@ -135,22 +183,58 @@ def eval(
     if len(input_shape) == 4:
         input_shape = input_shape[1:]
 
-    models_map = models.from_model_config_map(
-        model_config_map, num_classes=len(labelmap), input_shape=input_shape
+    models_map, checkpoint_path_map = models.from_checkpoints(
+        model_config_map,
+        checkpoint_path,
+        num_classes=len(labelmap),
+        input_shape=input_shape,
+        device=device,
+        logger=logger,
     )
 
-    for model_name, model in models_map.items():
+    if len(models_map) == 1:
+        model_name, model = next(iter(models_map.items()))
         log_or_print(
             f"running evaluation for model: {model_name}", logger=logger, level="info"
         )
-        model.load(checkpoint_path, device=device)
-        metric_vals = model.evaluate(eval_data=val_data, device=device)
+        metric_vals_map = {
+            model_name: model.evaluate(
+                eval_data=val_data,
+                device=device,
+                max_windows=max_windows_per_batch,
+                compile=compile,
+                amp=amp,
+            )
+        }
+    else:
+        log_or_print(
+            f"running evaluation for models: {list(models_map.keys())}",
+            logger=logger,
+            level="info",
+        )
+        # load each batch once and feed it to every model
+        metric_vals_map = ensemble.evaluate(
+            models_map,
+            eval_data=val_data,
+            device=device,
+            max_windows=max_windows_per_batch,
+            average_logits=average_logits,
+            compile=compile,
+            amp=amp,
+        )
+
+    for model_name, metric_vals in metric_vals_map.items():
+        # the average of outputs from all models was computed using all checkpoints
+        all_checkpoint_paths = dict.fromkeys(checkpoint_path_map.values())
+        model_checkpoint_path = checkpoint_path_map.get(
+            model_name, ";".join(str(path) for path in all_checkpoint_paths)
+        )
         # create a "DataFrame" with just one row which we will save as a csv;
         # the idea is to be able to concatenate csvs from multiple runs of eval
         row = OrderedDict(
             [
                 ("model_name", model_name),
-                ("checkpoint_path", checkpoint_path),
+                ("checkpoint_path", model_checkpoint_path),
                 ("labelmap_path", labelmap_path),
                 ("spect_scaler_path", spect_scaler_path),
                 ("csv_path", csv_path),
@@ -0,0 +1,132 @@
+import json
+import os
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from .. import (
+    constants,
+    files,
+    io,
+)
+from .. import models
+from .. import onnx
+from ..logging import log_or_print
+
+
+def export_onnx(
+    csv_path,
+    checkpoint_path,
+    labelmap_path,
+    model_config_map,
+    window_size,
+    spect_key="s",
+    spect_scaler_path=None,
+    output_dir=None,
+    logger=None,
+):
+    """export trained models to ONNX graphs, that can be used to make predictions
+    with onnxruntime instead of torch. Function called by command-line interface.
+
+    Each graph is self-contained: it includes the transforms applied to spectrograms
+    before they are fed to the network, and the labelmap is saved in its metadata.
+    See ``vak.onnx.export``.
+
+    Parameters
+    ----------
+    csv_path : str
+        path to where dataset was saved as a csv.
+        Used to determine the number of frequency bins in spectrograms.
+    checkpoint_path : str, list
+        path to directory with checkpoint files saved by Torch, to reload model.
+        Can be a list of paths, in which case a graph is exported
+        for every model loaded from each checkpoint.
+    labelmap_path : str
+        path to 'labelmap.json' file.
+    model_config_map : dict
+        where each key-value pair is model name : dict of config parameters
+    window_size : int
+        size of windows taken from spectrograms, in number of time bins,
+        shown to neural networks
+    spect_key : str
+        key for accessing spectrogram in files. Default is 's'.
+    spect_scaler_path : str
+        path to a saved SpectScaler object used to normalize spectrograms.
+        If specified, the standardization is included in the exported graph.
+    output_dir : str, Path
+        path to location where graphs should be saved,
+        with the name of the model and the extension '.onnx'.
+        Defaults to current working directory.
+
+    Other Parameters
+    ----------------
+    logger : logging.Logger
+        instance created by vak.logging.get_logger. Default is None.
+
+    Returns
+    -------
+    None
+    """
+    if output_dir is None:
+        output_dir = Path(os.getcwd())
+    else:
+        output_dir = Path(output_dir)
+
+    if not output_dir.is_dir():
+        raise NotADirectoryError(
+            f"value specified for output_dir is not recognized as a directory: {output_dir}"
+        )
+
+    if spect_scaler_path:
+        log_or_print(
+            f"loading SpectScaler from path: {spect_scaler_path}",
+            logger=logger,
+            level="info",
+        )
+        spect_standardizer = joblib.load(spect_scaler_path)
+    else:
+        log_or_print(
+            f"Not loading SpectScaler, no path was specified",
+            logger=logger,
+            level="info",
+        )
+        spect_standardizer = None
+
+    log_or_print(
+        f"loading labelmap from path: {labelmap_path}", logger=logger, level="info"
+    )
+    with Path(labelmap_path).open("r") as f:
+        labelmap = json.load(f)
+
+    dataset_df = pd.read_csv(csv_path)
+    if io.dataframe.has_spect_metadata(dataset_df):
+        n_freqbins = int(dataset_df["n_freqbins"].values[0])
+    else:
+        spect_path = dataset_df["spect_path"].values[0]
+        n_freqbins = files.spect.load(spect_path)[spect_key].shape[0]
+    input_shape = (1, n_freqbins, window_size)
+
+    models_map, _ = models.from_checkpoints(
+        model_config_map,
+        checkpoint_path,
+        num_classes=len(labelmap),
+        input_shape=input_shape,
+        device="cpu",
+        logger=logger,
+    )
+    for model_name, model in models_map.items():
+        onnx_path = output_dir.joinpath(f"{model_name}{constants.ONNX_SUFFIX}")
+        log_or_print(
+            f"exporting {model_name} to ONNX graph: {onnx_path}",
+            logger=logger,
+            level="info",
+        )
+        onnx.export.export(
+            model.network,
+            onnx_path,
+            labelmap=labelmap,
+            window_size=window_size,
+            n_freqbins=n_freqbins,
+            spect_standardizer=spect_standardizer,
+        )
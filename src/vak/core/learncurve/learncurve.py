@@ -1,11 +1,12 @@
 import re
 
-import numpy as np
 import pandas as pd
 
 from . import train_dur_csv_paths as _train_dur_csv_paths
 from ..eval import eval
 from ..train import train
+from ...datasets.spect_store import SpectStore
+from ...datasets.window_index import WindowIndex
 from ...io import dataframe
 from ... import csv, labels
 from ...converters import expanded_user_path
@@ -34,6 +35,15 @@ def learning_curve(
     ckpt_step=None,
     patience=None,
     device=None,
+    spect_cache_max_bytes=None,
+    use_spect_store=False,
+    shuffle_files_per_group=None,
+    max_windows_per_batch=None,
+    compile=None,
+    amp=None,
+    log_step=None,
+    async_validation=False,
+    val_cache_max_bytes=None,
     logger=None,
 ):
     """generate learning curve, by training models on training sets across a
@@ -110,6 +120,55 @@ def learning_curve(
         number of validation steps to wait without performance on the
         validation set improving before stopping the training.
         Default is None, in which case training only stops after the specified number of epochs.
+    spect_cache_max_bytes : int
+        maximum size in bytes of the cache of spectrograms that each
+        process loading training data keeps in memory.
+        Default is None, in which case spectrograms are not cached.
+    use_spect_store : bool
+        if True, write all spectrograms in the training split to a
+        ``vak.datasets.SpectStore`` in ``results_path``, and read windows
+        for training each replicate from that store, instead of loading
+        individual spectrogram files. Default is False.
+    shuffle_files_per_group : int
+        if specified, shuffle training data by splitting files into groups of
+        this size, and then shuffling windows only within each group,
+        so that each batch contains windows from only a few files.
+        See ``vak.datasets.FileLocalityBatchSampler``.
+        Only used if shuffle is True. Default is None, in which case
+        windows are shuffled across all files.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network when computing metrics on the validation and test sets,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints. Networks compiled with
+        'script' are saved there too, and loaded by later runs with the same checkpoint.
+        Used both for training and for evaluating on the test set.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision with
+        ``torch.autocast``, casting windows to that dtype before they are fed
+        to networks. Outputs of networks are converted back to float32.
+        Used both for training and for evaluating on the test set.
+        Default is None, in which case networks are run in float32.
+    log_step : int
+        number of training steps between updates of the progress bar
+        and writes of the training loss to TensorBoard.
+        Default is None, in which case the loss is logged on every step.
+    async_validation : bool
+        if True, compute metrics on the validation set for a snapshot of the network
+        in a background thread while training continues. Default is False.
+    val_cache_max_bytes : int
+        maximum size in bytes of validation items kept in memory,
+        so that validation spectrograms are loaded and transformed only once.
+        See ``vak.datasets.CachedDataset``. Default is None,
+        in which case validation items are loaded on every validation step.
 
     Other Parameters
     ----------------
@@ -210,6 +269,18 @@ def learning_curve(
             logger,
         )
 
+    if use_spect_store:
+        # write one store with entire training split, that all subsets will use
+        spect_store_dir = results_path.joinpath("spect_store")
+        SpectStore.write(
+            dataset_df[dataset_df["split"] == "train"]["spect_path"].values,
+            spect_store_dir,
+            spect_key=spect_key,
+            logger=logger,
+        )
+    else:
+        spect_store_dir = None
+
     # ---- main loop that creates "learning curve" ---------------------------------------------------------------------
     log_or_print(f"Starting training for learning curve.", logger=logger, level="info")
     for train_dur, csv_paths in train_dur_csv_paths.items():
@@ -238,17 +309,11 @@ def learning_curve(
                 level="info",
             )
 
-            window_dataset_kwargs = {}
-            for window_dataset_kwarg in [
-                "spect_id_vector",
-                "spect_inds_vector",
-                "x_inds",
-            ]:
-                window_dataset_kwargs[window_dataset_kwarg] = np.load(
-                    this_train_dur_this_replicate_results_path.joinpath(
-                        f"{window_dataset_kwarg}.npy"
-                    )
+            window_index = WindowIndex.load(
+                this_train_dur_this_replicate_results_path.joinpath(
+                    WindowIndex.FILENAME
                 )
+            )
 
             train(
                 model_config_map,
@@ -267,8 +332,18 @@ def learning_curve(
                 ckpt_step=ckpt_step,
                 patience=patience,
                 device=device,
+                spect_cache_max_bytes=spect_cache_max_bytes,
+                use_spect_store=use_spect_store,
+                spect_store_dir=spect_store_dir,
+                shuffle_files_per_group=shuffle_files_per_group,
+                max_windows_per_batch=max_windows_per_batch,
+                window_index=window_index,
+                compile=compile,
+                amp=amp,
+                log_step=log_step,
+                async_validation=async_validation,
+                val_cache_max_bytes=val_cache_max_bytes,
                 logger=logger,
-                **window_dataset_kwargs,
             )
 
             log_or_print(
@@ -339,6 +414,9 @@ def learning_curve(
                     spect_key=spect_key,
                     timebins_key=timebins_key,
                     device=device,
+                    max_windows_per_batch=max_windows_per_batch,
+                    compile=compile,
+                    amp=amp,
                     logger=logger,
                 )
 
@@ -3,12 +3,12 @@ import pprint
 import re
 import shutil
 
-import numpy as np
 import pandas as pd
 
 from ... import split
 from ...converters import expanded_user_path
 from ...datasets.window_dataset import WindowDataset
+from ...datasets.window_index import WindowIndex
 from ...logging import log_or_print
 
 
@@ -201,11 +201,7 @@ def from_dir(
             )
 
             subset_df = pd.read_csv(csv_path)
-            (
-                spect_id_vector,
-                spect_inds_vector,
-                x_inds,
-            ) = WindowDataset.spect_vectors_from_df(
+            window_index = WindowDataset.window_index_from_df(
                 subset_df,
                 "train",
                 window_size,
@@ -215,11 +211,9 @@ def from_dir(
                 timebin_dur=timebin_dur,
                 labelmap=labelmap,
             )
-            for vec_name, vec in zip(
-                ["spect_id_vector", "spect_inds_vector", "x_inds"],
-                [spect_id_vector, spect_inds_vector, x_inds],
-            ):
-                np.save(results_path_this_replicate.joinpath(f"{vec_name}.npy"), vec)
+            window_index.save(
+                results_path_this_replicate.joinpath(WindowIndex.FILENAME)
+            )
 
         train_dur_csv_paths[train_dur] = new_csv_paths
 
@@ -343,12 +337,8 @@ def from_df(
             train_split_df = train_split_df[
                 train_split_df.split == "train"
             ]  # remove rows where split set to 'None'
-            # ---- use *just* train subset to get spect vectors for WindowDataset
-            (
-                spect_id_vector,
-                spect_inds_vector,
-                x_inds,
-            ) = WindowDataset.spect_vectors_from_df(
+            # ---- use *just* train subset to get window index for WindowDataset
+            window_index = WindowDataset.window_index_from_df(
                 train_split_df,
                 "train",
                 window_size,
@@ -358,11 +348,9 @@ def from_df(
                 timebin_dur=timebin_dur,
                 labelmap=labelmap,
             )
-            for vec_name, vec in zip(
-                ["spect_id_vector", "spect_inds_vector", "x_inds"],
-                [spect_id_vector, spect_inds_vector, x_inds],
-            ):
-                np.save(results_path_this_replicate.joinpath(f"{vec_name}.npy"), vec)
+            window_index.save(
+                results_path_this_replicate.joinpath(WindowIndex.FILENAME)
+            )
             # keep the same validation and test set by concatenating them with the train subset
             subset_df = pd.concat(
                 (
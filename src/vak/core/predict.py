@@ -6,7 +6,6 @@ import crowsetta
 import joblib
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 import torch.utils.data
 
 from .. import (
@@ -16,9 +15,11 @@ from .. import (
     labeled_timebins,
 )
 from ..logging import log_or_print
+from .. import engine
 from .. import models
 from .. import transforms
-from ..datasets import VocalDataset
+from ..datasets import VocalDataset, WindowPackingBatchSampler
+from ..datasets.collate import collate_window_batch
 from ..device import get_default as get_default_device
 
 
@@ -38,6 +39,11 @@ def predict(
     min_segment_dur=None,
     majority_vote=False,
     save_net_outputs=False,
+    max_windows_per_batch=None,
+    average_logits=False,
+    quantize=None,
+    compile=None,
+    amp=None,
     logger=None,
 ):
     """make predictions on dataset with trained model specified in config.toml file.
@@ -47,8 +53,14 @@ def predict(
      ----------
      csv_path : str
          path to where dataset was saved as a csv.
-     checkpoint_path : str
-         path to directory with checkpoint files saved by Torch, to reload model
+     checkpoint_path : str, list
+         path to directory with checkpoint files saved by Torch, to reload model.
+         Can be a list of paths, in which case every model
+         is loaded from each checkpoint,
+         and all make predictions in a single pass through the dataset.
+         Annotations from each are saved in a separate .csv file,
+         whose name starts with the name of the model and the index of the checkpoint,
+         e.g. 'TweetyNet_ckpt0'.
      labelmap_path : str
          path to 'labelmap.json' file.
      model_config_map : dict
@@ -101,6 +113,41 @@ def predict(
          spectrogram with `spect_path` filename `gy6or6_032312_081416.npz`,
          and the network is `TweetyNet`, then the net output file
          will be `gy6or6_032312_081416.tweetynet.output.npz`.
+    max_windows_per_batch : int
+         if specified, pack windows from several files into each batch
+         fed to the network to make predictions,
+         so that each batch has at most this many windows.
+         Windows from a file with more windows than this are fed to the network
+         in chunks, so that memory used does not depend on the duration of files.
+         See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+         in which case each batch has all the windows from one file.
+    average_logits : bool
+         if True, and more than one model makes predictions,
+         also convert the average of the outputs of all the models to annotations,
+         that are saved in a .csv file whose name starts with 'ensemble'.
+         Default is False.
+    quantize : str
+         if specified, quantize networks before making predictions.
+         The only valid mode is 'dynamic', that applies dynamic int8 quantization
+         to the torch.nn.LSTM and torch.nn.Linear layers of networks.
+         Quantized networks are run on the CPU. Before making predictions,
+         the fraction of frames where labels from the quantized network agree
+         with the original network is computed on a sample of files and logged.
+         See ``vak.engine.quantize``. Default is None.
+     compile : str
+         if 'script', compile networks with ``torch.jit.script``; if 'compile',
+         compile them with ``torch.compile``, and cache compiled kernels
+         in a 'compile_cache' directory next to checkpoints.
+         Networks compiled with 'script' are saved there too,
+         and loaded by later runs with the same checkpoint.
+         If compiling fails, networks are run in eager mode.
+         Default is None, in which case networks are run in eager mode.
+     amp : str
+         if 'bfloat16' or 'float16', run networks in mixed precision with
+         ``torch.autocast``, casting windows to that dtype before they are fed
+         to networks. Outputs of networks are converted back to float32.
+         Not used with ``quantize``, since quantized layers only run in float32.
+         Default is None, in which case networks are run in float32.
 
      Other Parameters
      ----------------
@@ -123,6 +170,21 @@ def predict(
 
     if device is None:
         device = get_default_device()
+    if quantize is not None and device != "cpu":
+        log_or_print(
+            f"networks with {quantize} quantization are run on the CPU, "
+            f"not using device: {device}",
+            logger=logger,
+            level="info",
+        )
+        device = "cpu"
+        if amp is not None:
+            log_or_print(
+                f"quantized networks are run in float32, not using amp dtype: {amp}",
+                logger=logger,
+                level="info",
+            )
+            amp = None
 
     # ---------------- load data for prediction ------------------------------------------------------------------------
     if spect_scaler_path:
@@ -167,13 +229,26 @@ def predict(
         item_transform=item_transform,
     )
 
-    pred_data = torch.utils.data.DataLoader(
-        dataset=pred_dataset,
-        shuffle=False,
-        # batch size 1 because each spectrogram reshaped into a batch of windows
-        batch_size=1,
-        num_workers=num_workers,
-    )
+    if max_windows_per_batch is not None:
+        pred_data = torch.utils.data.DataLoader(
+            dataset=pred_dataset,
+            batch_sampler=WindowPackingBatchSampler.from_dataset(
+                pred_dataset,
+                window_size=window_size,
+                max_windows=max_windows_per_batch,
+                spect_key=spect_key,
+            ),
+            collate_fn=collate_window_batch,
+            num_workers=num_workers,
+        )
+    else:
+        pred_data = torch.utils.data.DataLoader(
+            dataset=pred_dataset,
+            shuffle=False,
+            # batch size 1 because each spectrogram reshaped into a batch of windows
+            batch_size=1,
+            num_workers=num_workers,
+        )
 
     # ---------------- set up to convert predictions to annotation files -----------------------------------------------
     if annot_csv_filename is None:
@@ -210,36 +285,99 @@ def predict(
         logger=logger,
         level="info",
     )
-    models_map = models.from_model_config_map(
-        model_config_map, num_classes=len(labelmap), input_shape=input_shape
+    models_map, _ = models.from_checkpoints(
+        model_config_map,
+        checkpoint_path,
+        num_classes=len(labelmap),
+        input_shape=input_shape,
+        device=device,
+        logger=logger,
     )
-    for model_name, model in models_map.items():
-        # ---------------- do the actual predicting --------------------------------------------------------------------
+    if quantize is not None:
+        for model_name, model in models_map.items():
+            quantized_model = engine.quantize.quantize(model, quantize)
+            agreement, n_files = engine.quantize.frame_agreement(
+                model, quantized_model, pred_data, max_windows=max_windows_per_batch
+            )
+            if np.isnan(agreement):
+                log_or_print(
+                    f"could not compute agreement of frame labels from {model_name} "
+                    f"with {quantize} quantization and float network, "
+                    f"because a sample of {n_files} files had no frames",
+                    logger=logger,
+                    level="warning",
+                )
+            else:
+                log_or_print(
+                    f"frame labels from {model_name} with {quantize} quantization "
+                    f"agree with float network on {agreement:.2%} of frames, "
+                    f"in a sample of {n_files} files",
+                    logger=logger,
+                    level="info",
+                )
+            models_map[model_name] = quantized_model
+    if len(models_map) == 1:
+        model_name, model = next(iter(models_map.items()))
         log_or_print(
-            f"loading checkpoint for {model_name} from path: {checkpoint_path}",
+            f"running predict method of {model_name} "
+            "and converting predictions to annotations",
             logger=logger,
             level="info",
         )
-        model.load(checkpoint_path, device=device)
-        log_or_print(
-            f"running predict method of {model_name}", logger=logger, level="info"
+        predictions = (
+            (batch, {model_name: y_pred})
+            for batch, y_pred in model.iter_predict(
+                pred_data=pred_data,
+                device=device,
+                max_windows=max_windows_per_batch,
+                compile=compile,
+                amp=amp,
+            )
         )
-        pred_dict = model.predict(pred_data=pred_data, device=device)
-
-        # ----------------  converting to annotations ------------------------------------------------------------------
-        progress_bar = tqdm(pred_data)
-
-        annots = []
+        annot_csv_paths = {model_name: annot_csv_path}
+    else:
         log_or_print(
-            "converting predictions to annotations", logger=logger, level="info"
+            f"making predictions with models: {list(models_map.keys())} "
+            "and converting predictions to annotations",
+            logger=logger,
+            level="info",
+        )
+        # load each batch once and feed it to every model
+        predictions = engine.ensemble.iter_predict(
+            models_map,
+            pred_data=pred_data,
+            device=device,
+            max_windows=max_windows_per_batch,
+            average_logits=average_logits,
+            compile=compile,
+            amp=amp,
         )
-        for ind, batch in enumerate(progress_bar):
-            padding_mask, spect_path = batch["padding_mask"], batch["spect_path"]
-            padding_mask = np.squeeze(padding_mask)
-            if isinstance(spect_path, list) and len(spect_path) == 1:
-                spect_path = spect_path[0]
-            y_pred = pred_dict[spect_path]
+        names = list(models_map.keys())
+        if average_logits:
+            names.append(engine.ensemble.ENSEMBLE_NAME)
+        annot_csv_paths = {
+            name: annot_csv_path.parent.joinpath(f"{name}.{annot_csv_path.name}")
+            for name in names
+        }
+        for name, path in annot_csv_paths.items():
+            log_or_print(
+                f"will save annotations from {name} in .csv file: {path}",
+                logger=logger,
+                level="info",
+            )
 
+    # convert each prediction to an annotation as soon as the network outputs it,
+    # instead of keeping outputs for all files and then loading files again
+    annots = {name: [] for name in annot_csv_paths}
+    for batch, outputs in predictions:
+        padding_mask, spect_path = batch["padding_mask"], batch["spect_path"]
+        padding_mask = np.squeeze(padding_mask)
+        if isinstance(spect_path, list) and len(spect_path) == 1:
+            spect_path = spect_path[0]
+        t = batch["timebins"][0].numpy()
+        audio_fname = files.spect.find_audio_fname(spect_path)
+
+        for model_name, y_pred in outputs.items():
             if save_net_outputs:
                 # not sure if there's a better way to get outputs into right shape;
                 # can't just call y_pred.reshape() because that basically flattens the whole array first
@@ -256,8 +394,6 @@ def predict(
             y_pred = torch.argmax(y_pred, dim=1)  # assumes class dimension is 1
             y_pred = torch.flatten(y_pred).cpu().numpy()[padding_mask]
 
-            spect_dict = files.spect.load(spect_path)
-            t = spect_dict[timebins_key]
             labels, onsets_s, offsets_s = labeled_timebins.lbl_tb2segments(
                 y_pred,
                 labelmap=labelmap,
@@ -268,11 +404,14 @@ def predict(
             seq = crowsetta.Sequence.from_keyword(
                 labels=labels, onsets_s=onsets_s, offsets_s=offsets_s
             )
-
-            audio_fname = files.spect.find_audio_fname(spect_path)
             annot = crowsetta.Annotation(
-                seq=seq, audio_path=audio_fname, annot_path=annot_csv_path.name
+                seq=seq,
+                audio_path=audio_fname,
+                annot_path=annot_csv_paths[model_name].name,
             )
-            annots.append(annot)
+            annots[model_name].append(annot)
 
-        crowsetta.csv.annot2csv(annot=annots, csv_filename=annot_csv_path)
+    for model_name, model_annots in annots.items():
+        crowsetta.csv.annot2csv(
+            annot=model_annots, csv_filename=annot_csv_paths[model_name]
+        )
@@ -0,0 +1,140 @@
+import os
+from pathlib import Path
+
+import crowsetta
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from .. import (
+    constants,
+    files,
+    labeled_timebins,
+)
+from ..logging import log_or_print
+from ..onnx.runtime import OnnxPredictor
+
+
+def predict_onnx(
+    csv_path,
+    onnx_path,
+    spect_key="s",
+    timebins_key="t",
+    annot_csv_filename=None,
+    output_dir=None,
+    min_segment_dur=None,
+    majority_vote=False,
+    save_net_outputs=False,
+    logger=None,
+):
+    """make predictions on dataset with a graph exported by ``vak export-onnx``,
+    using onnxruntime on the CPU instead of torch.
+    Function called by command-line interface.
+
+    The labelmap, window size, and spectrogram standardization
+    are all loaded from the graph.
+
+    Parameters
+    ----------
+    csv_path : str
+        path to where dataset was saved as a csv.
+    onnx_path : str, Path
+        path to graph saved by ``vak export-onnx``.
+    spect_key : str
+        key for accessing spectrogram in files. Default is 's'.
+    timebins_key : str
+        key for accessing vector of time bins in files. Default is 't'.
+    annot_csv_filename : str
+        name of .csv file containing predicted annotations.
+        Default is None, in which case the name of the dataset .csv
+        is used, with '.annot.csv' appended to it.
+    output_dir : str, Path
+        path to location where .csv containing predicted annotation
+        should be saved. Defaults to current working directory.
+    min_segment_dur : float
+        minimum duration of segment, in seconds. If specified, then
+        any segment with a duration less than min_segment_dur is
+        removed from lbl_tb. Default is None, in which case no
+        segments are removed.
+    majority_vote : bool
+        if True, transform segments containing multiple labels
+        into segments with a single label by taking a "majority vote",
+        i.e. assign all time bins in the segment the most frequently
+        occurring label in the segment. Default is False.
+    save_net_outputs : bool
+        if True, save 'raw' outputs of neural networks
+        before they are converted to annotations. Default is False.
+        Outputs are saved as they are by ``vak.core.predict``,
+        using the name of the graph file instead of the model name,
+        e.g. `gy6or6_032312_081416.TweetyNet.output.npz`.
+
+    Other Parameters
+    ----------------
+    logger : logging.Logger
+        instance created by vak.logging.get_logger. Default is None.
+
+    Returns
+    -------
+    None
+    """
+    if output_dir is None:
+        output_dir = Path(os.getcwd())
+    else:
+        output_dir = Path(output_dir)
+
+    if not output_dir.is_dir():
+        raise NotADirectoryError(
+            f"value specified for output_dir is not recognized as a directory: {output_dir}"
+        )
+
+    log_or_print(
+        f"loading ONNX graph from path: {onnx_path}", logger=logger, level="info"
+    )
+    predictor = OnnxPredictor(onnx_path)
+    labelmap = predictor.labelmap
+    model_name = Path(onnx_path).stem
+
+    dataset_df = pd.read_csv(csv_path)
+    if not dataset_df["split"].str.contains("predict").any():
+        raise ValueError(f"split predict not found in dataset in csv: {csv_path}")
+    dataset_df = dataset_df[dataset_df["split"] == "predict"]
+
+    if annot_csv_filename is None:
+        annot_csv_filename = Path(csv_path).stem + constants.ANNOT_CSV_SUFFIX
+    annot_csv_path = Path(output_dir).joinpath(annot_csv_filename)
+    log_or_print(
+        f"will save annotations in .csv file: {annot_csv_path}",
+        logger=logger,
+        level="info",
+    )
+
+    annots = []
+    for spect_path in tqdm(dataset_df["spect_path"].values):
+        spect_dict = files.spect.load(spect_path)
+        logits = predictor(spect_dict[spect_key])
+
+        if save_net_outputs:
+            net_output_path = output_dir.joinpath(
+                Path(spect_path).stem + f"{model_name}{constants.NET_OUTPUT_SUFFIX}"
+            )
+            np.savez(net_output_path, logits)
+
+        y_pred = np.argmax(logits, axis=0)
+        labels, onsets_s, offsets_s = labeled_timebins.lbl_tb2segments(
+            y_pred,
+            labelmap=labelmap,
+            t=spect_dict[timebins_key],
+            min_segment_dur=min_segment_dur,
+            majority_vote=majority_vote,
+        )
+        seq = crowsetta.Sequence.from_keyword(
+            labels=labels, onsets_s=onsets_s, offsets_s=offsets_s
+        )
+
+        audio_fname = files.spect.find_audio_fname(spect_path)
+        annot = crowsetta.Annotation(
+            seq=seq, audio_path=audio_fname, annot_path=annot_csv_path.name
+        )
+        annots.append(annot)
+
+    crowsetta.csv.annot2csv(annot=annots, csv_filename=annot_csv_path)
@@ -1,10 +1,15 @@
 from datetime import datetime
 from pathlib import Path
+import time
 import warnings
 
-from .. import split
+import pandas as pd
+
+from .. import parallel, split
 from ..converters import expanded_user_path, labelset_to_set
 from ..io import dataframe
+from ..io.spect import SPECT_METADATA_COLUMNS
+from ..io.spect_cache import SpectFileCache
 from ..logging import log_or_print
 
 
@@ -32,6 +37,16 @@ def prep(
     train_dur=None,
     val_dur=None,
     test_dur=None,
+    scheduler=None,
+    num_workers=None,
+    partition_size=None,
+    memory_limit=None,
+    spect_cache_dir=None,
+    spect_cache_max_bytes=None,
+    spect_cache_max_age_days=None,
+    spect_cache_hash_audio=False,
+    append_csv_path=None,
+    resplit=False,
     logger=None,
 ):
     """prepare datasets from vocalizations.
@@ -79,6 +94,50 @@ def prep(
         total duration of validation set, in seconds. Default is None.
     test_dur : float
         total duration of test set, in seconds. Default is None.
+    scheduler : str
+        dask scheduler used to make spectrograms, validate files,
+        and make records in parallel. One of ``vak.constants.VALID_DASK_SCHEDULERS``.
+        Default is None, in which case the default scheduler for dask bags is used,
+        a pool of processes. See ``vak.parallel.dask_scheduler`` for details.
+    num_workers : int
+        number of threads or processes used by ``scheduler``.
+        Default is None, in which case dask uses the number of CPU cores.
+    partition_size : int
+        number of files in each partition of dask bags, i.e. in each task
+        sent to a worker. Default is None, in which case dask divides files
+        into at most 100 partitions.
+    memory_limit : str, int
+        memory limit for each worker when ``scheduler`` is 'distributed',
+        in bytes or as a string, e.g. '4GB'. Default is None.
+    spect_cache_dir : str, Path
+        directory where spectrogram files made from audio files are cached,
+        so they are not made again when the audio files and ``spect_params``
+        are the same. Default is None, in which case no cache is used.
+        See ``vak.io.spect_cache.SpectFileCache`` for details.
+    spect_cache_max_bytes : int
+        maximum size of spectrogram cache, in bytes. When the cache is larger,
+        least recently used files are removed. Default is None.
+    spect_cache_max_age_days : float
+        number of days after which unused files are removed from spectrogram cache.
+        Default is None.
+    spect_cache_hash_audio : bool
+        if True, detect changes to audio files with a hash of their contents,
+        instead of their size and modification time. Default is False.
+    append_csv_path : str, Path
+        path to a .csv file saved by a previous run of ``prep``, that represents
+        a dataset made from files in ``data_dir``. If specified, only files
+        in ``data_dir`` that are not already in that dataset are processed,
+        and they are added to the dataset, which is saved as a new .csv file.
+        Default is None, in which case a new dataset is made from all files.
+    resplit : bool
+        if True, and ``append_csv_path`` is specified, split the dataset
+        with the added files into training, validation, and test sets again,
+        using ``train_dur``, ``val_dur``, and ``test_dur``. If False,
+        files already in the dataset keep their split, and added files
+        are assigned to the 'train' split if ``purpose`` is 'train' or 'learncurve',
+        to the 'test' split if it is 'eval', and to the 'predict' split
+        if it is 'predict'.
+        Default is False.
 
     Other Parameters
     ----------------
@@ -154,6 +213,16 @@ def prep(
         if not spect_output_dir.is_dir():
             raise NotADirectoryError(f"spect_output_dir not found: {spect_output_dir}")
 
+    if spect_cache_dir:
+        spect_cache = SpectFileCache(
+            expanded_user_path(spect_cache_dir),
+            max_bytes=spect_cache_max_bytes,
+            max_age_days=spect_cache_max_age_days,
+            hash_audio=spect_cache_hash_audio,
+        )
+    else:
+        spect_cache = None
+
     if purpose == "predict":
         if labelset is not None:
             warnings.warn(
@@ -201,20 +270,82 @@ def prep(
             log_or_print(msg="will split dataset", logger=logger, level="info")
             do_split = True
 
+    if append_csv_path is not None:
+        append_csv_path = expanded_user_path(append_csv_path)
+        log_or_print(
+            f"will add files not already in dataset from .csv file: {append_csv_path}",
+            logger=logger,
+            level="info",
+        )
+        existing_df = pd.read_csv(append_csv_path)
+        source_path_col = "audio_path" if audio_format else "spect_path"
+        exclude_files = set(existing_df[source_path_col].values)
+    else:
+        existing_df = None
+        exclude_files = None
+
     # ---- actually make the dataset -----------------------------------------------------------------------------------
-    vak_df = dataframe.from_files(
-        labelset=labelset,
-        data_dir=data_dir,
-        annot_format=annot_format,
-        annot_file=annot_file,
-        audio_format=audio_format,
-        spect_format=spect_format,
-        spect_output_dir=spect_output_dir,
-        spect_params=spect_params,
+    tic = time.perf_counter()
+    with parallel.dask_scheduler(scheduler, num_workers, memory_limit, logger=logger):
+        vak_df = dataframe.from_files(
+            labelset=labelset,
+            data_dir=data_dir,
+            annot_format=annot_format,
+            annot_file=annot_file,
+            audio_format=audio_format,
+            spect_format=spect_format,
+            spect_output_dir=spect_output_dir,
+            spect_params=spect_params,
+            partition_size=partition_size,
+            spect_cache=spect_cache,
+            exclude_files=exclude_files,
+            logger=logger,
+        )
+    elapsed = time.perf_counter() - tic
+    log_or_print(
+        f"made dataset from {len(vak_df)} files in {elapsed:.2f} s, "
+        f"{len(vak_df) / elapsed:.2f} files per second, "
+        f"with dask scheduler: {scheduler if scheduler else 'processes (default)'}",
         logger=logger,
+        level="info",
     )
 
-    if do_split:
+    if existing_df is not None:
+        if not dataframe.has_spect_metadata(existing_df):
+            # dataset prepared with earlier version, keep columns the same
+            vak_df = vak_df.drop(columns=SPECT_METADATA_COLUMNS)
+        if resplit:
+            # split all files again, below
+            existing_df = existing_df.drop(columns="split")
+        elif len(vak_df) > 0:
+            if purpose == "eval":
+                append_split_name = "test"
+            elif purpose == "predict":
+                append_split_name = "predict"
+            else:
+                append_split_name = "train"
+            log_or_print(
+                msg=f"adding {len(vak_df)} files to split: {append_split_name}",
+                logger=logger,
+                level="info",
+            )
+            vak_df = dataframe.add_split_col(vak_df, split=append_split_name)
+        if len(vak_df) > 0:
+            vak_df = pd.concat([existing_df, vak_df], ignore_index=True)
+        else:
+            log_or_print(
+                msg="did not find any files that are not already in dataset",
+                logger=logger,
+                level="info",
+            )
+            vak_df = existing_df
+        # raises an error if added files have a different time bin duration
+        dataframe.validate_and_get_timebin_dur(vak_df)
+
+    if existing_df is not None and not resplit:
+        # files already in dataset keep their split
+        pass
+    elif do_split:
         # save before splitting, jic duration args are not valid (we can't know until we make dataset)
         vak_df.to_csv(csv_path)
         vak_df = split.dataframe(
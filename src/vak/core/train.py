@@ -10,6 +10,10 @@ from .. import labels
 from .. import models
 from .. import tensorboard
 from .. import transforms
+from ..datasets.cached_dataset import CachedDataset
+from ..datasets.collate import collate_window_batch
+from ..datasets.samplers import FileLocalityBatchSampler, WindowPackingBatchSampler
+from ..datasets.spect_store import SpectStore
 from ..datasets.window_dataset import WindowDataset
 from ..datasets.vocal_dataset import VocalDataset
 from ..device import get_default as get_default_device
@@ -31,14 +35,22 @@ def train(
     spect_key="s",
     timebins_key="t",
     normalize_spectrograms=True,
-    spect_id_vector=None,
-    spect_inds_vector=None,
-    x_inds=None,
+    window_index=None,
     shuffle=True,
     val_step=None,
     ckpt_step=None,
     patience=None,
     device=None,
+    spect_cache_max_bytes=None,
+    use_spect_store=False,
+    spect_store_dir=None,
+    shuffle_files_per_group=None,
+    max_windows_per_batch=None,
+    compile=None,
+    amp=None,
+    log_step=None,
+    async_validation=False,
+    val_cache_max_bytes=None,
     logger=None,
 ):
     """train models using training set specified in config.toml file.
@@ -85,23 +97,10 @@ def train(
         Normalization is done by subtracting off the mean for each frequency bin
         of the training set and then dividing by the std for that frequency bin.
         This same normalization is then applied to validation + test data.
-    spect_id_vector : numpy.ndarray
-        Parameter for WindowDataset. Represents the 'id' of any spectrogram,
-        i.e., the index into spect_paths that will let us load it.
-        Default is None.
-    spect_inds_vector : numpy.ndarray
-        Parameter for WindowDataset. Same length as spect_id_vector
-        but values represent indices within each spectrogram.
-        Default is None.
-    x_inds : numpy.ndarray
-        Parameter for WindowDataset.
-        Indices of each window in the dataset. The value at x[0]
-        represents the start index of the first window; using that
-        value, we can index into spect_id_vector to get the path
-        of the spectrogram file to load, and we can index into
-        spect_inds_vector to index into the spectrogram itself
-        and get the window.
-        Default is None.
+    window_index : vak.datasets.WindowIndex
+        Parameter for WindowDataset. Index of all valid windows in the training set,
+        e.g. after cropping it to a target duration. Default is None,
+        in which case all windows from the training split are used.
     val_step : int
         Step on which to estimate accuracy using validation set.
         If val_step is n, then validation is carried out every time
@@ -116,6 +115,58 @@ def train(
         number of validation steps to wait without performance on the
         validation set improving before stopping the training.
         Default is None, in which case training only stops after the specified number of epochs.
+    spect_cache_max_bytes : int
+        maximum size in bytes of the cache of spectrograms that each
+        process loading training data keeps in memory.
+        Default is None, in which case spectrograms are not cached.
+    use_spect_store : bool
+        if True, read windows for training from a ``vak.datasets.SpectStore``,
+        a single file with all spectrograms that is read with a memory map,
+        instead of loading individual spectrogram files. Default is False.
+    spect_store_dir : str, pathlib.Path
+        directory containing a store created with ``vak.datasets.SpectStore.write``
+        that includes all spectrograms in the training split.
+        Only used if ``use_spect_store`` is True. Default is None,
+        in which case a new store is written in ``results_path``.
+    shuffle_files_per_group : int
+        if specified, shuffle training data by splitting files into groups of
+        this size, and then shuffling windows only within each group,
+        so that each batch contains windows from only a few files.
+        See ``vak.datasets.FileLocalityBatchSampler``.
+        Only used if shuffle is True. Default is None, in which case
+        windows are shuffled across all files.
+    max_windows_per_batch : int
+        if specified, pack windows from several files into each batch
+        fed to the network when computing metrics on the validation set,
+        so that each batch has at most this many windows.
+        Windows from a file with more windows than this are fed to the network
+        in chunks, so that memory used does not depend on the duration of files.
+        See ``vak.datasets.WindowPackingBatchSampler``. Default is None,
+        in which case each batch has all the windows from one file.
+    compile : str
+        if 'script', compile networks with ``torch.jit.script``; if 'compile',
+        compile them with ``torch.compile``, and cache compiled kernels
+        in a 'compile_cache' directory next to checkpoints.
+        If compiling fails, networks are trained in eager mode.
+        Default is None, in which case networks are run in eager mode.
+    amp : str
+        if 'bfloat16' or 'float16', run networks in mixed precision with
+        ``torch.autocast``, casting windows to that dtype before they are fed
+        to networks. Outputs of networks are converted back to float32.
+        If 'float16', gradients are scaled so they do not underflow.
+        Default is None, in which case networks are run in float32.
+    log_step : int
+        number of training steps between updates of the progress bar
+        and writes of the training loss to TensorBoard.
+        Default is None, in which case the loss is logged on every step.
+    async_validation : bool
+        if True, compute metrics on the validation set for a snapshot of the network
+        in a background thread while training continues. Default is False.
+    val_cache_max_bytes : int
+        maximum size in bytes of validation items kept in memory,
+        so that validation spectrograms are loaded and transformed only once.
+        See ``vak.datasets.CachedDataset``. Default is None,
+        in which case validation items are loaded on every validation step.
 
     Other Parameters
     ----------------
@@ -190,19 +241,40 @@ def train(
         # and make too tight a coupling between this function and that one.
         # Trade off is that this is pretty verbose (even ignoring my comments)
         log_or_print("will normalize spectrograms", logger=logger, level="info")
-        spect_standardizer = transforms.StandardizeSpect.fit_df(
-            dataset_df, spect_key=spect_key
+        spect_standardizer, n_timebins_fit = transforms.StandardizeSpect.fit_df(
+            dataset_df, spect_key=spect_key, split="train", return_n_timebins=True
+        )
+        log_or_print(
+            f"fit spectrogram standardizer to {n_timebins_fit} time bins from training set",
+            logger=logger,
+            level="info",
         )
         joblib.dump(spect_standardizer, results_path.joinpath("StandardizeSpect"))
     else:
         spect_standardizer = None
     transform, target_transform = transforms.get_defaults("train", spect_standardizer)
 
+    if use_spect_store:
+        if spect_store_dir is None:
+            spect_store = SpectStore.write(
+                dataset_df[dataset_df["split"] == "train"]["spect_path"].values,
+                results_path.joinpath("spect_store"),
+                spect_key=spect_key,
+                logger=logger,
+            )
+        else:
+            log_or_print(
+                f"using spectrogram store: {spect_store_dir}",
+                logger=logger,
+                level="info",
+            )
+            spect_store = SpectStore.from_dir(spect_store_dir)
+    else:
+        spect_store = None
+
     train_dataset = WindowDataset.from_csv(
         csv_path=csv_path,
-        x_inds=x_inds,
-        spect_id_vector=spect_id_vector,
-        spect_inds_vector=spect_inds_vector,
+        window_index=window_index,
         split="train",
         labelmap=labelmap,
         window_size=window_size,
@@ -210,18 +282,36 @@ def train(
         timebins_key=timebins_key,
         transform=transform,
         target_transform=target_transform,
+        spect_cache_max_bytes=spect_cache_max_bytes,
+        spect_store=spect_store,
     )
     log_or_print(
         f"Duration of WindowDataset used for training, in seconds: {train_dataset.duration()}",
         logger=logger,
         level="info",
     )
-    train_data = torch.utils.data.DataLoader(
-        dataset=train_dataset,
-        shuffle=shuffle,
-        batch_size=batch_size,
-        num_workers=num_workers,
-    )
+    if shuffle and shuffle_files_per_group is not None:
+        log_or_print(
+            f"shuffling windows within groups of {shuffle_files_per_group} files",
+            logger=logger,
+            level="info",
+        )
+        train_data = torch.utils.data.DataLoader(
+            dataset=train_dataset,
+            batch_sampler=FileLocalityBatchSampler(
+                train_dataset.window_spect_ids(),
+                batch_size=batch_size,
+                files_per_group=shuffle_files_per_group,
+            ),
+            num_workers=num_workers,
+        )
+    else:
+        train_data = torch.utils.data.DataLoader(
+            dataset=train_dataset,
+            shuffle=shuffle,
+            batch_size=batch_size,
+            num_workers=num_workers,
+        )
 
     # ---------------- load validation set (if there is one) -----------------------------------------------------------
     if val_step:
@@ -239,13 +329,39 @@ def train(
             timebins_key=timebins_key,
             item_transform=item_transform,
         )
-        val_data = torch.utils.data.DataLoader(
-            dataset=val_dataset,
-            shuffle=False,
-            # batch size 1 because each spectrogram reshaped into a batch of windows
-            batch_size=1,
-            num_workers=num_workers,
-        )
+        val_num_workers = num_workers
+        if val_cache_max_bytes is not None:
+            val_dataset = CachedDataset(val_dataset, max_bytes=val_cache_max_bytes)
+            n_cached = val_dataset.fill(num_workers=num_workers)
+            log_or_print(
+                f"cached {n_cached} of {len(val_dataset)} items from validation set "
+                f"in memory, using {val_dataset.nbytes} bytes",
+                logger=logger,
+                level="info",
+            )
+            if n_cached == len(val_dataset):
+                # no need to start worker processes just to copy items from memory
+                val_num_workers = 0
+        if max_windows_per_batch is not None:
+            val_data = torch.utils.data.DataLoader(
+                dataset=val_dataset,
+                batch_sampler=WindowPackingBatchSampler.from_dataset(
+                    val_dataset,
+                    window_size=window_size,
+                    max_windows=max_windows_per_batch,
+                    spect_key=spect_key,
+                ),
+                collate_fn=collate_window_batch,
+                num_workers=val_num_workers,
+            )
+        else:
+            val_data = torch.utils.data.DataLoader(
+                dataset=val_dataset,
+                shuffle=False,
+                # batch size 1 because each spectrogram reshaped into a batch of windows
+                batch_size=1,
+                num_workers=val_num_workers,
+            )
         val_dur = dataframe.split_dur(dataset_df, "val")
         log_or_print(
             f"Total duration of validation split from dataset (in s): {val_dur}",
@@ -289,4 +405,9 @@ def train(
             ckpt_step=ckpt_step,
             patience=patience,
             device=device,
+            max_windows=max_windows_per_batch,
+            compile=compile,
+            amp=amp,
+            log_step=log_step,
+            async_validation=async_validation,
         )
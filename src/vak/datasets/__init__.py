@@ -1,4 +1,20 @@
+from . import collate
+from .cached_dataset import CachedDataset
+from .samplers import FileLocalityBatchSampler, WindowPackingBatchSampler
+from .spect_cache import SpectCache
+from .spect_store import SpectStore
 from .vocal_dataset import VocalDataset
 from .window_dataset import WindowDataset
+from .window_index import WindowIndex
 
-__all__ = ["VocalDataset", "WindowDataset"]
+__all__ = [
+    "collate",
+    "CachedDataset",
+    "FileLocalityBatchSampler",
+    "SpectCache",
+    "SpectStore",
+    "VocalDataset",
+    "WindowDataset",
+    "WindowIndex",
+    "WindowPackingBatchSampler",
+]
@@ -0,0 +1,141 @@
+import numpy as np
+import torch
+
+
+def _identity(item):
+    """used as ``collate_fn`` by ``CachedDataset.fill``, so that items
+    are returned as they are, without converting arrays to tensors"""
+    return item
+
+
+def item_nbytes(item):
+    """number of bytes occupied by the arrays and tensors in an item
+
+    Parameters
+    ----------
+    item : dict
+        returned by ``VocalDataset.__getitem__``.
+
+    Returns
+    -------
+    nbytes : int
+        sum of bytes occupied by values that are ``numpy.ndarray``
+        or ``torch.Tensor``. Other values, e.g. paths, are not counted.
+    """
+    nbytes = 0
+    for val in item.values():
+        if isinstance(val, np.ndarray):
+            nbytes += val.nbytes
+        elif isinstance(val, torch.Tensor):
+            nbytes += val.element_size() * val.nelement()
+    return nbytes
+
+
+class CachedDataset:
+    """dataset that keeps items from another dataset in memory,
+    so that they are loaded and transformed only once.
+
+    Used for the validation set during training, where the same items
+    are loaded and transformed every time metrics are computed,
+    even though they never change. Items are cached until they occupy
+    ``max_bytes``; items that do not fit are loaded from the wrapped dataset
+    every time, as they would be without the cache.
+
+    Any attribute not defined by this class, e.g. ``labelmap`` or ``shape``,
+    is looked up on the wrapped dataset.
+
+    Attributes
+    ----------
+    dataset : vak.datasets.VocalDataset
+        dataset whose items are cached.
+    max_bytes : int
+        maximum number of bytes that cached items can occupy.
+    nbytes : int
+        number of bytes currently occupied by cached items.
+    """
+
+    def __init__(self, dataset, max_bytes):
+        """initialize a new CachedDataset instance
+
+        Parameters
+        ----------
+        dataset : vak.datasets.VocalDataset
+            dataset whose items are cached.
+        max_bytes : int
+            maximum number of bytes that cached items can occupy.
+        """
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool):
+            raise TypeError(
+                f"max_bytes must be an int but type was: {type(max_bytes)}"
+            )
+        if max_bytes < 0:
+            raise ValueError(
+                f"max_bytes must be a non-negative integer but was: {max_bytes}"
+            )
+
+        self.dataset = dataset
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = {}
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this instance.
+        # Don't look up 'dataset' itself, e.g. when unpickling in a worker process,
+        # which would recurse before it is set
+        if name == "dataset":
+            raise AttributeError(name)
+        return getattr(self.dataset, name)
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, idx):
+        try:
+            return self._items[idx]
+        except KeyError:
+            item = self.dataset[idx]
+            self._put(idx, item)
+            return item
+
+    def _put(self, idx, item):
+        """add item to cache if it fits in ``max_bytes``"""
+        nbytes = item_nbytes(item)
+        if self.nbytes + nbytes <= self.max_bytes:
+            self._items[idx] = item
+            self.nbytes += nbytes
+
+    @property
+    def n_cached(self):
+        """number of items in cache"""
+        return len(self._items)
+
+    def fill(self, num_workers=0):
+        """load and transform items in order, adding them to the cache,
+        until all items are cached or the next item would exceed ``max_bytes``.
+
+        Parameters
+        ----------
+        num_workers : int
+            number of worker processes used to load items.
+            Default is 0, in which case items are loaded in the main process.
+
+        Returns
+        -------
+        n_cached : int
+            number of items in cache.
+        """
+        loader = torch.utils.data.DataLoader(
+            dataset=self.dataset,
+            batch_size=None,
+            collate_fn=_identity,
+            num_workers=num_workers,
+        )
+        for idx, item in enumerate(loader):
+            if idx in self._items:
+                continue
+            n_cached = self.n_cached
+            self._put(idx, item)
+            if self.n_cached == n_cached:
+                # item did not fit; stop, so items are cached in order
+                break
+        return self.n_cached
@@ -0,0 +1,60 @@
+"""functions used to collate items from a ``VocalDataset`` into batches,
+and to split outputs of a network for a batch back into the items"""
+import torch
+from torch.utils.data.dataloader import default_collate
+
+
+def collate_window_batch(items):
+    """collate items from a ``VocalDataset`` where each "source" is
+    a spectrogram reshaped into a batch of windows,
+    by concatenating the windows from all items into one batch.
+
+    Used with ``vak.datasets.WindowPackingBatchSampler``
+    as the ``collate_fn`` of a ``torch.utils.data.DataLoader``.
+
+    Parameters
+    ----------
+    items : list
+        of dict, items returned by ``VocalDataset.__getitem__``.
+
+    Returns
+    -------
+    batch : dict
+        with keys 'source', the concatenated windows from all items,
+        'n_windows', the number of windows from each item, and 'items',
+        a list with one dict for each item, that contains everything
+        in that item except for 'source', as if collated with a batch size of 1.
+    """
+    return {
+        "source": torch.cat([item["source"] for item in items]),
+        "n_windows": torch.tensor([item["source"].shape[0] for item in items]),
+        "items": [
+            default_collate(
+                [{key: val for key, val in item.items() if key != "source"}]
+            )
+            for item in items
+        ],
+    }
+
+
+def unpack_window_batch(batch, out):
+    """split output of a network for a batch made by ``collate_window_batch``
+    into the output for each item in the batch
+
+    Parameters
+    ----------
+    batch : dict
+        returned by ``collate_window_batch``
+    out : torch.Tensor
+        output of network when fed ``batch["source"]``,
+        where the first dimension is windows.
+
+    Yields
+    ------
+    item : dict
+        item from batch, as if collated with a batch size of 1,
+        without 'source'.
+    item_out : torch.Tensor
+        output of network for windows from that item.
+    """
+    yield from zip(batch["items"], torch.split(out, batch["n_windows"].tolist()))
@@ -0,0 +1,169 @@
+import numpy as np
+import torch
+
+from .. import files
+
+
+class FileLocalityBatchSampler(torch.utils.data.Sampler):
+    """sampler that yields batches of indices into a ``WindowDataset``,
+    shuffling at two levels so that each batch contains windows
+    from only a few spectrogram files.
+
+    At the start of each epoch, the order of files is shuffled,
+    and then files are split into groups of size ``files_per_group``.
+    For each group, all the windows from the files in that group are shuffled
+    together, and then split into batches. Hence all windows from a file
+    are drawn within a short span of batches, so that the file only needs
+    to be loaded once per epoch if it is cached, e.g. with the
+    ``spect_cache_max_bytes`` parameter of ``WindowDataset``.
+
+    ``files_per_group`` is the knob that trades randomness for locality:
+    smaller groups mean fewer files per batch, and larger groups
+    mean batches that are closer to uniform random samples of windows.
+    If ``files_per_group`` is greater than or equal to the number of files,
+    batches are the same as with ``torch.utils.data.DataLoader(shuffle=True)``.
+
+    Parameters
+    ----------
+    spect_ids : numpy.ndarray
+        the id of the spectrogram file that each window in the dataset comes from,
+        e.g. returned by ``WindowDataset.window_spect_ids``.
+    batch_size : int
+        number of windows in each batch.
+    files_per_group : int
+        number of files whose windows are shuffled together.
+    drop_last : bool
+        if True, drop the last batch if it has fewer than ``batch_size`` windows.
+        Default is False.
+    generator : torch.Generator
+        used to shuffle. Default is None, in which case the global random number
+        generator of ``torch`` is used, as when ``shuffle=True`` for a ``DataLoader``.
+    """
+
+    def __init__(
+        self, spect_ids, batch_size, files_per_group, drop_last=False, generator=None
+    ):
+        for name, val in (("batch_size", batch_size), ("files_per_group", files_per_group)):
+            if not isinstance(val, int) or isinstance(val, bool) or val < 1:
+                raise ValueError(f"{name} must be a positive integer but was: {val}")
+
+        spect_ids = np.asarray(spect_ids)
+        # group window indices by file, as one array per file
+        inds_sorted = np.argsort(spect_ids, kind="stable")
+        _, file_starts = np.unique(spect_ids[inds_sorted], return_index=True)
+        self.file_window_inds = np.split(inds_sorted, file_starts[1:])
+
+        self.batch_size = batch_size
+        self.files_per_group = files_per_group
+        self.drop_last = drop_last
+        self.generator = generator
+        self.n_windows = spect_ids.shape[-1]
+
+    def __iter__(self):
+        file_order = torch.randperm(
+            len(self.file_window_inds), generator=self.generator
+        ).numpy()
+        inds = []
+        for group_start in range(0, len(file_order), self.files_per_group):
+            group = file_order[group_start : group_start + self.files_per_group]
+            group_inds = np.concatenate([self.file_window_inds[file] for file in group])
+            group_order = torch.randperm(len(group_inds), generator=self.generator).numpy()
+            inds.append(group_inds[group_order])
+        inds = np.concatenate(inds).tolist()
+
+        for batch_num in range(len(self)):
+            yield inds[batch_num * self.batch_size : (batch_num + 1) * self.batch_size]
+
+    def __len__(self):
+        if self.drop_last:
+            return self.n_windows // self.batch_size
+        else:
+            return (self.n_windows + self.batch_size - 1) // self.batch_size
+
+
+class WindowPackingBatchSampler(torch.utils.data.Sampler):
+    """sampler that yields batches of indices into a ``VocalDataset``
+    whose items are spectrograms reshaped into batches of windows,
+    packing consecutive files into each batch so that each batch
+    has at most ``max_windows`` windows.
+
+    Used with ``vak.datasets.collate.collate_window_batch``,
+    so that the network is fed batches of similar size,
+    instead of one batch per file, that can contain one window
+    or thousands of windows depending on the duration of the file.
+    Files are yielded in order, without shuffling.
+    A file with more than ``max_windows`` windows is yielded in a batch by itself.
+
+    Parameters
+    ----------
+    n_windows : numpy.ndarray
+        number of windows in each item of the dataset.
+    max_windows : int
+        maximum number of windows in a batch.
+    """
+
+    def __init__(self, n_windows, max_windows):
+        if (
+            not isinstance(max_windows, int)
+            or isinstance(max_windows, bool)
+            or max_windows < 1
+        ):
+            raise ValueError(
+                f"max_windows must be a positive integer but was: {max_windows}"
+            )
+
+        self.n_windows = np.asarray(n_windows)
+        self.max_windows = max_windows
+
+        self.batches = []
+        batch, n_windows_batch = [], 0
+        for ind, n_windows_file in enumerate(self.n_windows.tolist()):
+            if batch and n_windows_batch + n_windows_file > max_windows:
+                self.batches.append(batch)
+                batch, n_windows_batch = [], 0
+            batch.append(ind)
+            n_windows_batch += n_windows_file
+        if batch:
+            self.batches.append(batch)
+
+    @classmethod
+    def from_dataset(cls, dataset, window_size, max_windows, spect_key="s"):
+        """make a WindowPackingBatchSampler for a ``VocalDataset``.
+
+        Parameters
+        ----------
+        dataset : vak.datasets.VocalDataset
+            with items where spectrograms are padded and reshaped into windows,
+            as by the item transforms returned by ``vak.transforms.get_defaults``
+            for 'eval' and 'predict'.
+        window_size : int
+            number of time bins in windows.
+        max_windows : int
+            maximum number of windows in a batch.
+        spect_key : str
+            key to access spectograms in array files. Default is 's'.
+            Only used if ``dataset.n_timebins`` is None, in which case
+            each spectrogram file is loaded to get its number of time bins.
+
+        Returns
+        -------
+        sampler : WindowPackingBatchSampler
+        """
+        if dataset.n_timebins is not None:
+            n_timebins = np.asarray(dataset.n_timebins)
+        else:
+            n_timebins = np.array(
+                [
+                    files.spect.load(spect_path)[spect_key].shape[-1]
+                    for spect_path in dataset.spect_paths
+                ]
+            )
+        # spectrograms are padded so their width is a multiple of window size
+        n_windows = np.ceil(n_timebins / window_size).astype(int)
+        return cls(n_windows, max_windows)
+
+    def __iter__(self):
+        yield from self.batches
+
+    def __len__(self):
+        return len(self.batches)
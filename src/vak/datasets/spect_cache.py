@@ -0,0 +1,124 @@
+from collections import OrderedDict
+
+
+class SpectCache:
+    """least-recently-used cache of arrays loaded from spectrogram files,
+    bounded by the total number of bytes the cached arrays occupy.
+
+    Used by ``vak.datasets.WindowDataset`` so that windows drawn from
+    the same spectrogram file do not each require re-loading
+    (and, for .npz files, re-decompressing) that file.
+    When a ``torch.utils.data.DataLoader`` uses multiple workers,
+    each worker process gets its own copy of the dataset,
+    and therefore its own cache.
+
+    Attributes
+    ----------
+    max_bytes : int
+        maximum number of bytes that arrays held in the cache can occupy.
+        When adding an item would exceed this size, least recently used
+        items are evicted until the new item fits. Items larger than
+        ``max_bytes`` are never cached.
+    nbytes : int
+        number of bytes currently occupied by arrays in the cache.
+    hits : int
+        number of times ``get`` found a key in the cache.
+    misses : int
+        number of times ``get`` did not find a key in the cache.
+    """
+
+    def __init__(self, max_bytes):
+        """initialize a new SpectCache instance
+
+        Parameters
+        ----------
+        max_bytes : int
+            maximum number of bytes that arrays held in the cache can occupy.
+        """
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool):
+            raise TypeError(
+                f"max_bytes must be an int but type was: {type(max_bytes)}"
+            )
+        if max_bytes < 0:
+            raise ValueError(
+                f"max_bytes must be a non-negative integer but was: {max_bytes}"
+            )
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._item_nbytes = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        """get item from cache, marking it as most recently used
+
+        Parameters
+        ----------
+        key : hashable
+            e.g., ``spect_id`` of a spectrogram in a ``WindowDataset``.
+
+        Returns
+        -------
+        value : tuple, None
+            of arrays that were cached with ``put``,
+            or None if ``key`` is not in the cache.
+        """
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """add item to cache, evicting least recently used items
+        if needed to stay under ``max_bytes``
+
+        Parameters
+        ----------
+        key : hashable
+            e.g., ``spect_id`` of a spectrogram in a ``WindowDataset``.
+        value : tuple
+            of numpy.ndarray, e.g. (spectrogram,).
+            The size of the item is the sum of ``nbytes`` of the arrays.
+        """
+        item_nbytes = sum(arr.nbytes for arr in value)
+        if item_nbytes > self.max_bytes:
+            return
+
+        if key in self._items:
+            self._remove(key)
+
+        while self.nbytes + item_nbytes > self.max_bytes:
+            self._remove(next(iter(self._items)))
+
+        self._items[key] = value
+        self._item_nbytes[key] = item_nbytes
+        self.nbytes += item_nbytes
+
+    def _remove(self, key):
+        del self._items[key]
+        self.nbytes -= self._item_nbytes.pop(key)
+
+    def clear(self):
+        """remove all items from cache. Does not reset ``hits`` and ``misses``."""
+        self._items.clear()
+        self._item_nbytes.clear()
+        self.nbytes = 0
+
+    def __repr__(self):
+        args = (
+            f"(max_bytes={self.max_bytes}, nbytes={self.nbytes}, n_items={len(self)}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+        return self.__class__.__name__ + args
@@ -0,0 +1,248 @@
+from pathlib import Path
+
+import numpy as np
+
+from .. import files
+from ..logging import log_or_print
+
+
+class SpectStore:
+    """spectrograms from a set of files, concatenated into
+    a single array that is stored in one file and read with ``numpy.memmap``.
+
+    The array has shape (frequency bins, total time bins),
+    and is stored in column-major ("Fortran") order so that
+    the time bins in any window are contiguous on disk.
+    This is a physical version of the "big matrix" that
+    ``vak.datasets.WindowDataset`` indexes with a
+    ``vak.datasets.WindowIndex``. Reading windows from the store requires
+    no decompression and no opening of individual files,
+    and pages that are read are cached by the operating system
+    and shared across processes, e.g. the workers used by a
+    ``torch.utils.data.DataLoader``.
+
+    A store is a directory with two files:
+    the raw array, ``SpectStore.DATA_FILENAME``, and a table
+    with the path and offset of each spectrogram in the array,
+    ``SpectStore.INDEX_FILENAME``.
+    Create a store with ``SpectStore.write``.
+
+    Attributes
+    ----------
+    store_dir : pathlib.Path
+        directory containing store.
+    spect_paths : numpy.ndarray
+        paths to the spectrogram files that were written to the store.
+    offsets : numpy.ndarray
+        index of the first time bin of each spectrogram in the array.
+    n_timebins : numpy.ndarray
+        number of time bins in each spectrogram.
+    n_freqbins : int
+        number of frequency bins in spectrograms.
+    dtype : numpy.dtype
+        data type of array.
+    """
+
+    DATA_FILENAME = "spects.bin"
+    INDEX_FILENAME = "index.npz"
+
+    def __init__(self, store_dir, spect_paths, offsets, n_timebins, n_freqbins, dtype):
+        self.store_dir = Path(store_dir)
+        self.spect_paths = np.asarray(spect_paths)
+        self.offsets = np.asarray(offsets)
+        self.n_timebins = np.asarray(n_timebins)
+        self.n_freqbins = int(n_freqbins)
+        self.dtype = np.dtype(dtype)
+        self._data = None
+
+    @property
+    def data(self):
+        """array with all spectrograms, opened as a ``numpy.memmap``
+        the first time it is accessed in a process"""
+        if self._data is None:
+            self._data = np.memmap(
+                self.store_dir.joinpath(self.DATA_FILENAME),
+                dtype=self.dtype,
+                mode="r",
+                shape=(self.n_freqbins, int(self.n_timebins.sum())),
+                order="F",
+            )
+        return self._data
+
+    def __getstate__(self):
+        # don't pickle memmap, which would copy the whole array;
+        # each process opens its own instead, e.g. DataLoader workers
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
+
+    def __len__(self):
+        return len(self.spect_paths)
+
+    def inds_from_paths(self, spect_paths):
+        """get index in store of each spectrogram in a list of paths
+
+        Parameters
+        ----------
+        spect_paths : list, numpy.ndarray
+            of paths to spectrogram files, all of which must have been written to the store.
+
+        Returns
+        -------
+        store_inds : numpy.ndarray
+            where ``store_inds[i]`` is the index in the store of ``spect_paths[i]``.
+        """
+        path_ind_map = {
+            str(spect_path): ind for ind, spect_path in enumerate(self.spect_paths)
+        }
+        not_in_store = [
+            spect_path
+            for spect_path in spect_paths
+            if str(spect_path) not in path_ind_map
+        ]
+        if not_in_store:
+            raise ValueError(
+                f"the following spectrogram files were not found in store {self.store_dir}:\n"
+                f"{not_in_store}"
+            )
+        return np.asarray(
+            [path_ind_map[str(spect_path)] for spect_path in spect_paths]
+        )
+
+    def spect(self, store_ind):
+        """get spectrogram from store
+
+        Parameters
+        ----------
+        store_ind : int
+            index of spectrogram in store
+
+        Returns
+        -------
+        spect : numpy.memmap
+            read-only view of the spectrogram, with dimensions (frequency bins, time bins).
+        """
+        start = self.offsets[store_ind]
+        return self.data[:, start : start + self.n_timebins[store_ind]]
+
+    def window(self, store_ind, window_start_ind, window_size):
+        """get window from a spectrogram in the store
+
+        Parameters
+        ----------
+        store_ind : int
+            index of spectrogram in store
+        window_start_ind : int
+            index of the first time bin of the window, within the spectrogram.
+        window_size : int
+            number of time bins in window.
+
+        Returns
+        -------
+        window : numpy.ndarray
+            with dimensions (frequency bins, window_size). A copy, not a view of the store.
+        """
+        start = self.offsets[store_ind] + window_start_ind
+        return np.array(self.data[:, start : start + window_size])
+
+    @classmethod
+    def from_dir(cls, store_dir):
+        """load a store written by ``SpectStore.write``
+
+        Parameters
+        ----------
+        store_dir : str, pathlib.Path
+            directory containing store.
+
+        Returns
+        -------
+        spect_store : vak.datasets.SpectStore
+        """
+        store_dir = Path(store_dir)
+        if not store_dir.is_dir():
+            raise NotADirectoryError(
+                f"directory for spectrogram store not found: {store_dir}"
+            )
+        index = np.load(store_dir.joinpath(cls.INDEX_FILENAME))
+        return cls(
+            store_dir,
+            spect_paths=index["spect_paths"],
+            offsets=index["offsets"],
+            n_timebins=index["n_timebins"],
+            n_freqbins=index["n_freqbins"].item(),
+            dtype=index["dtype"].item(),
+        )
+
+    @classmethod
+    def write(cls, spect_paths, store_dir, spect_key="s", logger=None):
+        """write spectrograms from a set of files to a new store
+
+        Parameters
+        ----------
+        spect_paths : list, numpy.ndarray
+            of paths to array files containing spectrograms, e.g. the
+            'spect_path' column of a split from a dataset .csv.
+            All spectrograms must have the same number of frequency bins.
+            They are converted to the data type of the first spectrogram.
+        store_dir : str, pathlib.Path
+            directory where store should be created. Must not already exist.
+        spect_key : str
+            key to access spectograms in array files. Default is 's'.
+
+        Other Parameters
+        ----------------
+        logger : logging.Logger
+            instance created by vak.logging.get_logger. Default is None.
+
+        Returns
+        -------
+        spect_store : vak.datasets.SpectStore
+            the store that was written
+        """
+        spect_paths = [str(spect_path) for spect_path in spect_paths]
+        if len(spect_paths) == 0:
+            raise ValueError("no spectrogram files to write to store")
+        store_dir = Path(store_dir)
+        store_dir.mkdir()
+        log_or_print(
+            f"writing {len(spect_paths)} spectrograms to store: {store_dir}",
+            logger=logger,
+            level="info",
+        )
+
+        n_timebins = []
+        n_freqbins = None
+        dtype = None
+        with store_dir.joinpath(cls.DATA_FILENAME).open("wb") as fp:
+            for spect_path in spect_paths:
+                spect = files.spect.load(spect_path)[spect_key]
+                if n_freqbins is None:
+                    n_freqbins, dtype = spect.shape[0], spect.dtype
+                elif spect.shape[0] != n_freqbins:
+                    raise ValueError(
+                        f"spectrogram in {spect_path} has {spect.shape[0]} frequency bins, "
+                        f"but previous spectrograms had {n_freqbins}"
+                    )
+                # transpose of C-contiguous array is the column-major layout of spect
+                np.ascontiguousarray(spect.T, dtype=dtype).tofile(fp)
+                n_timebins.append(spect.shape[-1])
+
+        n_timebins = np.asarray(n_timebins, dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(n_timebins)[:-1]))
+        np.savez(
+            store_dir.joinpath(cls.INDEX_FILENAME),
+            spect_paths=np.asarray(spect_paths),
+            offsets=offsets,
+            n_timebins=n_timebins,
+            n_freqbins=np.asarray(n_freqbins),
+            dtype=np.asarray(dtype.str),
+        )
+        return cls(store_dir, spect_paths, offsets, n_timebins, n_freqbins, dtype)
+
+    def __repr__(self):
+        args = (
+            f"(store_dir={self.store_dir}, n_spects={len(self)}, "
+            f"n_freqbins={self.n_freqbins}, n_timebins={int(self.n_timebins.sum())}, "
+            f"dtype={self.dtype})"
+        )
+        return self.__class__.__name__ + args
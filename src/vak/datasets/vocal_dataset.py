@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 
 from .. import annotation
 from .. import files
+from .. import io
 from .. import labeled_timebins
 
 
@@ -21,6 +23,9 @@ class VocalDataset:
         spect_key="s",
         timebins_key="t",
         item_transform=None,
+        n_timebins=None,
+        n_freqbins=None,
+        spect_dtype=None,
     ):
         """initialize a VocalDataset instance
 
@@ -48,6 +53,18 @@ class VocalDataset:
             and optionally a target array or Tensor, and returns a dictionary.
             This dictionary is the item returned when indexing into the dataset.
             Default is None.
+        n_timebins : numpy.ndarray
+            number of time bins in each spectrogram, e.g. from the 'n_timebins'
+            column of the dataset .csv. Used with ``n_freqbins`` and ``spect_dtype``
+            to determine the shape of items without loading a spectrogram file.
+            Default is None, in which case the first item is loaded to determine its shape.
+        n_freqbins : int
+            number of frequency bins in spectrograms, e.g. from the 'n_freqbins'
+            column of the dataset .csv. Default is None.
+        spect_dtype : str, numpy.dtype
+            data type of spectrograms, e.g. from the 'dtype' column of the dataset .csv.
+            Default is None, in which case ``numpy.float64`` is assumed
+            when ``n_timebins`` and ``n_freqbins`` are specified.
         """
         self.csv_path = csv_path
         self.spect_paths = spect_paths
@@ -62,9 +79,22 @@ class VocalDataset:
             # just assign dummy value that will end up getting replaced by actual labels by label_timebins()
             self.unlabeled_label = 0
         self.item_transform = item_transform
+        self.n_timebins = n_timebins
 
-        tmp_x_ind = 0
-        tmp_item = self.__getitem__(tmp_x_ind)
+        if n_timebins is not None and n_freqbins is not None:
+            # don't load a file just to get the shape; transform a spectrogram of zeros instead
+            tmp_spect = np.zeros(
+                (n_freqbins, n_timebins[0]),
+                dtype=spect_dtype if spect_dtype is not None else np.float64,
+            )
+            if self.annots is not None:
+                tmp_lbl_tb = np.full(n_timebins[0], self.unlabeled_label)
+                tmp_item = self.item_transform(tmp_spect, tmp_lbl_tb, self.spect_paths[0])
+            else:
+                tmp_item = self.item_transform(tmp_spect, self.spect_paths[0])
+        else:
+            tmp_x_ind = 0
+            tmp_item = self.__getitem__(tmp_x_ind)
         # used by vak functions that need to determine size of input,
         # e.g. when initializing a neural network model
         self.shape = tmp_item["source"].shape
@@ -73,10 +103,9 @@ class VocalDataset:
         spect_path = self.spect_paths[idx]
         spect_dict = files.spect.load(spect_path)
         spect = spect_dict[self.spect_key]
+        timebins = spect_dict[self.timebins_key]
 
         if self.annots is not None:
-            timebins = spect_dict[self.timebins_key]
-
             annot = self.annots[idx]
             lbls_int = [self.labelmap[lbl] for lbl in annot.seq.labels]
             # "lbl_tb": labeled timebins. Target for output of network
@@ -90,6 +119,9 @@ class VocalDataset:
             item = self.item_transform(spect, lbl_tb, spect_path)
         else:
             item = self.item_transform(spect, spect_path)
+        # return time bins too, so that they can be used to convert predictions
+        # to segments without loading the file again
+        item["timebins"] = timebins
 
         return item
 
@@ -151,6 +183,12 @@ class VocalDataset:
         # this is intended behavior; makes it possible to use same dataset class for prediction
         annots = annotation.from_df(df)
 
+        if io.dataframe.has_spect_metadata(df):
+            n_timebins = df["n_timebins"].values
+            n_freqbins, spect_dtype = df["n_freqbins"].values[0], df["dtype"].values[0]
+        else:
+            n_timebins, n_freqbins, spect_dtype = None, None, None
+
         return cls(
             csv_path,
             spect_paths,
@@ -159,4 +197,7 @@ class VocalDataset:
             spect_key,
             timebins_key,
             item_transform,
+            n_timebins,
+            n_freqbins,
+            spect_dtype,
         )
@@ -2,13 +2,71 @@ import numpy as np
 import pandas as pd
 import random
 import torch
+import torchvision.transforms
 from torchvision.datasets.vision import VisionDataset
 
 from .. import annotation
 from .. import files
 from .. import io
 from .. import labeled_timebins
+from .. import transforms as vak_transforms
+from ..transforms import functional as transforms_F
 from .. import validators
+from .spect_cache import SpectCache
+from .window_index import WindowIndex
+
+
+# transforms that give the same result when applied to a batch of windows
+# as when applied to each window and then stacking the results
+BATCH_TRANSFORMS = (
+    vak_transforms.StandardizeSpect,
+    vak_transforms.ToFloatTensor,
+    vak_transforms.ToLongTensor,
+)
+
+
+def _transform_batch(transform, batch):
+    """apply a transform to a batch of windows at once
+
+    Parameters
+    ----------
+    transform : callable
+        a transform, or several combined with ``torchvision.transforms.Compose``,
+        that would be applied to single windows.
+    batch : numpy.ndarray
+        windows stacked along a new first dimension.
+
+    Returns
+    -------
+    transformed : numpy.ndarray, torch.Tensor, list
+        with the transform applied to every window in the batch.
+        If ``transform`` includes a transform that cannot be applied
+        to a batch, it is applied to each window separately, and
+        a list of transformed windows is returned.
+    """
+    if isinstance(transform, torchvision.transforms.Compose):
+        transforms_ = transform.transforms
+    else:
+        transforms_ = [transform]
+
+    if not all(
+        [
+            isinstance(transform_, BATCH_TRANSFORMS + (vak_transforms.AddChannel,))
+            for transform_ in transforms_
+        ]
+    ):
+        return [transform(window) for window in batch]
+
+    for transform_ in transforms_:
+        if isinstance(transform_, vak_transforms.AddChannel):
+            # shift channel dimension past batch dimension
+            channel_dim = transform_.channel_dim
+            if channel_dim != -1:
+                channel_dim += 1
+            batch = transforms_F.add_channel(batch, channel_dim=channel_dim)
+        else:
+            batch = transform_(batch)
+    return batch
 
 
 class WindowDataset(VisionDataset):
@@ -27,14 +85,9 @@ class WindowDataset(VisionDataset):
     root : str, Path
         path to a .csv file that represents the dataset.
         Name 'root' is used for consistency with torchvision.datasets
-    x_inds : numpy.ndarray
-        vector [1,2,3,...,n] that indexes the number of windows
-        in entire dataset. See ``Notes`` for more detail.
-    spect_id_vector : numpy.ndarray
-        represents the 'id' of any spectrogram,
-        i.e., the index into spect_paths that will let us load it
-    spect_inds_vector : numpy.ndarray
-        valid indices of windows we can grab from each spectrogram
+    window_index : vak.datasets.WindowIndex
+        index of all valid windows in the dataset.
+        See ``Notes`` for more detail.
     spect_paths : numpy.ndarray
         column from DataFrame that represents dataset,
         consisting of paths to files containing spectrograms as arrays
@@ -58,45 +111,49 @@ class WindowDataset(VisionDataset):
         Default is None.
     target_transform : callable
         A function/transform that takes in the target and transforms it.
+    lbl_tb : numpy.ndarray
+        labeled timebins for all spectrograms in the dataset, concatenated
+        in the order of ``spect_paths``. Computed once when the dataset is
+        initialized, so that getting the labels for a window only requires
+        slicing this vector.
+    lbl_tb_offsets : numpy.ndarray
+        index in ``lbl_tb`` where the labeled timebins for each spectrogram start,
+        i.e., the labels for the spectrogram with id ``spect_id``
+        start at ``lbl_tb[lbl_tb_offsets[spect_id]]``.
+    spect_cache : vak.datasets.SpectCache
+        least-recently-used cache of spectrograms
+        loaded from files, keyed by ``spect_id``. None if the dataset
+        was initialized without specifying ``spect_cache_max_bytes``.
+    spect_store : vak.datasets.SpectStore
+        store containing all spectrograms in the dataset, from which windows
+        are read instead of loading spectrogram files. Default is None.
 
     Notes
     -----
-    This class uses three vectors to represent
-    a dataset of windows from spectrograms, without actually loading
-    all the spectrograms and concatenating them into one big array.
-    The three vectors correspond to this imaginary, unloaded big matrix:
-    (1) ``spect_id_vector`` that represents the "id" of any spectrogram in this matrix,
-    i.e., the index into ``spect_path`` of the dataset .csv that will let us load it, and
-    (2) ``spect_inds_vector`` where the elements represents valid indices of windows
-    we can grab from each spectrogram. Valid indices are any up to the index n, where
+    This class represents a dataset of windows from spectrograms
+    without actually loading all the spectrograms and concatenating them
+    into one big array. Instead, a ``vak.datasets.WindowIndex`` records
+    the valid windows in each spectrogram as runs of consecutive start indices,
+    i.e. (``spect_id``, start, number of windows), where ``spect_id`` is the index
+    into ``spect_paths`` that will let us load the spectrogram.
+    Valid start indices are any up to the index n, where
     n = number of time bins in this spectrogram - number of time bins in our window
     (because if we tried to go past that the window would go past the edge of the
-    spectrogram).
-    (3) ``x_inds`` is our 'training set' vector, just a set
-    of indices (0, 1, ..., m) where m is the length of vectors (1) and (2).
-    When we want to grab a batch of size b of windows, we get b indices from x,
-    and then index into vectors (1) and (2) so we know which spectrogram files to
-    load, and which windows to grab from each spectrogram.
-    In terms of implementation: when a ``torch.DataLoader`` calls ``__getitem__``
-    with ``idx``, we index into this vector that maps to valid windows, as
-    determined by ``spect_id_vector`` and ``spect_inds_vector``
-
-    This could be done without ``x_inds``, but ``x_inds`` lets us
-    more explicitly return a ``__len__`` for the dataset.
+    spectrogram), minus any that were removed by "cropping" the dataset
+    to a target duration.
+    When a ``torch.DataLoader`` calls ``__getitem__`` with ``idx``,
+    we look up ``idx`` in the index, so we know which spectrogram file to
+    load, and which window to grab from that spectrogram.
+    The size of the index scales with the number of spectrograms,
+    not with the number of time bins in the dataset.
     """
 
-    # class attribute, constant used by several methods
-    # with x_inds, to mark invalid starting indices for windows
-    INVALID_WINDOW_VAL = -1
-
-    VALID_SPLITS = ("train", "val" "test", "all")
+    VALID_SPLITS = ("train", "val", "test", "all")
 
     def __init__(
         self,
         root,
-        x_inds,
-        spect_id_vector,
-        spect_inds_vector,
+        window_index,
         spect_paths,
         annots,
         labelmap,
@@ -106,6 +163,11 @@ class WindowDataset(VisionDataset):
         timebins_key="t",
         transform=None,
         target_transform=None,
+        spect_cache_max_bytes=None,
+        spect_store=None,
+        n_freqbins=None,
+        spect_dtype=None,
+        timebins=None,
     ):
         """initialize a WindowDataset instance
 
@@ -114,19 +176,9 @@ class WindowDataset(VisionDataset):
         root : str, Path
             path to a .csv file that represents the dataset.
             Name 'root' is used for consistency with torchvision.datasets
-        x_inds : numpy.ndarray
-            indices of each window in the dataset. The value at x[0]
-            represents the start index of the first window; using that
-            value, we can index into spect_id_vector to get the path
-            of the spectrogram file to load, and we can index into
-            spect_inds_vector to index into the spectrogram itself
-            and get the window.
-        spect_id_vector : numpy.ndarray
-            represents the 'id' of any spectrogram,
-            i.e., the index into spect_paths that will let us load it
-        spect_inds_vector : numpy.ndarray
-            same length as spect_id_vector but values represent
-            indices within each spectrogram.
+        window_index : vak.datasets.WindowIndex
+            index of all valid windows in the dataset,
+            e.g. returned by ``WindowDataset.window_index_from_df``.
         spect_paths : numpy.ndarray
             column from DataFrame that represents dataset,
             consisting of paths to files containing spectrograms as arrays
@@ -150,13 +202,37 @@ class WindowDataset(VisionDataset):
             Default is None.
         target_transform : callable
             A function/transform that takes in the target and transforms it.
+        spect_cache_max_bytes : int
+            maximum size in bytes of cache of spectrograms loaded from files.
+            Windows from the same spectrogram can then be returned without
+            loading the file again. Each worker process used by a
+            ``torch.utils.data.DataLoader`` will have its own cache of this size.
+            Default is None, in which case spectrograms are not cached.
+        spect_store : vak.datasets.SpectStore
+            store containing all spectrograms in ``spect_paths``,
+            created with ``vak.datasets.SpectStore.write``.
+            If specified, windows are read from the store instead
+            of loading spectrogram files, and ``spect_cache_max_bytes``
+            is ignored. Default is None.
+        n_freqbins : int
+            number of frequency bins in spectrograms, e.g. from the 'n_freqbins'
+            column of the dataset .csv. Used with ``spect_dtype`` to determine
+            the shape of windows without loading a spectrogram file.
+            Default is None, in which case the first window is loaded to determine its shape.
+        spect_dtype : str, numpy.dtype
+            data type of spectrograms, e.g. from the 'dtype' column of the dataset .csv.
+            Default is None, in which case ``numpy.float64`` is assumed
+            when ``n_freqbins`` is specified.
+        timebins : list
+            of numpy.ndarray, vector of time bins for each spectrogram
+            in ``spect_paths``, e.g. returned by ``vak.io.dataframe.timebins_from_metadata``.
+            Used to label time bins without opening spectrogram files.
+            Default is None, in which case time bins are loaded from files.
         """
         super(WindowDataset, self).__init__(
             root, transform=transform, target_transform=target_transform
         )
-        self.x_inds = x_inds
-        self.spect_id_vector = spect_id_vector
-        self.spect_inds_vector = spect_inds_vector
+        self.window_index = window_index
         self.spect_paths = spect_paths
         self.spect_key = spect_key
         self.timebins_key = timebins_key
@@ -170,13 +246,60 @@ class WindowDataset(VisionDataset):
             # just assign dummy value that will end up getting replaced by actual labels by label_timebins()
             self.unlabeled_label = 0
         self.window_size = window_size
-
-        tmp_x_ind = 0
-        one_x, _ = self.__getitem__(tmp_x_ind)
+        self.lbl_tb, self.lbl_tb_offsets = self.lbl_tb_from_annots(
+            spect_paths, annots, labelmap, timebins_key, timebins
+        )
+        self.spect_store = spect_store
+        if spect_store is not None:
+            self.spect_store_inds = spect_store.inds_from_paths(spect_paths)
+            self.spect_cache = None
+        elif spect_cache_max_bytes is not None:
+            self.spect_cache = SpectCache(spect_cache_max_bytes)
+        else:
+            self.spect_cache = None
+
+        if n_freqbins is None and spect_store is not None:
+            n_freqbins, spect_dtype = spect_store.n_freqbins, spect_store.dtype
+        if n_freqbins is not None:
+            # don't load a file just to get the shape; transform a window of zeros instead
+            one_x = np.zeros(
+                (n_freqbins, window_size),
+                dtype=spect_dtype if spect_dtype is not None else np.float64,
+            )
+            if self.transform is not None:
+                one_x = self.transform(one_x)
+        else:
+            tmp_x_ind = 0
+            one_x, _ = self.__getitem__(tmp_x_ind)
         # used by vak functions that need to determine size of window,
         # e.g. when initializing a neural network model
         self.shape = one_x.shape
 
+    def _load_spect(self, spect_id):
+        """load spectrogram with id ``spect_id``,
+        using the cache if there is one
+
+        Parameters
+        ----------
+        spect_id : int
+            index into ``spect_paths``.
+
+        Returns
+        -------
+        spect : numpy.ndarray
+            spectrogram, with dimensions (frequency bins, time bins).
+        """
+        if self.spect_cache is not None:
+            cached = self.spect_cache.get(spect_id)
+            if cached is not None:
+                return cached[0]
+
+        spect = files.spect.load(self.spect_paths[spect_id])[self.spect_key]
+
+        if self.spect_cache is not None:
+            self.spect_cache.put(spect_id, (spect,))
+        return spect
+
     def __get_window_labelvec(self, idx):
         """helper function that gets batches of training pairs,
         given indices into dataset
@@ -193,29 +316,18 @@ class WindowDataset(VisionDataset):
         labelvec : numpy.ndarray
             vector of labels for each timebin in window from spectrogram
         """
-        x_ind = self.x_inds[idx]
-        spect_id = self.spect_id_vector[x_ind]
-        window_start_ind = self.spect_inds_vector[x_ind]
-
-        spect_path = self.spect_paths[spect_id]
-        spect_dict = files.spect.load(spect_path)
-        spect = spect_dict[self.spect_key]
-        timebins = spect_dict[self.timebins_key]
-
-        annot = self.annots[
-            spect_id
-        ]  # "annot id" == spect_id if both were taken from rows of DataFrame
-        lbls_int = [self.labelmap[lbl] for lbl in annot.seq.labels]
-        lbl_tb = labeled_timebins.label_timebins(
-            lbls_int,
-            annot.seq.onsets_s,
-            annot.seq.offsets_s,
-            timebins,
-            unlabeled_label=self.unlabeled_label,
-        )
+        spect_id, window_start_ind = self.window_index.lookup(idx)
+
+        if self.spect_store is not None:
+            window = self.spect_store.window(
+                self.spect_store_inds[spect_id], window_start_ind, self.window_size
+            )
+        else:
+            spect = self._load_spect(spect_id)
+            window = spect[:, window_start_ind : window_start_ind + self.window_size]
 
-        window = spect[:, window_start_ind : window_start_ind + self.window_size]
-        labelvec = lbl_tb[window_start_ind : window_start_ind + self.window_size]
+        lbl_tb_start_ind = self.lbl_tb_offsets[spect_id] + window_start_ind
+        labelvec = self.lbl_tb[lbl_tb_start_ind : lbl_tb_start_ind + self.window_size]
 
         return window, labelvec
 
@@ -232,46 +344,101 @@ class WindowDataset(VisionDataset):
 
         return window, labelvec
 
+    def __getitems__(self, indices):
+        """get a batch of items, given indices into dataset
+
+        Used by ``torch.utils.data.DataLoader`` instead of calling
+        ``__getitem__`` for each index. Windows are grouped by spectrogram
+        so that each file is loaded once per batch, all windows from a
+        spectrogram are sliced at once, and transforms are applied
+        to the whole batch, instead of to each window.
+
+        Parameters
+        ----------
+        indices : list
+            of int, indices into dataset
+
+        Returns
+        -------
+        items : list
+            of (window, labelvec) tuples, the same as those returned
+            by ``__getitem__`` for each index.
+        """
+        if torch.is_tensor(indices):
+            indices = indices.tolist()
+        spect_ids, window_start_inds = self.window_index.lookup(np.asarray(indices))
+
+        windows = None
+        for spect_id in np.unique(spect_ids):
+            in_spect = spect_ids == spect_id
+            if self.spect_store is not None:
+                spect = self.spect_store.spect(self.spect_store_inds[spect_id])
+            else:
+                spect = self._load_spect(spect_id)
+            # (frequency bins, windows, window size)
+            spect_windows = np.lib.stride_tricks.sliding_window_view(
+                spect, self.window_size, axis=1
+            )[:, window_start_inds[in_spect]]
+            if windows is None:
+                windows = np.empty(
+                    (len(spect_ids), spect.shape[0], self.window_size), dtype=spect.dtype
+                )
+            windows[in_spect] = spect_windows.transpose(1, 0, 2)
+
+        lbl_tb_start_inds = self.lbl_tb_offsets[spect_ids] + window_start_inds
+        labelvecs = self.lbl_tb[
+            lbl_tb_start_inds[:, np.newaxis] + np.arange(self.window_size)
+        ]
+
+        if self.transform is not None:
+            windows = _transform_batch(self.transform, windows)
+
+        if self.target_transform is not None:
+            labelvecs = _transform_batch(self.target_transform, labelvecs)
+
+        return list(zip(windows, labelvecs))
+
     def __len__(self):
         """number of batches"""
-        return len(self.x_inds)
+        return len(self.window_index)
+
+    def window_spect_ids(self):
+        """get the id of the spectrogram that each window in the dataset comes from,
+        i.e., the index into ``spect_paths``
+
+        Returns
+        -------
+        spect_ids : numpy.ndarray
+            with one element for each window, where ``spect_ids[idx]``
+            is the spectrogram for the window returned by ``__getitem__(idx)``.
+        """
+        return self.window_index.window_spect_ids()
 
     def duration(self):
         """duration of WindowDataset, in seconds"""
-        return self.spect_inds_vector.shape[-1] * self.timebin_dur
+        return self.window_index.n_timebins.sum() * self.timebin_dur
 
     @staticmethod
     def crop_spect_vectors_keep_classes(
         lbl_tb,
-        spect_id_vector,
-        spect_inds_vector,
-        x_inds,
+        window_index,
         crop_dur,
         timebin_dur,
         labelmap,
         window_size,
     ):
-        """crop spect_id_vector and spect_ind_vector to a target duration
+        """crop a window index to a target duration
         while making sure that all classes are present in the cropped
-        vectors
+        dataset
 
         Parameters
         ----------
         lbl_tb : numpy.ndarray
-            labeled timebins, where labels are from the set of values in labelmap.
-        spect_id_vector : numpy.ndarray
-            represents the 'id' of any spectrogram,
-            i.e., the index into spect_paths that will let us load it
-        spect_inds_vector : numpy.ndarray
-            same length as spect_id_vector but values represent
-            indices within each spectrogram.
-        x_inds : numpy.ndarray
-            indices of each window in the dataset. The value at x[0]
-            represents the start index of the first window; using that
-            value, we can index into spect_id_vector to get the path
-            of the spectrogram file to load, and we can index into
-            spect_inds_vector to index into the spectrogram itself
-            and get the window.
+            labeled timebins, where labels are from the set of values in labelmap,
+            for all spectrograms concatenated in order of their ids.
+        window_index : vak.datasets.WindowIndex
+            index of all windows in the dataset before cropping,
+            e.g. returned by ``WindowIndex.from_n_timebins``.
         crop_dur : float
             duration to which dataset should be "cropped". Default is None,
             in which case entire duration of specified split will be used.
@@ -280,79 +447,63 @@ class WindowDataset(VisionDataset):
         labelmap : dict
             that maps labels from dataset to a series of consecutive integers.
             To create a label map, pass a set of labels to the `vak.utils.labels.to_map` function.
+        window_size : int
+            number of time bins in windows that will be taken from spectrograms
 
         Returns
         -------
-        spect_id_cropped : numpy.ndarray
-            spect_id_vector after cropping
-        spect_inds_cropped : numpy.ndarray
-            spect_inds_vector after cropping
-        x_inds_updated : numpy.ndarray
-            x_inds_vector with starting indices of windows that are invalid
-            after the cropping now set to WindowDataset.INVALID_WINDOW_VAL
-            so they will be removed
+        window_index_cropped : vak.datasets.WindowIndex
+            index with windows that are invalid after cropping removed
         """
         lbl_tb = validators.column_or_1d(lbl_tb)
-        spect_id_vector = validators.column_or_1d(spect_id_vector)
-        spect_inds_vector = validators.column_or_1d(spect_inds_vector)
-        x_inds = validators.column_or_1d(x_inds)
-
-        lens = (
-            lbl_tb.shape[-1],
-            spect_id_vector.shape[-1],
-            spect_inds_vector.shape[-1],
-            x_inds.shape[-1],
-        )
-        uniq_lens = set(lens)
-        if len(uniq_lens) != 1:
+        n_timebins = window_index.n_timebins.astype(np.int64)
+        total_tb = n_timebins.sum()
+        if lbl_tb.shape[-1] != total_tb:
             raise ValueError(
-                "lbl_tb, spect_id_vector, spect_inds_vector, and x_inds should all "
-                "have the same length, but did not find one unique length. "
-                "Lengths of lbl_tb, spect_id_vector, spect_inds_vector, and x_inds_vector "
-                f"were: {lens}"
+                "lbl_tb should have the same length as the total number of time bins in window_index, "
+                f"but length of lbl_tb was {lbl_tb.shape[-1]} and number of time bins was {total_tb}"
             )
 
         cropped_length = np.round(crop_dur / timebin_dur).astype(int)
 
-        if spect_id_vector.shape[-1] == cropped_length:
-            return spect_id_vector, spect_inds_vector, x_inds
+        if total_tb == cropped_length:
+            return window_index
 
-        elif spect_id_vector.shape[-1] < cropped_length:
+        elif total_tb < cropped_length:
             raise ValueError(
-                f"arrays have length {spect_id_vector.shape[-1]} "
+                f"arrays have length {total_tb} "
                 f"that is shorter than correct length, {cropped_length}, "
                 f"(= target duration {crop_dur} / duration of timebins, {timebin_dur})."
             )
 
-        elif spect_id_vector.shape[-1] > cropped_length:
+        elif total_tb > cropped_length:
             classes = np.asarray(sorted(list(labelmap.values())))
+            # transient boolean vector that marks valid window start indices
+            # in all time bins, only used while cropping
+            spect_offsets = np.concatenate(([0], np.cumsum(n_timebins)[:-1]))
+            valid = window_index.valid_mask(spect_offsets)
 
             # try cropping off the end first
             lbl_tb_cropped = lbl_tb[:cropped_length]
 
             if np.array_equal(np.unique(lbl_tb_cropped), classes):
-                x_inds[cropped_length:] = WindowDataset.INVALID_WINDOW_VAL
-                return (
-                    spect_id_vector[:cropped_length],
-                    spect_inds_vector[:cropped_length],
-                    x_inds,
+                valid[cropped_length:] = False
+                return WindowIndex.from_valid_mask(
+                    valid,
+                    spect_offsets,
+                    np.clip(cropped_length - spect_offsets, 0, n_timebins),
                 )
 
             # try truncating off the front instead
             lbl_tb_cropped = lbl_tb[-cropped_length:]
             if np.array_equal(np.unique(lbl_tb_cropped), classes):
                 # set every index *up to but not including* the first valid window start to "invalid"
-                x_inds[:-cropped_length] = WindowDataset.INVALID_WINDOW_VAL
-                # also need to 'reset' the indexing so it starts at 0. First find current minimum index value
-                min_x_ind = x_inds[x_inds != WindowDataset.INVALID_WINDOW_VAL].min()
-                # Then set min x ind to 0, min x ind + 1 to 1, min ind + 2 to 2, ...
-                x_inds[x_inds != WindowDataset.INVALID_WINDOW_VAL] = (
-                    x_inds[x_inds != WindowDataset.INVALID_WINDOW_VAL] - min_x_ind
-                )
-                return (
-                    spect_id_vector[-cropped_length:],
-                    spect_inds_vector[-cropped_length:],
-                    x_inds,
+                n_front = total_tb - cropped_length
+                valid[:n_front] = False
+                return WindowIndex.from_valid_mask(
+                    valid,
+                    spect_offsets,
+                    np.clip(spect_offsets + n_timebins - n_front, 0, n_timebins),
                 )
 
             # try cropping silences
@@ -367,7 +518,7 @@ class WindowDataset(VisionDataset):
             # (here 'end' means the segment prior to the last window_size bins in the file because
             # Those are not used as startpoints of a training window)
 
-            # assigining WindowDataset.INVALID_WINDOW_VAL to x_inds segments
+            # marking start indices in these segments as invalid
             # in these 3 cases will cause data to be ignored with
             # durations that depend on wether the segments touch the ends of files
             # because we do not ignore non-silence segments.
@@ -381,9 +532,7 @@ class WindowDataset(VisionDataset):
                     "could not crop from start or end, and there are no unlabeled segments "
                     "that could be used to further crop"
                 )
-            valid_unlabeled = np.logical_and(
-                lbl_tb == unlabeled, x_inds != WindowDataset.INVALID_WINDOW_VAL
-            )
+            valid_unlabeled = np.logical_and(lbl_tb == unlabeled, valid)
             unlabeled_diff = np.diff(np.concatenate([[0], valid_unlabeled, [0]]))
             unlabeled_onsets = np.where(unlabeled_diff == 1)[0]
             unlabeled_offsets = np.where(unlabeled_diff == -1)[0]
@@ -399,19 +548,9 @@ class WindowDataset(VisionDataset):
                 unlabeled_durations >= window_size + N_PAD_BINS
             ]
             # indicate silences in the beginning of files
-            border_onsets = (
-                np.concatenate([[WindowDataset.INVALID_WINDOW_VAL], x_inds])[
-                    unlabeled_onsets
-                ]
-                == WindowDataset.INVALID_WINDOW_VAL
-            )
+            border_onsets = ~np.concatenate([[False], valid])[unlabeled_onsets]
             # indicate silences at the end of files
-            border_offsets = (
-                np.concatenate([x_inds, [WindowDataset.INVALID_WINDOW_VAL]])[
-                    unlabeled_offsets + 1
-                ]
-                == WindowDataset.INVALID_WINDOW_VAL
-            )
+            border_offsets = ~np.concatenate([valid, [False]])[unlabeled_offsets + 1]
 
             # This is how much data can be ignored from each silence segment without ignoring the end of file windows
             num_potential_ignored_data_bins = (
@@ -531,34 +670,90 @@ class WindowDataset(VisionDataset):
                     ]
                 )
 
-            x_inds[bins_to_ignore] = WindowDataset.INVALID_WINDOW_VAL
+            valid[bins_to_ignore] = False
 
             # we may still need to crop. Try doing it from the beginning of the dataset
             if (
                 crop_more > 0
             ):  # This addition can lead to imprecision but only in cases where we ask for very small datasets
-                if crop_more > sum(x_inds != WindowDataset.INVALID_WINDOW_VAL):
+                if crop_more > valid.sum():
                     raise ValueError(
                         "was not able to crop spect vectors to specified duration "
                         "in a way that maintained all classes in dataset"
                     )
-                extra_bins = x_inds[x_inds != WindowDataset.INVALID_WINDOW_VAL][
-                    :crop_more
-                ]
+                extra_bins = np.flatnonzero(valid)[:crop_more]
                 bins_to_ignore = np.concatenate([bins_to_ignore, extra_bins])
-                x_inds[bins_to_ignore] = WindowDataset.INVALID_WINDOW_VAL
+                valid[bins_to_ignore] = False
 
             if np.array_equal(
                 np.unique(lbl_tb[np.setdiff1d(np.arange(len(lbl_tb)), bins_to_ignore)]),
                 classes,
             ):
-                return spect_id_vector, spect_inds_vector, x_inds
+                return WindowIndex.from_valid_mask(valid, spect_offsets, n_timebins)
 
         raise ValueError(
             "was not able to crop spect vectors to specified duration "
             "in a way that maintained all classes in dataset"
         )
 
+    @staticmethod
+    def lbl_tb_from_annots(
+        spect_paths, annots, labelmap, timebins_key="t", timebins=None
+    ):
+        """get labeled timebins for every spectrogram in a dataset,
+        concatenated into a single vector
+
+        Parameters
+        ----------
+        spect_paths : numpy.ndarray
+            paths to files containing spectrograms as arrays
+        annots : list
+            of crowsetta.Annotation instances, one for each path in ``spect_paths``.
+        labelmap : dict
+            that maps labels from dataset to a series of consecutive integers.
+        timebins_key : str
+            key to access time bin vector in array files. Default is 't'.
+        timebins : list
+            of numpy.ndarray, vector of time bins for each path in ``spect_paths``.
+            Default is None, in which case time bins are loaded from files.
+
+        Returns
+        -------
+        lbl_tb : numpy.ndarray
+            labeled timebins for all spectrograms, concatenated in the
+            order of ``spect_paths``.
+        lbl_tb_offsets : numpy.ndarray
+            index in ``lbl_tb`` where the labeled timebins for each spectrogram start.
+        """
+        if "unlabeled" in labelmap:
+            unlabeled_label = labelmap["unlabeled"]
+        else:
+            # if there is no "unlabeled label" (e.g., because all segments have labels)
+            # just assign dummy value that will end up getting replaced by actual labels by label_timebins()
+            unlabeled_label = 0
+
+        if timebins is None:
+            timebins = (
+                files.spect.load(spect_path)[timebins_key] for spect_path in spect_paths
+            )
+
+        lbl_tb = []
+        # "annot id" == spect_id if both were taken from rows of DataFrame
+        for timebins_, annot in zip(timebins, annots):
+            lbls_int = [labelmap[lbl] for lbl in annot.seq.labels]
+            lbl_tb.append(
+                labeled_timebins.label_timebins(
+                    lbls_int,
+                    annot.seq.onsets_s,
+                    annot.seq.offsets_s,
+                    timebins_,
+                    unlabeled_label=unlabeled_label,
+                )
+            )
+
+        lbl_tb_offsets = np.cumsum([0] + [lbl_tb_.shape[-1] for lbl_tb_ in lbl_tb[:-1]])
+        return np.concatenate(lbl_tb), lbl_tb_offsets
+
     @staticmethod
     def n_time_bins_spect(spect_path, spect_key="s"):
         """get number of time bins in a spectrogram,
@@ -581,7 +776,7 @@ class WindowDataset(VisionDataset):
         return spect.shape[-1]
 
     @staticmethod
-    def spect_vectors_from_df(
+    def window_index_from_df(
         df,
         split,
         window_size,
@@ -591,15 +786,17 @@ class WindowDataset(VisionDataset):
         timebin_dur=None,
         labelmap=None,
     ):
-        """get spect_id_vector and spect_ind_vector from a dataframe
+        """get index of all valid windows from a dataframe
         that represents a dataset of vocalizations.
         See WindowDataset class docstring for
-        detailed explanation of these vectors.
+        detailed explanation of the index.
 
         Parameters
         ----------
         df : pandas.DataFrame
             that represents a dataset of vocalizations.
+        split : str
+            name of split from dataset to use
         window_size : int
             number of time bins in windows that will be taken from spectrograms
         spect_key : str
@@ -621,15 +818,9 @@ class WindowDataset(VisionDataset):
 
         Returns
         -------
-        spect_id_vector : numpy.ndarray
-            represents the 'id' of any spectrogram,
-            i.e., the index into spect_paths that will let us load it
-        spect_inds_vector : numpy.ndarray
-            valid indices of windows we can grab from each spectrogram
-        x_inds_updated : numpy.ndarray
-            x_inds_vector with starting indices of windows that are invalid
-            after the cropping now set to WindowDataset.INVALID_WINDOW_VAL
-            so they will be removed
+        window_index : vak.datasets.WindowIndex
+            index of all valid windows in the dataset,
+            after cropping if ``crop_dur`` was specified.
         """
         if crop_dur is not None and timebin_dur is None:
             raise ValueError("must provide timebin_dur when specifying crop_dur")
@@ -647,16 +838,10 @@ class WindowDataset(VisionDataset):
             crop_dur = float(crop_dur)
             timebin_dur = float(timebin_dur)
             annots = annotation.from_df(df)
-            if "unlabeled" in labelmap:
-                unlabeled_label = labelmap["unlabeled"]
-            else:
-                # if there is no "unlabeled label" (e.g., because all segments have labels)
-                # just assign dummy value that will end up getting replaced by actual labels by label_timebins()
-                unlabeled_label = 0
         else:
             crop_to_dur = False
 
-        if "split" == "all":
+        if split == "all":
             pass  # use all rows, don't select by split
         else:
             if split not in df.split.unique().tolist():
@@ -667,56 +852,32 @@ class WindowDataset(VisionDataset):
 
         spect_paths = df["spect_path"].values
 
-        spect_id_vector = []
-        spect_inds_vector = []
-        x_inds = []
-        total_tb = 0
+        if io.dataframe.has_spect_metadata(df):
+            n_timebins = df["n_timebins"].values
+            timebins = io.dataframe.timebins_from_metadata(df)
+        else:
+            # dataset prepared without metadata, need to load files
+            n_timebins = None
+            timebins = None
 
         if crop_to_dur:
-            lbl_tb = []
             spect_annot_map = annotation.source_annot_map(spect_paths, annots)
-            for ind, (spect_path, annot) in enumerate(spect_annot_map.items()):
-                spect_dict = files.spect.load(spect_path)
-                n_tb_spect = spect_dict[spect_key].shape[-1]
-
-                spect_id_vector.append(np.ones((n_tb_spect,), dtype=np.int64) * ind)
-                spect_inds_vector.append(np.arange(n_tb_spect))
-
-                valid_x_inds = np.arange(total_tb, total_tb + n_tb_spect)
-                last_valid_window_ind = total_tb + n_tb_spect - window_size
-                valid_x_inds[
-                    valid_x_inds > last_valid_window_ind
-                ] = WindowDataset.INVALID_WINDOW_VAL
-                x_inds.append(valid_x_inds)
-
-                total_tb += n_tb_spect
-
-                lbls_int = [labelmap[lbl] for lbl in annot.seq.labels]
-                timebins = spect_dict[timebins_key]
-                lbl_tb.append(
-                    labeled_timebins.label_timebins(
-                        lbls_int,
-                        annot.seq.onsets_s,
-                        annot.seq.offsets_s,
-                        timebins,
-                        unlabeled_label=unlabeled_label,
-                    )
-                )
-
-            spect_id_vector = np.concatenate(spect_id_vector)
-            spect_inds_vector = np.concatenate(spect_inds_vector)
-            lbl_tb = np.concatenate(lbl_tb)
-            x_inds = np.concatenate(x_inds)
-
-            (
-                spect_id_vector,
-                spect_inds_vector,
-                x_inds,
-            ) = WindowDataset.crop_spect_vectors_keep_classes(
+            # keys of ``spect_annot_map`` are in the same order as ``spect_paths``,
+            # so time bins from metadata line up with annotations
+            lbl_tb, lbl_tb_offsets = WindowDataset.lbl_tb_from_annots(
+                list(spect_annot_map.keys()),
+                list(spect_annot_map.values()),
+                labelmap,
+                timebins_key,
+                timebins,
+            )
+            if n_timebins is None:
+                # labeled timebins have one label per time bin in each spectrogram
+                n_timebins = np.diff(np.append(lbl_tb_offsets, lbl_tb.shape[-1]))
+            window_index = WindowIndex.from_n_timebins(n_timebins, window_size)
+            window_index = WindowDataset.crop_spect_vectors_keep_classes(
                 lbl_tb,
-                spect_id_vector,
-                spect_inds_vector,
-                x_inds,
+                window_index,
                 crop_dur,
                 timebin_dur,
                 labelmap,
@@ -724,30 +885,17 @@ class WindowDataset(VisionDataset):
             )
 
         else:  # crop_to_dur is False
-            for ind, spect_path in enumerate(spect_paths):
-                n_tb_spect = WindowDataset.n_time_bins_spect(spect_path, spect_key)
-
-                spect_id_vector.append(np.ones((n_tb_spect,), dtype=np.int64) * ind)
-                spect_inds_vector.append(np.arange(n_tb_spect))
-
-                valid_x_inds = np.arange(total_tb, total_tb + n_tb_spect)
-                last_valid_window_ind = total_tb + n_tb_spect - window_size
-                valid_x_inds[
-                    valid_x_inds > last_valid_window_ind
-                ] = WindowDataset.INVALID_WINDOW_VAL
-                x_inds.append(valid_x_inds)
-
-                total_tb += n_tb_spect
-
-            spect_id_vector = np.concatenate(spect_id_vector)
-            spect_inds_vector = np.concatenate(spect_inds_vector)
-            x_inds = np.concatenate(x_inds)
+            if n_timebins is None:
+                n_timebins = [
+                    WindowDataset.n_time_bins_spect(spect_path, spect_key)
+                    for spect_path in spect_paths
+                ]
+            window_index = WindowIndex.from_n_timebins(n_timebins, window_size)
 
-        x_inds = x_inds[x_inds != WindowDataset.INVALID_WINDOW_VAL]
-        return spect_id_vector, spect_inds_vector, x_inds
+        return window_index
 
     @staticmethod
-    def spect_vectors_from_csv(
+    def window_index_from_csv(
         csv_path,
         split,
         window_size,
@@ -757,10 +905,10 @@ class WindowDataset(VisionDataset):
         timebin_dur=None,
         labelmap=None,
     ):
-        """get spect_id_vector and spect_ind_vector from a
+        """get index of all valid windows from a
         .csv file that represents a dataset of vocalizations.
         See WindowDataset class docstring for
-        detailed explanation of these vectors.
+        detailed explanation of the index.
 
         Parameters
         ----------
@@ -787,15 +935,9 @@ class WindowDataset(VisionDataset):
 
         Returns
         -------
-        spect_id_vector : numpy.ndarray
-            represents the 'id' of any spectrogram,
-            i.e., the index into spect_paths that will let us load it
-        spect_inds_vector : numpy.ndarray
-            valid indices of windows we can grab from each spectrogram
-        x_inds_updated : numpy.ndarray
-            x_inds_vector with starting indices of windows that are invalid
-            after the cropping now set to WindowDataset.INVALID_WINDOW_VAL
-            so they will be removed
+        window_index : vak.datasets.WindowIndex
+            index of all valid windows in the dataset,
+            after cropping if ``crop_dur`` was specified.
         """
         if split not in WindowDataset.VALID_SPLITS:
             raise ValueError(
@@ -810,7 +952,7 @@ class WindowDataset(VisionDataset):
                 f"Splits are: {df.split.unique().tolist()}"
             )
 
-        return WindowDataset.spect_vectors_from_df(
+        return WindowDataset.window_index_from_df(
             df,
             split,
             window_size,
@@ -830,11 +972,11 @@ class WindowDataset(VisionDataset):
         window_size,
         spect_key="s",
         timebins_key="t",
-        spect_id_vector=None,
-        spect_inds_vector=None,
-        x_inds=None,
+        window_index=None,
         transform=None,
         target_transform=None,
+        spect_cache_max_bytes=None,
+        spect_store=None,
     ):
         """given a path to a csv representing a dataset,
         returns an initialized WindowDataset.
@@ -854,66 +996,33 @@ class WindowDataset(VisionDataset):
             key to access spectograms in array files. Default is 's'.
         timebins_key : str
             key to access time bin vector in array files. Default is 't'.
-        spect_id_vector : numpy.ndarray
-            represents the 'id' of any spectrogram,
-            i.e., the index into spect_paths that will let us load it
-        spect_inds_vector : numpy.ndarray
-            valid indices of windows we can grab from each spectrogram
-        x_inds : numpy.ndarray
-            indices of each window in the dataset. The value at x[0]
-            represents the start index of the first window; using that
-            value, we can index into spect_id_vector to get the path
-            of the spectrogram file to load, and we can index into
-            spect_inds_vector to index into the spectrogram itself
-            and get the window.
+        window_index : vak.datasets.WindowIndex
+            index of all valid windows in the dataset, e.g. returned by
+            ``WindowDataset.window_index_from_df`` with a value for ``crop_dur``.
+            Default is None, in which case all windows from the split are used.
         transform : callable
             A function/transform that takes in a numpy array
             and returns a transformed version. E.g, a SpectScaler instance.
             Default is None.
         target_transform : callable
             A function/transform that takes in the target and transforms it.
+        spect_cache_max_bytes : int
+            maximum size in bytes of cache of spectrograms loaded from files.
+            Default is None, in which case spectrograms are not cached.
+            See ``WindowDataset.__init__`` for details.
+        spect_store : vak.datasets.SpectStore
+            store containing all spectrograms in the specified split,
+            from which windows are read instead of loading spectrogram files.
+            Default is None.
 
         Returns
         -------
         initialized instance of WindowDataset
         """
-        if any(
-            [vec is not None for vec in [spect_id_vector, spect_inds_vector, x_inds]]
-        ):
-            if not all(
-                [
-                    vec is not None
-                    for vec in [spect_id_vector, spect_inds_vector, x_inds]
-                ]
-            ):
-
-                raise ValueError(
-                    "if any of the following parameters are specified, they all must be specified: "
-                    "spect_id_vector, spect_inds_vector, x_inds"
-                )
-
-        if all(
-            [vec is not None for vec in [spect_id_vector, spect_inds_vector, x_inds]]
-        ):
-            for vec_name, vec in zip(
-                ["spect_id_vector", "spect_inds_vector", "x_inds"],
-                [spect_id_vector, spect_inds_vector, x_inds],
-            ):
-                if not type(vec) is np.ndarray:
-                    raise TypeError(
-                        f"{vec_name} must be a numpy.ndarray but type was: {type(spect_id_vector)}"
-                    )
-
-            spect_id_vector = validators.column_or_1d(spect_id_vector)
-            spect_inds_vector = validators.column_or_1d(spect_inds_vector)
-            x_inds = validators.column_or_1d(x_inds)
-
-            if spect_id_vector.shape[-1] != spect_inds_vector.shape[-1]:
-                raise ValueError(
-                    "spect_id_vector and spect_inds_vector should be same length, but "
-                    f"spect_id_vector.shape[-1] is {spect_id_vector.shape[-1]} and "
-                    f"spect_inds_vector.shape[-1] is {spect_inds_vector.shape[-1]}."
-                )
+        if window_index is not None and not isinstance(window_index, WindowIndex):
+            raise TypeError(
+                f"window_index must be a vak.datasets.WindowIndex but type was: {type(window_index)}"
+            )
 
         df = pd.read_csv(csv_path)
         if not df["split"].str.contains(split).any():
@@ -922,21 +1031,23 @@ class WindowDataset(VisionDataset):
             df = df[df["split"] == split]
         spect_paths = df["spect_path"].values
 
-        if all([vec is None for vec in [spect_id_vector, spect_inds_vector, x_inds]]):
-            # see Notes in class docstring to understand what these vectors do
-            spect_id_vector, spect_inds_vector, x_inds = cls.spect_vectors_from_df(
-                df, split, window_size
-            )
+        if window_index is None:
+            # see Notes in class docstring to understand what the index does
+            window_index = cls.window_index_from_df(df, split, window_size, spect_key)
 
         annots = annotation.from_df(df)
         timebin_dur = io.dataframe.validate_and_get_timebin_dur(df)
+        if io.dataframe.has_spect_metadata(df):
+            n_freqbins, spect_dtype = df["n_freqbins"].values[0], df["dtype"].values[0]
+            timebins = io.dataframe.timebins_from_metadata(df)
+        else:
+            # dataset prepared without metadata, need to load files
+            n_freqbins, spect_dtype, timebins = None, None, None
 
         # note that we set "root" to csv path
         return cls(
             csv_path,
-            x_inds,
-            spect_id_vector,
-            spect_inds_vector,
+            window_index,
             spect_paths,
             annots,
             labelmap,
@@ -946,4 +1057,9 @@ class WindowDataset(VisionDataset):
             timebins_key,
             transform,
             target_transform,
+            spect_cache_max_bytes,
+            spect_store,
+            n_freqbins,
+            spect_dtype,
+            timebins,
         )
@@ -0,0 +1,237 @@
+import numpy as np
+
+
+def _as_smallest_int(arr):
+    """convert array to int32 if all values fit, and to int64 if not"""
+    arr = np.asarray(arr)
+    int32_info = np.iinfo(np.int32)
+    if arr.size == 0 or (arr.min() >= int32_info.min and arr.max() <= int32_info.max):
+        return arr.astype(np.int32)
+    return arr.astype(np.int64)
+
+
+class WindowIndex:
+    """compact index of all valid windows in a ``WindowDataset``.
+
+    Represents windows as a set of records, where each record is a run
+    of consecutive valid windows from one spectrogram:
+    (``spect_ids``, ``starts``, ``n_windows``). E.g., the record (3, 10, 100)
+    means windows starting at time bins 10, 11, ..., 109 from the
+    spectrogram with id 3 (i.e., the index into the dataset's ``spect_paths``)
+    are all valid. A spectrogram that has not been cropped has one record,
+    starting at 0. Cropping a dataset can remove windows from the middle
+    of a spectrogram, splitting its windows into more than one record.
+
+    To find the window with a given index into the dataset, the index
+    is located in the cumulative sum of ``n_windows`` with ``numpy.searchsorted``.
+    Hence the size of the index scales with the number of records,
+    not with the number of time bins in the dataset.
+
+    Attributes
+    ----------
+    spect_ids : numpy.ndarray
+        id of the spectrogram for each record.
+    starts : numpy.ndarray
+        index within the spectrogram of the first time bin
+        of the first window in each record.
+    n_windows : numpy.ndarray
+        number of consecutive valid windows in each record.
+    n_timebins : numpy.ndarray
+        number of time bins from each spectrogram that are in the dataset,
+        after any cropping, i.e. the length of each spectrogram
+        in the dataset. Used to compute the dataset's duration.
+    """
+
+    FILENAME = "window_index.npz"
+
+    def __init__(self, spect_ids, starts, n_windows, n_timebins):
+        spect_ids, starts, n_windows = (
+            np.asarray(arr).reshape(-1) for arr in (spect_ids, starts, n_windows)
+        )
+        if not spect_ids.shape == starts.shape == n_windows.shape:
+            raise ValueError(
+                "spect_ids, starts, and n_windows must all have the same length, but lengths were: "
+                f"{spect_ids.shape[-1]}, {starts.shape[-1]}, {n_windows.shape[-1]}"
+            )
+        self.spect_ids = _as_smallest_int(spect_ids)
+        self.starts = _as_smallest_int(starts)
+        self.n_windows = _as_smallest_int(n_windows)
+        self.n_timebins = _as_smallest_int(np.asarray(n_timebins).reshape(-1))
+        # index of window just after the last window in each record
+        self._ends = np.cumsum(self.n_windows, dtype=np.int64)
+
+    def __len__(self):
+        """total number of windows"""
+        if self._ends.shape[-1] == 0:
+            return 0
+        return int(self._ends[-1])
+
+    def lookup(self, idx):
+        """get spectrogram id and start index of windows
+
+        Parameters
+        ----------
+        idx : int, numpy.ndarray
+            index of a window, or array of indices of windows.
+
+        Returns
+        -------
+        spect_id : int, numpy.ndarray
+            id of spectrogram that each window comes from
+        window_start_ind : int, numpy.ndarray
+            index within spectrogram of first time bin in each window
+        """
+        idx = np.asarray(idx)
+        idx = np.where(idx < 0, idx + len(self), idx)
+        if np.any(idx < 0) or np.any(idx >= len(self)):
+            raise IndexError(
+                f"index out of range for WindowIndex with {len(self)} windows"
+            )
+        record = np.searchsorted(self._ends, idx, side="right")
+        record_first_idx = self._ends[record] - self.n_windows[record]
+        return self.spect_ids[record], self.starts[record] + (idx - record_first_idx)
+
+    def window_spect_ids(self):
+        """get the id of the spectrogram that each window comes from
+
+        Returns
+        -------
+        spect_ids : numpy.ndarray
+            with one element for each window
+        """
+        return np.repeat(self.spect_ids, self.n_windows)
+
+    def valid_mask(self, spect_offsets):
+        """get a boolean vector that marks valid window start indices,
+        for the time bins of all spectrograms concatenated in order of their ids
+
+        Parameters
+        ----------
+        spect_offsets : numpy.ndarray
+            index where each spectrogram starts in the concatenated time bins.
+
+        Returns
+        -------
+        valid : numpy.ndarray
+            boolean, True where a window can start
+        """
+        spect_offsets = np.asarray(spect_offsets)
+        record_starts = spect_offsets[self.spect_ids] + self.starts
+        # "paint" records with a difference array
+        diff = np.zeros(
+            spect_offsets[-1] + self.n_timebins[-1] + 1, dtype=np.int64
+        )
+        np.add.at(diff, record_starts, 1)
+        np.add.at(diff, record_starts + self.n_windows, -1)
+        return np.cumsum(diff[:-1]) > 0
+
+    @classmethod
+    def from_n_timebins(cls, n_timebins, window_size):
+        """make index of all windows from a set of spectrograms
+
+        Parameters
+        ----------
+        n_timebins : numpy.ndarray
+            number of time bins in each spectrogram.
+        window_size : int
+            number of time bins in windows
+
+        Returns
+        -------
+        window_index : WindowIndex
+            where each spectrogram has one record, with all
+            windows that fit inside the spectrogram, starting at index 0.
+            Spectrograms shorter than ``window_size`` have no records.
+        """
+        n_timebins = np.asarray(n_timebins)
+        n_windows = n_timebins - window_size + 1
+        has_windows = n_windows > 0
+        spect_ids = np.arange(n_timebins.shape[-1])[has_windows]
+        return cls(
+            spect_ids,
+            np.zeros(spect_ids.shape, dtype=np.int64),
+            n_windows[has_windows],
+            n_timebins,
+        )
+
+    @classmethod
+    def from_valid_mask(cls, valid, spect_offsets, n_timebins):
+        """make index from a boolean vector that marks valid window start indices,
+        for the time bins of all spectrograms concatenated in order of their ids
+
+        Parameters
+        ----------
+        valid : numpy.ndarray
+            boolean, True where a window can start
+        spect_offsets : numpy.ndarray
+            index where each spectrogram starts in ``valid``.
+        n_timebins : numpy.ndarray
+            number of time bins from each spectrogram that are in the dataset.
+
+        Returns
+        -------
+        window_index : WindowIndex
+        """
+        valid = np.asarray(valid, dtype=bool)
+        spect_offsets = np.asarray(spect_offsets)
+        is_spect_start = np.zeros(valid.shape, dtype=bool)
+        is_spect_start[spect_offsets[spect_offsets < valid.shape[-1]]] = True
+        # a record starts wherever a valid index follows an invalid one,
+        # or at the first index of a spectrogram, so records never span two spectrograms
+        prev_valid = np.concatenate(([False], valid[:-1]))
+        record_starts = np.flatnonzero(valid & (~prev_valid | is_spect_start))
+        next_valid = np.concatenate((valid[1:], [False]))
+        is_spect_end = np.concatenate((is_spect_start[1:], [True]))
+        record_stops = np.flatnonzero(valid & (~next_valid | is_spect_end)) + 1
+
+        spect_ids = np.searchsorted(spect_offsets, record_starts, side="right") - 1
+        return cls(
+            spect_ids,
+            record_starts - spect_offsets[spect_ids],
+            record_stops - record_starts,
+            n_timebins,
+        )
+
+    def save(self, path):
+        """save index to a .npz file
+
+        Parameters
+        ----------
+        path : str, pathlib.Path
+            path to .npz file
+        """
+        np.savez(
+            path,
+            spect_ids=self.spect_ids,
+            starts=self.starts,
+            n_windows=self.n_windows,
+            n_timebins=self.n_timebins,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """load index from a .npz file saved with ``WindowIndex.save``
+
+        Parameters
+        ----------
+        path : str, pathlib.Path
+            path to .npz file
+
+        Returns
+        -------
+        window_index : WindowIndex
+        """
+        arrays = np.load(path)
+        return cls(
+            arrays["spect_ids"],
+            arrays["starts"],
+            arrays["n_windows"],
+            arrays["n_timebins"],
+        )
+
+    def __repr__(self):
+        args = (
+            f"(n_records={self.spect_ids.shape[-1]}, n_windows={len(self)}, "
+            f"n_timebins={int(self.n_timebins.sum())})"
+        )
+        return self.__class__.__name__ + args
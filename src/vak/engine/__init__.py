@@ -1 +1,3 @@
+from . import ensemble
 from . import model
+from . import quantize
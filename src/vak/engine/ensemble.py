@@ -0,0 +1,145 @@
+"""functions that evaluate or make predictions with several models,
+e.g. different checkpoints of the same network, in a single pass through a dataset.
+Each batch is loaded and transformed once, and then fed to every model."""
+from collections import defaultdict
+
+import torch
+from tqdm import tqdm
+
+# name used for the average of outputs from all models
+ENSEMBLE_NAME = "ensemble"
+
+
+def iter_predict(
+    models_map,
+    pred_data,
+    device=None,
+    max_windows=None,
+    average_logits=False,
+    compile=None,
+    amp=None,
+):
+    """make predictions with several models, one file at a time,
+    loading each batch from ``pred_data`` only once.
+
+    Parameters
+    ----------
+    models_map : dict
+        where keys are names and values are instances of ``vak.Model``,
+        e.g. with networks loaded from different checkpoints.
+    pred_data : torch.util.Dataloader
+        instance that will be iterated over.
+    device : str
+        device on which to place tensors. Default is None,
+        in which case the default device is used.
+    max_windows : int
+        maximum number of windows fed to a network at once.
+        Default is None, in which case all windows in a batch are fed at once.
+    average_logits : bool
+        if True, also yield the average of outputs from all models,
+        with the key ``ENSEMBLE_NAME``. Default is False.
+    compile : str
+        one of {'script', 'compile'}. If specified, the network of each model
+        is compiled before making predictions. Default is None.
+    amp : str
+        one of {'bfloat16', 'float16'}. If specified, networks are run
+        in mixed precision with ``torch.autocast``. Default is None.
+
+    Yields
+    ------
+    batch : dict
+        for one file, as if collated with a batch size of 1.
+    outputs : dict
+        where keys are names from ``models_map``, and values are
+        the output of that model's network for the file.
+    """
+    for model in models_map.values():
+        model.prepare_inference(device, max_windows, compile, amp)
+
+    progress_bar = tqdm(pred_data)
+
+    for ind, loader_batch in enumerate(progress_bar):
+        batch_outputs = []
+        # grad mode is set for the whole thread, so don't yield inside no_grad,
+        # which would also disable gradients in the caller between items
+        with torch.no_grad():
+            # for each model, a list of (batch, out) tuples, one for each file
+            file_outputs = {
+                name: list(model.forward_files(loader_batch))
+                for name, model in models_map.items()
+            }
+            for files_outs in zip(*file_outputs.values()):
+                batch = files_outs[0][0]
+                outputs = {
+                    name: file_out[1]
+                    for name, file_out in zip(file_outputs.keys(), files_outs)
+                }
+                if average_logits:
+                    outputs[ENSEMBLE_NAME] = torch.mean(
+                        torch.stack(list(outputs.values())), dim=0
+                    )
+                batch_outputs.append((batch, outputs))
+        yield from batch_outputs
+        progress_bar.set_description(f"batch {ind} / {len(pred_data)}")
+
+
+def evaluate(
+    models_map,
+    eval_data,
+    device=None,
+    max_windows=None,
+    average_logits=False,
+    compile=None,
+    amp=None,
+):
+    """evaluate several models, loading each batch from ``eval_data`` only once.
+
+    Parameters
+    ----------
+    models_map : dict
+        where keys are names and values are instances of ``vak.Model``,
+        e.g. with networks loaded from different checkpoints.
+    eval_data : torch.util.Dataloader
+        instance that will be iterated over.
+    device : str
+        device on which to place tensors. Default is None,
+        in which case the default device is used.
+    max_windows : int
+        maximum number of windows fed to a network at once.
+        Default is None, in which case all windows in a batch are fed at once.
+    average_logits : bool
+        if True, also evaluate the average of outputs from all models,
+        with the key ``ENSEMBLE_NAME``, using the metrics of the first model.
+        Default is False.
+    compile : str
+        one of {'script', 'compile'}. If specified, the network of each model
+        is compiled before evaluating. Default is None.
+    amp : str
+        one of {'bfloat16', 'float16'}. If specified, networks are run
+        in mixed precision with ``torch.autocast``. Default is None.
+
+    Returns
+    -------
+    metric_vals_map : dict
+        where keys are names from ``models_map``, and values are
+        the metrics returned by ``vak.Model.evaluate`` for that model.
+    """
+    first_model = next(iter(models_map.values()))
+    metric_vals_map = defaultdict(lambda: defaultdict(list))
+
+    n_batches = 0
+    with torch.no_grad():
+        for batch, outputs in iter_predict(
+            models_map, eval_data, device, max_windows, average_logits, compile, amp
+        ):
+            for name, out in outputs.items():
+                model = models_map.get(name, first_model)
+                model.eval_file(
+                    batch, out, eval_data.dataset.labelmap, metric_vals_map[name]
+                )
+            n_batches += 1
+
+    return {
+        name: models_map.get(name, first_model).average_metrics(metric_vals, n_batches)
+        for name, metric_vals in metric_vals_map.items()
+    }
@@ -1,15 +1,43 @@
 from collections import defaultdict
+import concurrent.futures
+import contextlib
+import copy
+import os
+from pathlib import Path
+import tempfile
 
 import torch
 import torch.nn.modules.loss
 import torch.optim
 from tqdm import tqdm
 
+from ..constants import (
+    COMPILE_CACHE_DIRNAME,
+    COMPILE_SCRIPT_SUFFIX,
+    VALID_AMP_DTYPES,
+    VALID_COMPILE_MODES,
+)
+from ..datasets import collate
 from ..device import get_default as get_default_device
 from ..labeled_timebins import lbl_tb2labels
 from ..logging import log_or_print
 
 
+@contextlib.contextmanager
+def _environ(name, value):
+    """context manager that sets environment variable ``name`` to ``value``,
+    and restores its previous value on exit"""
+    previous = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = previous
+
+
 class Model:
     """lightweight model class that adds methods for training and evaluation
     to PyTorch neural networks.
@@ -32,12 +60,47 @@ class Model:
     ----------
     device : str
         device on which to place tensors. One of {"cuda", "cpu}.
+    log_step : int
+        number of training steps between updates of the progress bar
+        and writes of the training loss to the summary writer.
+        Set by the fit method. If None, the loss is logged on every step.
+    async_validation : bool
+        if True, validation steps evaluate a snapshot of the network
+        in a background thread while training continues. Set by the fit method.
+    max_windows : int
+        maximum number of windows fed to the network at once
+        when evaluating or predicting. Set by the fit, evaluate, predict,
+        and iter_predict methods. If None, all windows in a batch are fed at once.
+    compile : str
+        mode used to compile the network, one of {'script', 'compile'}.
+        Set by the fit, evaluate, predict, and iter_predict methods.
+        If None, the network is run in eager mode.
+    compile_cache_dir : pathlib.Path
+        directory next to checkpoints where kernels compiled by ``torch.compile``
+        are cached, so they are not compiled again in later runs.
+        Networks loaded from a checkpoint and compiled with ``torch.jit.script``
+        are also saved there, and loaded in later runs with the same checkpoint.
+        Set by the fit and load methods.
+    amp : str
+        reduced-precision dtype that the network is run in with ``torch.autocast``,
+        one of {'bfloat16', 'float16'}.
+        Set by the fit, evaluate, predict, and iter_predict methods.
+        If None, the network is run in float32.
 
     Methods
     -------
     fit : fit a model by training it with supplied data for a specified number of epochs
     evaluate : evaluate a model by computing specified metrics on supplied data
     predict : return predictions of model, i.e. output when fed with supplied data
+    iter_predict : yield predictions of model one batch at a time
+    prepare_inference : set up the model to evaluate or predict, called by evaluate,
+        predict, and iter_predict, and by functions that run several models at once,
+        e.g. ``vak.engine.ensemble.iter_predict``.
+    forward_files : feed a batch to the network and yield the output for each file
+        in the batch. Called by _eval and _iter_predict.
+    eval_file : compute metrics for the output of the network for one file.
+        Called by _eval.
+    average_metrics : average metrics across batches. Called by _eval.
     compile : returns instance of model with attributes set to specified arguments
 
     Private Methods
@@ -52,7 +115,37 @@ class Model:
     _predict : helper method, called by the predict method on each epoch.
         Uses the model to make predictions, by iterating through pred_data
         and returning the outputs of each batch fed into it.
+    _forward_windows : helper method, called by forward_files.
+        Feeds windows to the network in chunks of at most max_windows.
+    _iter_predict : helper method, called by the iter_predict and _predict methods.
+        Yields each batch from pred_data with the output when it is fed into the model.
         Override this method if you need to implement your own predict method.
+    _compile_network : helper method, called by fit and prepare_inference.
+        Compiles the network once, falling back to eager mode if compilation fails.
+    _network_forward : helper method, called by _train and _forward_windows.
+        Feeds input to the compiled network if there is one, else to the network.
+    _script_network : helper method, called by _compile_network.
+        Compiles the network with ``torch.jit.script``, or loads it from
+        ``compile_cache_dir`` if it was compiled before from the same checkpoint.
+    _compile_cache : helper method, called by _network_forward.
+        Sets the cache directory for ``torch.compile`` while the compiled network runs.
+    _network_train : helper method, sets the network and compiled network
+        to training or evaluation mode.
+    _apply_val_metrics : helper method, called by _train after each validation step.
+        Logs metrics, saves the max-val-acc checkpoint, and updates the patience counter.
+    _start_async_eval : helper method, called by _train on validation steps
+        when ``async_validation`` is True. Evaluates a snapshot of the network
+        in a background thread.
+    _finish_async_eval : helper method, called by _train and fit.
+        Waits for the background validation and applies its results.
+    _log_train_losses : helper method, called by _train every ``log_step`` steps.
+        Updates the progress bar and writes the training loss to the summary writer.
+    _set_amp : helper method, called by fit and prepare_inference.
+        Sets the dtype used for mixed precision.
+    _make_grad_scaler : helper method, called by fit.
+        Returns a gradient scaler for the device, used when training in float16.
+    _autocast : helper method, called by _network_forward.
+        Returns the context manager that runs the network in mixed precision.
     """
 
     REQUIRED_SUBCLASS_ATTRIBUTES = [
@@ -83,6 +176,18 @@ class Model:
 
         # attributes set by fit / _train methods
         self.device = None
+        self.log_step = None
+        self.async_validation = False
+        self._val_executor = None
+        self._val_future = None
+        self._val_snapshot = None
+        self.max_windows = None
+        self.compile = None
+        self.compile_cache_dir = None
+        self._compiled_network = None
+        self._loaded_ckpt_path = None
+        self.amp = None
+        self._grad_scaler = None
         self.ckpt_path = None
         self.max_val_acc = 0
         self.max_val_acc_ckpt_path = None
@@ -106,101 +211,58 @@ class Model:
         train_data : torch.util.Dataloader
             instance that will be iterated over.
         """
-        self.network.train()
+        self._network_train(True)
 
+        # (global step, loss) tuples. Losses are kept on the device until they are
+        # logged, so that training does not wait for the loss to be copied every step
+        step_losses = []
         progress_bar = tqdm(train_data)
         for ind, batch in enumerate(progress_bar):
             x, y = batch[0].to(self.device), batch[1].to(self.device)
-            y_pred = self.network.forward(x)
+            y_pred = self._network_forward(x)
             self.optimizer.zero_grad()
             loss = self.loss(y_pred, y)
-            loss.backward()
-            self.optimizer.step()
-            progress_bar.set_description(
-                f"Epoch {epoch}, batch {ind}. Loss: {loss.item():.4f}. Global step: {self.global_step}"
-            )
-
-            if self.summary_writer is not None:
-                self.summary_writer.add_scalar(
-                    "loss/train", loss.item(), self.global_step
-                )
+            if self._grad_scaler is not None:
+                # scale loss so small float16 gradients do not underflow to zero
+                self._grad_scaler.scale(loss).backward()
+                self._grad_scaler.step(self.optimizer)
+                self._grad_scaler.update()
+            else:
+                loss.backward()
+                self.optimizer.step()
+            step_losses.append((self.global_step, loss.detach()))
+            if len(step_losses) >= (self.log_step or 1):
+                self._log_train_losses(step_losses, epoch, ind, progress_bar)
+                step_losses = []
             self.global_step += 1
 
             if val_data is not None:
-                if self.global_step % val_step == 0:
-                    log_or_print(
-                        f"Step {self.global_step} is a validation step; computing metrics on validation set",
-                        logger=self.logger,
-                        level="info",
-                    )
-                    metric_vals = self._eval(val_data)
-                    self.network.train()  # because _eval calls network.eval()
-                    log_or_print(
-                        msg=", ".join(
-                            [
-                                f"{metric_name}: {metric_value:.4f}"
-                                for metric_name, metric_value in metric_vals.items()
-                                if metric_name.startswith("avg_")
-                            ]
-                        ),
-                        logger=self.logger,
-                        level="info",
-                    )
-
-                    if self.summary_writer is not None:
-                        for metric_name, metric_value in metric_vals.items():
-                            if metric_name.startswith("avg_"):
-                                self.summary_writer.add_scalar(
-                                    f"{metric_name}/val", metric_value, self.global_step
-                                )
-
-                    current_val_acc = metric_vals["avg_acc"]
-                    if current_val_acc > self.max_val_acc:
-                        self.max_val_acc = current_val_acc
+                stop = False
+                if self._val_future is not None and self._val_future.done():
+                    stop = self._finish_async_eval()
+                if not stop and self.global_step % val_step == 0:
+                    if self.async_validation:
+                        stop = self._start_async_eval(val_data, epoch)
+                    else:
                         log_or_print(
-                            msg=f"Accuracy on validation set improved. Saving max-val-acc checkpoint.",
+                            f"Step {self.global_step} is a validation step; computing metrics on validation set",
                             logger=self.logger,
                             level="info",
                         )
-                        self.save(
-                            self.max_val_acc_ckpt_path,
-                            epoch=epoch,
-                            global_step=self.global_step,
+                        metric_vals = self._eval(val_data)
+                        self._network_train(True)  # because _eval calls network.eval()
+                        stop = self._apply_val_metrics(
+                            metric_vals, epoch, self.global_step
                         )
-                        if self.patience:
-                            self.patience_counter = 0
-                    else:  # if accuracy did not improve
-                        if self.patience:
-                            self.patience_counter += 1
-                            if self.patience_counter > self.patience:
-                                log_or_print(
-                                    "Stopping training early, "
-                                    f"accuracy has not improved in {self.patience} validation steps.",
-                                    logger=self.logger,
-                                    level="info",
-                                )
-                                # save "backup" checkpoint upon stopping; don't save over "max-val-acc" checkpoint
-                                self.save(
-                                    self.ckpt_path,
-                                    epoch=epoch,
-                                    global_step=self.global_step,
-                                )
-                                progress_bar.close()
-                                break
-                            else:
-                                log_or_print(
-                                    f"Accuracy has not improved in {self.patience_counter} validation steps. "
-                                    f"Not saving max-val-acc checkpoint for this validation step.",
-                                    logger=self.logger,
-                                    level="info",
-                                )
-                        else:  # patience is None. We still log that we are not saving checkpoint.
-                            log_or_print(
-                                "Accuracy is less than maximum validation accuracy so far. "
-                                "Not saving max-val-acc checkpoint.",
-                                logger=self.logger,
-                                level="info",
-                            )
+                if stop:
+                    # save "backup" checkpoint upon stopping; don't save over "max-val-acc" checkpoint
+                    self.save(
+                        self.ckpt_path,
+                        epoch=epoch,
+                        global_step=self.global_step,
+                    )
+                    progress_bar.close()
+                    break
 
             # below can be true regardless of whether we have val_data and/or current epoch is a val_epoch
             if self.global_step % ckpt_step == 0:
@@ -211,6 +273,251 @@ class Model:
                 )
                 self.save(self.ckpt_path, epoch=epoch, global_step=self.global_step)
 
+        if step_losses:
+            # log losses from last steps of epoch, or from before stopping early
+            self._log_train_losses(step_losses, epoch, ind, progress_bar)
+
+    def _apply_val_metrics(self, metric_vals, epoch, global_step, **ckpt_kwargs):
+        """helper method, called by _train after each validation step.
+        Logs metrics computed on the validation set, writes them to the summary writer,
+        saves the max-val-acc checkpoint if accuracy improved,
+        and updates the patience counter used for early stopping.
+
+        Parameters
+        ----------
+        metric_vals : dict
+            returned by _eval.
+        epoch : int
+            epoch when validation step started.
+        global_step : int
+            global step when validation step started.
+        ckpt_kwargs :
+            passed to the save method, e.g. to save the state_dicts
+            from a snapshot of the network that was validated asynchronously.
+
+        Returns
+        -------
+        stop : bool
+            if True, accuracy has not improved in ``patience`` validation steps,
+            and training should stop early.
+        """
+        log_or_print(
+            msg=", ".join(
+                [
+                    f"{metric_name}: {metric_value:.4f}"
+                    for metric_name, metric_value in metric_vals.items()
+                    if metric_name.startswith("avg_")
+                ]
+            ),
+            logger=self.logger,
+            level="info",
+        )
+
+        if self.summary_writer is not None:
+            for metric_name, metric_value in metric_vals.items():
+                if metric_name.startswith("avg_"):
+                    self.summary_writer.add_scalar(
+                        f"{metric_name}/val", metric_value, global_step
+                    )
+
+        current_val_acc = metric_vals["avg_acc"]
+        if current_val_acc > self.max_val_acc:
+            self.max_val_acc = current_val_acc
+            log_or_print(
+                msg=f"Accuracy on validation set improved. Saving max-val-acc checkpoint.",
+                logger=self.logger,
+                level="info",
+            )
+            self.save(
+                self.max_val_acc_ckpt_path,
+                epoch=epoch,
+                global_step=global_step,
+                **ckpt_kwargs,
+            )
+            if self.patience:
+                self.patience_counter = 0
+        else:  # if accuracy did not improve
+            if self.patience:
+                self.patience_counter += 1
+                if self.patience_counter > self.patience:
+                    log_or_print(
+                        "Stopping training early, "
+                        f"accuracy has not improved in {self.patience} validation steps.",
+                        logger=self.logger,
+                        level="info",
+                    )
+                    return True
+                else:
+                    log_or_print(
+                        f"Accuracy has not improved in {self.patience_counter} validation steps. "
+                        f"Not saving max-val-acc checkpoint for this validation step.",
+                        logger=self.logger,
+                        level="info",
+                    )
+            else:  # patience is None. We still log that we are not saving checkpoint.
+                log_or_print(
+                    "Accuracy is less than maximum validation accuracy so far. "
+                    "Not saving max-val-acc checkpoint.",
+                    logger=self.logger,
+                    level="info",
+                )
+        return False
+
+    def _start_async_eval(self, val_data, epoch):
+        """helper method, called by _train on validation steps when
+        ``async_validation`` is True. Takes a snapshot of the network and optimizer,
+        and evaluates the snapshot on val_data in a background thread
+        while training continues. Results are applied by _finish_async_eval.
+
+        If the previous validation step has not finished, waits for it first.
+
+        Parameters
+        ----------
+        val_data : torch.util.Dataloader
+            instance that will be iterated over.
+        epoch : int
+            current epoch.
+
+        Returns
+        -------
+        stop : bool
+            if True, the previous validation step finished,
+            and training should stop early.
+        """
+        if self._val_future is not None:
+            log_or_print(
+                f"Step {self.global_step} is a validation step; "
+                "waiting for previous validation step to finish",
+                logger=self.logger,
+                level="info",
+            )
+            if self._finish_async_eval():
+                return True
+
+        log_or_print(
+            f"Step {self.global_step} is a validation step; "
+            "computing metrics on validation set in background",
+            logger=self.logger,
+            level="info",
+        )
+        val_model = copy.copy(self)
+        val_model.network = copy.deepcopy(self.network)
+        # the compiled network shares parameters with the network being trained
+        val_model.compile = None
+        val_model._compiled_network = None
+        self._val_snapshot = {
+            "epoch": epoch,
+            "global_step": self.global_step,
+            "network_state_dict": val_model.network.state_dict(),
+            "optimizer_state_dict": copy.deepcopy(self.optimizer.state_dict()),
+        }
+        self._val_future = self._val_executor.submit(val_model._eval, val_data)
+        return False
+
+    def _finish_async_eval(self):
+        """helper method, called by _train and fit. Waits for validation
+        started by _start_async_eval to finish, and then applies the results
+        with _apply_val_metrics, using the global step when the snapshot was taken.
+        The max-val-acc checkpoint is saved from the snapshot.
+
+        Returns
+        -------
+        stop : bool
+            if True, training should stop early.
+        """
+        metric_vals = self._val_future.result()
+        snapshot = self._val_snapshot
+        self._val_future = None
+        self._val_snapshot = None
+        log_or_print(
+            f"Finished computing metrics on validation set for step {snapshot['global_step']}",
+            logger=self.logger,
+            level="info",
+        )
+        return self._apply_val_metrics(metric_vals, **snapshot)
+
+    def _log_train_losses(self, step_losses, epoch, ind, progress_bar):
+        """helper method, called by _train every ``log_step`` steps.
+        Copies the losses from the steps since they were last logged off the device
+        all at once, updates the progress bar with the loss from the last step,
+        and writes the loss from every step to the summary writer.
+
+        Parameters
+        ----------
+        step_losses : list
+            of (global step, loss) tuples, where loss is a scalar tensor.
+        epoch : int
+            current epoch.
+        ind : int
+            index of current batch in epoch.
+        progress_bar : tqdm.tqdm
+            progress bar for epoch.
+        """
+        steps = [step for step, _ in step_losses]
+        losses = torch.stack([loss for _, loss in step_losses]).cpu().tolist()
+        progress_bar.set_description(
+            f"Epoch {epoch}, batch {ind}. Loss: {losses[-1]:.4f}. Global step: {steps[-1]}"
+        )
+        if self.summary_writer is not None:
+            for step, loss in zip(steps, losses):
+                self.summary_writer.add_scalar("loss/train", loss, step)
+
+    def forward_files(self, batch):
+        """called by the _eval and _iter_predict methods.
+        Feeds a batch of windows from eval or predict data to the network,
+        and yields the output for each spectrogram file in the batch.
+
+        Parameters
+        ----------
+        batch : dict
+            returned by a torch.util.Dataloader. Either one item from a ``VocalDataset``,
+            collated with a batch size of 1, or items from several files,
+            collated by ``vak.datasets.collate.collate_window_batch``.
+
+        Yields
+        ------
+        batch : dict
+            for one file, as if collated with a batch size of 1.
+        out : torch.Tensor
+            output of network for windows from that file.
+        """
+        x = batch["source"]
+        if "n_windows" in batch:
+            # windows from several files, concatenated into one batch
+            out = self._forward_windows(x)
+            yield from collate.unpack_window_batch(batch, out)
+        else:
+            # remove "batch" dimension added by collate_fn to x
+            if x.ndim == 5:
+                if x.shape[0] == 1:
+                    x = torch.squeeze(x, dim=0)
+            yield batch, self._forward_windows(x)
+
+    def _forward_windows(self, x):
+        """helper method, called by forward_files.
+        Feeds windows to the network, in chunks of at most ``max_windows`` windows,
+        and concatenates the outputs.
+
+        Parameters
+        ----------
+        x : torch.Tensor
+            windows from spectrograms, where the first dimension is windows.
+            Each chunk is moved to ``device`` just before it is fed to the network.
+
+        Returns
+        -------
+        out : torch.Tensor
+            output of network, where the first dimension is windows.
+        """
+        if self.max_windows is None or x.shape[0] <= self.max_windows:
+            return self._network_forward(x.to(self.device))
+        return torch.cat(
+            [
+                self._network_forward(chunk.to(self.device))
+                for chunk in torch.split(x, self.max_windows)
+            ]
+        )
+
     def _eval(self, eval_data):
         """helper method, called by the evaluate method, and called by the fit
         method for validation after each epoch. Evaluates the model by iterating
@@ -222,7 +529,7 @@ class Model:
         eval_data : torch.util.Dataloader
             instance that will be iterated over.
         """
-        self.network.eval()
+        self._network_train(False)
 
         metric_vals = defaultdict(list)
 
@@ -230,88 +537,109 @@ class Model:
 
         progress_bar = tqdm(eval_data)
         with torch.no_grad():
-            for ind, batch in enumerate(progress_bar):
-                x, y = batch["source"].to(self.device), batch["annot"].to(self.device)
-                # remove "batch" dimension added by collate_fn to x
-                # we keep for y because loss still expects the first dimension to be batch
-                if x.ndim == 5:
-                    if x.shape[0] == 1:
-                        x = torch.squeeze(x, dim=0)
-                else:
+            for ind, loader_batch in enumerate(progress_bar):
+                x = loader_batch["source"]
+                if "n_windows" not in loader_batch and x.ndim != 5:
                     raise ValueError(f"invalid shape for x: {x.shape}")
+                # compute metrics for each file, even when a batch has windows from several files
+                for batch, out in self.forward_files(loader_batch):
+                    self.eval_file(
+                        batch, out, eval_data.dataset.labelmap, metric_vals
+                    )
+                    n_batches += 1
+                progress_bar.set_description(f"batch {ind} / {len(eval_data)}")
 
-                out = self.network.forward(x)
-                # permute and flatten out
-                # so that it has shape (1, number classes, number of time bins)
-                # ** NOTICE ** just calling out.reshape(1, out.shape(1), -1) does not work, it will change the data
-                out = out.permute(1, 0, 2)
-                out = torch.flatten(out, start_dim=1)
-                out = torch.unsqueeze(out, dim=0)
-                # reduce to predictions, assuming class dimension is 1
-                y_pred = torch.argmax(
-                    out, dim=1
-                )  # y_pred has dims (batch size 1, predicted label per time bin)
-
-                if "padding_mask" in batch:
-                    padding_mask = batch[
-                        "padding_mask"
-                    ]  # boolean: 1 where valid, 0 where padding
-                    # remove "batch" dimension added by collate_fn
-                    # because this extra dimension just makes it confusing to use the mask as indices
-                    if padding_mask.ndim == 2:
-                        if padding_mask.shape[0] == 1:
-                            padding_mask = torch.squeeze(padding_mask, dim=0)
-                    else:
-                        raise ValueError(
-                            f"invalid shape for padding mask: {padding_mask.shape}"
-                        )
+        return self.average_metrics(metric_vals, n_batches)
 
-                    out = out[:, :, padding_mask]
-                    y_pred = y_pred[:, padding_mask]
-
-                if any(
-                    [
-                        "levenshtein" in metric_name
-                        for metric_name in self.metrics.keys()
-                    ]
-                ) or any(
-                    [
-                        "segment_error_rate" in metric_name
-                        for metric_name in self.metrics.keys()
-                    ]
-                ):
-                    y_labels = lbl_tb2labels(
-                        y.cpu().numpy(), eval_data.dataset.labelmap
-                    )
-                    y_pred_labels = lbl_tb2labels(
-                        y_pred.cpu().numpy(), eval_data.dataset.labelmap
-                    )
-                else:
-                    y_labels = None
-                    y_pred_labels = None
-
-                for metric_name, metric_callable in self.metrics.items():
-                    if metric_name == "loss":
-                        metric_vals[metric_name].append(metric_callable(out, y))
-                    elif metric_name == "acc":
-                        metric_vals[metric_name].append(metric_callable(y_pred, y))
-                    elif metric_name == "levenshtein":
-                        metric_vals[metric_name].append(
-                            metric_callable(y_pred_labels, y_labels)
-                        )
-                    elif metric_name == "segment_error_rate":
-                        metric_vals[metric_name].append(
-                            metric_callable(y_pred_labels, y_labels)
-                        )
-                    else:
-                        raise NotImplementedError(
-                            f"calculation of metric not yet implemented for {metric_name}"
-                        )
+    def eval_file(self, batch, out, labelmap, metric_vals):
+        """called by _eval.
+        Computes the specified metrics for the output of the network for one file,
+        and appends them to ``metric_vals``.
 
-                n_batches += 1
-                progress_bar.set_description(f"batch {ind} / {len(eval_data)}")
+        Parameters
+        ----------
+        batch : dict
+            for one file, as if collated with a batch size of 1,
+            with key 'annot' and optionally 'padding_mask'.
+        out : torch.Tensor
+            output of network for windows from that file.
+        labelmap : dict
+            that maps labels to consecutive integers.
+        metric_vals : collections.defaultdict
+            where keys are metric names and values are lists.
+        """
+        # we keep "batch" dimension for y because loss still expects the first dimension to be batch
+        y = batch["annot"].to(self.device)
+        # permute and flatten out
+        # so that it has shape (1, number classes, number of time bins)
+        # ** NOTICE ** just calling out.reshape(1, out.shape(1), -1) does not work, it will change the data
+        out = out.permute(1, 0, 2)
+        out = torch.flatten(out, start_dim=1)
+        out = torch.unsqueeze(out, dim=0)
+        # reduce to predictions, assuming class dimension is 1
+        # y_pred has dims (batch size 1, predicted label per time bin)
+        y_pred = torch.argmax(out, dim=1)
+
+        if "padding_mask" in batch:
+            # boolean: 1 where valid, 0 where padding
+            padding_mask = batch["padding_mask"]
+            # remove "batch" dimension added by collate_fn
+            # because this extra dimension just makes it confusing to use the mask as indices
+            if padding_mask.ndim == 2:
+                if padding_mask.shape[0] == 1:
+                    padding_mask = torch.squeeze(padding_mask, dim=0)
+            else:
+                raise ValueError(f"invalid shape for padding mask: {padding_mask.shape}")
+
+            out = out[:, :, padding_mask]
+            y_pred = y_pred[:, padding_mask]
+
+        if any(
+            ["levenshtein" in metric_name for metric_name in self.metrics.keys()]
+        ) or any(
+            ["segment_error_rate" in metric_name for metric_name in self.metrics.keys()]
+        ):
+            y_labels = lbl_tb2labels(y.cpu().numpy(), labelmap)
+            y_pred_labels = lbl_tb2labels(y_pred.cpu().numpy(), labelmap)
+        else:
+            y_labels = None
+            y_pred_labels = None
+
+        for metric_name, metric_callable in self.metrics.items():
+            if metric_name == "loss":
+                metric_vals[metric_name].append(metric_callable(out, y))
+            elif metric_name == "acc":
+                metric_vals[metric_name].append(metric_callable(y_pred, y))
+            elif metric_name == "levenshtein":
+                metric_vals[metric_name].append(
+                    metric_callable(y_pred_labels, y_labels)
+                )
+            elif metric_name == "segment_error_rate":
+                metric_vals[metric_name].append(
+                    metric_callable(y_pred_labels, y_labels)
+                )
+            else:
+                raise NotImplementedError(
+                    f"calculation of metric not yet implemented for {metric_name}"
+                )
+
+    def average_metrics(self, metric_vals, n_batches):
+        """called by _eval.
+        Adds the average of each metric across batches to ``metric_vals``.
 
-        # ---- compute metrics averaged across batches -----------------------------------------------------------------
+        Parameters
+        ----------
+        metric_vals : collections.defaultdict
+            where keys are metric names and values are lists,
+            with one value for each of ``n_batches``.
+        n_batches : int
+            number of batches.
+
+        Returns
+        -------
+        metric_vals : collections.defaultdict
+            with averages added, with keys 'avg_{metric name}'.
+        """
         # iterate over list of keys, to avoid "dictionary changed size" error when adding average metrics
         for metric_name in list(metric_vals):
             if metric_name in ["loss", "acc", "levenshtein", "segment_error_rate"]:
@@ -327,11 +655,40 @@ class Model:
 
         return metric_vals
 
+    def _iter_predict(self, pred_data):
+        """helper method, called by the iter_predict and _predict methods.
+        Uses the model to make predictions, by iterating through pred_data
+        and yielding each batch along with the output when it is fed into the model.
+        Override this method if you need to implement your own predict method.
+
+        Parameters
+        ----------
+        pred_data : torch.util.Dataloader
+            instance that will be iterated over.
+
+        Yields
+        ------
+        batch : dict
+            returned by pred_data, e.g. with keys 'source', 'spect_path', and 'padding_mask'.
+        y_pred : torch.Tensor
+            output of network when fed ``batch["source"]``.
+        """
+        self._network_train(False)
+
+        progress_bar = tqdm(pred_data)
+
+        for ind, loader_batch in enumerate(progress_bar):
+            # grad mode is set for the whole thread, so don't yield inside no_grad,
+            # which would also disable gradients in the caller between items
+            with torch.no_grad():
+                files_outs = list(self.forward_files(loader_batch))
+            yield from files_outs
+            progress_bar.set_description(f"batch {ind} / {len(pred_data)}")
+
     def _predict(self, pred_data):
         """helper method, called by the predict method.
         Uses the model to make predictions, by iterating through pred_data
         and returning the outputs of each batch fed into it.
-        Override this method if you need to implement your own predict method.
 
         Parameters
         ----------
@@ -339,23 +696,222 @@ class Model:
             instance that will be iterated over.
         """
         preds = {}
-        self.network.eval()
+        for batch, y_pred in self._iter_predict(pred_data):
+            spect_path = batch["spect_path"]
+            if isinstance(spect_path, list) and len(spect_path) == 1:
+                spect_path = spect_path[0]
+            preds[spect_path] = y_pred
+        return preds
 
-        progress_bar = tqdm(pred_data)
+    def _compile_network(self, compile=None):
+        """helper method, called by fit and prepare_inference.
+        Compiles the network once, and keeps the compiled network
+        so it is re-used, e.g. when the fit method calls _eval for validation.
+        If compilation fails, logs the error and falls back to eager mode.
 
-        with torch.no_grad():
-            for ind, batch in enumerate(progress_bar):
-                x, spect_path = batch["source"].to(self.device), batch["spect_path"]
-                if isinstance(spect_path, list) and len(spect_path) == 1:
-                    spect_path = spect_path[0]
-                if x.ndim == 5:
-                    if x.shape[0] == 1:
-                        x = torch.squeeze(x, dim=0)
-                y_pred = self.network.forward(x)
-                preds[spect_path] = y_pred
-                progress_bar.set_description(f"batch {ind} / {len(pred_data)}")
+        Parameters
+        ----------
+        compile : str
+            one of {'script', 'compile'}. If 'script', the network is compiled
+            with ``torch.jit.script``, and if it was loaded from a checkpoint, the
+            compiled network is cached in ``compile_cache_dir``. If 'compile', it is
+            compiled with ``torch.compile``, and compiled kernels are cached there.
+            Default is None, in which case the network is run in eager mode.
+        """
+        if compile is not None and compile not in VALID_COMPILE_MODES:
+            raise ValueError(
+                f"invalid compile mode: {compile}. Valid modes are: {VALID_COMPILE_MODES}"
+            )
+        if compile == self.compile and (
+            compile is None or self._compiled_network is not None
+        ):
+            return
+        self.compile = compile
+        self._compiled_network = None
+        if compile is None:
+            return
 
-        return preds
+        log_or_print(
+            f"compiling network with mode: {compile}", logger=self.logger, level="info"
+        )
+        try:
+            if compile == "script":
+                self._compiled_network = self._script_network()
+            elif compile == "compile":
+                # compiles lazily, when called, see _compile_cache
+                self._compiled_network = torch.compile(self.network)
+        except Exception as e:
+            log_or_print(
+                f"could not compile network with mode '{compile}', "
+                f"using eager mode instead. Error was: {e}",
+                logger=self.logger,
+                level="warning",
+            )
+            self._compiled_network = None
+
+    def _network_forward(self, x):
+        """helper method, called by _train and _forward_windows.
+        Feeds x to the compiled network if there is one, else to the network.
+        If the compiled network fails, e.g. because ``torch.compile``
+        compiles when it is first called, falls back to eager mode.
+
+        If ``amp`` is set, x is cast to that dtype and the network is run
+        with ``torch.autocast``. The output is always returned in float32,
+        so that loss and metrics are computed in full precision."""
+        if self.amp is not None:
+            x = x.to(getattr(torch, self.amp))
+        with self._autocast():
+            out = None
+            if self._compiled_network is not None:
+                try:
+                    with self._compile_cache():
+                        out = self._compiled_network(x)
+                except Exception as e:
+                    log_or_print(
+                        f"compiled network failed, using eager mode instead. Error was: {e}",
+                        logger=self.logger,
+                        level="warning",
+                    )
+                    self._compiled_network = None
+            if out is None:
+                out = self.network.forward(x)
+        return out.float()
+
+    def _script_network(self):
+        """helper method, called by _compile_network.
+        Compiles the network with ``torch.jit.script``.
+
+        If the network was loaded from a checkpoint by the load method,
+        the compiled network is saved in ``compile_cache_dir``, and later runs
+        with the same checkpoint load it instead of compiling again.
+        A network loaded this way has its own copy of the parameters
+        from the checkpoint, instead of sharing them with ``network``,
+        so networks that are being trained are not cached.
+
+        Returns
+        -------
+        scripted : torch.jit.ScriptModule
+            compiled network.
+        """
+        if self._loaded_ckpt_path is None or self.compile_cache_dir is None:
+            return torch.jit.script(self.network)
+
+        script_path = self.compile_cache_dir.joinpath(
+            self._loaded_ckpt_path.stem + COMPILE_SCRIPT_SUFFIX
+        )
+        # re-use compiled network unless checkpoint changed since it was saved
+        if (
+            script_path.exists()
+            and script_path.stat().st_mtime_ns
+            >= self._loaded_ckpt_path.stat().st_mtime_ns
+        ):
+            try:
+                scripted = torch.jit.load(
+                    str(script_path),
+                    map_location=next(self.network.parameters()).device,
+                )
+                log_or_print(
+                    f"loaded compiled network from: {script_path}",
+                    logger=self.logger,
+                    level="info",
+                )
+                return scripted
+            except Exception as e:
+                log_or_print(
+                    f"could not load compiled network from {script_path}, "
+                    f"compiling again. Error was: {e}",
+                    logger=self.logger,
+                    level="warning",
+                )
+
+        scripted = torch.jit.script(self.network)
+        try:
+            self.compile_cache_dir.mkdir(exist_ok=True)
+            # save to a temporary file then rename it,
+            # so other runs never load part of a file
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.compile_cache_dir)
+            os.close(fd)
+            torch.jit.save(scripted, tmp_path)
+            os.replace(tmp_path, script_path)
+        except Exception as e:
+            log_or_print(
+                f"could not save compiled network to {script_path}. Error was: {e}",
+                logger=self.logger,
+                level="warning",
+            )
+        return scripted
+
+    def _compile_cache(self):
+        """helper method, called by _network_forward.
+        Returns a context manager that sets the ``TORCHINDUCTOR_CACHE_DIR``
+        environment variable to ``compile_cache_dir`` while a network compiled
+        with ``torch.compile`` is called, since it compiles when it is called,
+        e.g. the first time and again for inputs with a new shape.
+        The previous value is restored afterwards, so the directory does not
+        become the cache for other models, e.g. later replicates in a learning curve.
+        Returns a context manager that does nothing for other compile modes."""
+        if self.compile != "compile" or self.compile_cache_dir is None:
+            return contextlib.nullcontext()
+        return _environ("TORCHINDUCTOR_CACHE_DIR", str(self.compile_cache_dir))
+
+    def _network_train(self, mode=True):
+        """helper method, sets the network, and the compiled network if there is one,
+        to training mode if mode is True, or evaluation mode if mode is False.
+        Needed because a network compiled with ``torch.jit.script``
+        has its own training attribute."""
+        self.network.train(mode)
+        if self._compiled_network is not None:
+            self._compiled_network.train(mode)
+
+    def _set_amp(self, amp=None):
+        """helper method, called by fit and prepare_inference.
+        Sets the dtype that the network is run in with ``torch.autocast``.
+
+        Parameters
+        ----------
+        amp : str
+            one of {'bfloat16', 'float16'}. Default is None,
+            in which case the network is run in float32.
+        """
+        if amp is not None and amp not in VALID_AMP_DTYPES:
+            raise ValueError(
+                f"invalid dtype for amp: {amp}. Valid dtypes are: {VALID_AMP_DTYPES}"
+            )
+        if amp is not None and not hasattr(torch, "autocast"):
+            raise ValueError(
+                "amp requires torch.autocast, added in torch 1.10, "
+                f"but the installed version of torch is: {torch.__version__}"
+            )
+        self.amp = amp
+
+    def _make_grad_scaler(self):
+        """helper method, called by fit when ``amp`` is 'float16'.
+        Returns a gradient scaler for the type of ``device``.
+        Uses ``torch.amp.GradScaler``, added in torch 2.3, when it is available,
+        and otherwise ``torch.cuda.amp.GradScaler``, that only scales gradients
+        on CUDA devices."""
+        device_type = torch.device(self.device).type
+        amp_module = getattr(torch, "amp", None)
+        if hasattr(amp_module, "GradScaler"):
+            return amp_module.GradScaler(device_type)
+        if device_type == "cuda":
+            return torch.cuda.amp.GradScaler()
+        raise ValueError(
+            f"training with amp='float16' on device type '{device_type}' requires "
+            "torch.amp.GradScaler, added in torch 2.3, but the installed version "
+            f"of torch is: {torch.__version__}. Use amp='bfloat16' instead, "
+            "that does not need gradients to be scaled"
+        )
+
+    def _autocast(self):
+        """helper method, called by _network_forward.
+        Returns ``torch.autocast`` for the device type and ``amp`` dtype,
+        or a context manager that does nothing if ``amp`` is None."""
+        if self.amp is None:
+            return contextlib.nullcontext()
+        return torch.autocast(
+            device_type=torch.device(self.device).type, dtype=getattr(torch, self.amp)
+        )
 
     def save(self, ckpt_path, **kwargs):
         """save model state to a checkpoint file.
@@ -402,6 +958,11 @@ class Model:
         ckpt = torch.load(ckpt_path, map_location=device)
         self.network.load_state_dict(ckpt["network_state_dict"])
         self.optimizer.load_state_dict(ckpt["optimizer_state_dict"])
+        self.compile_cache_dir = Path(ckpt_path).parent.joinpath(COMPILE_CACHE_DIRNAME)
+        if self._loaded_ckpt_path is not None:
+            # compiled network may have been loaded from cache with the old parameters
+            self._compiled_network = None
+        self._loaded_ckpt_path = Path(ckpt_path)
 
     def fit(
         self,
@@ -413,6 +974,11 @@ class Model:
         ckpt_step=None,
         patience=None,
         device=None,
+        max_windows=None,
+        compile=None,
+        amp=None,
+        log_step=None,
+        async_validation=False,
     ):
         # ---- pre-conditions ----------
         if val_data is None:
@@ -429,6 +995,9 @@ class Model:
         if device is None:
             device = get_default_device()
         self.device = device
+        self.max_windows = max_windows
+        self.log_step = log_step
+        self.async_validation = async_validation
 
         # note there can be up to two checkpoint paths.
         # this first one is the "backup" checkpoint, saved intermittently (with frequency determined by ckpt_step)
@@ -445,6 +1014,23 @@ class Model:
             self.patience_counter = 0
 
         self.network.to(self.device)
+        self.compile_cache_dir = ckpt_root.joinpath(COMPILE_CACHE_DIRNAME)
+        if self._loaded_ckpt_path is not None:
+            # network is trained, so don't cache the compiled network, or use one
+            # loaded from cache, that does not share parameters with the network
+            self._loaded_ckpt_path = None
+            self._compiled_network = None
+        self._compile_network(compile)
+        self._set_amp(amp)
+        if amp == "float16":
+            # bfloat16 has the same range as float32, so only float16 needs a scaler
+            self._grad_scaler = self._make_grad_scaler()
+        else:
+            self._grad_scaler = None
+
+        if async_validation and val_data is not None:
+            # one thread, so that validation steps finish in the order they start
+            self._val_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
         # ---- actually do fitting ----------
         for epoch in range(1, num_epochs + 1):
@@ -457,26 +1043,102 @@ class Model:
                     # need to break here too, not just inside _train function
                     break
 
+        if self._val_future is not None:
+            # apply results from last validation step before training ends
+            self._finish_async_eval()
+        if self._val_executor is not None:
+            self._val_executor.shutdown()
+            self._val_executor = None
+
         if (
             epoch == num_epochs
         ):  # save at end, if we complete all epochs (not if we stopped because of patience)
             log_or_print("Completed last epoch.", logger=self.logger, level="info")
             self.save(self.ckpt_path, epoch=epoch, global_step=self.global_step)
 
-    def evaluate(self, eval_data, device=None):
+    def prepare_inference(self, device=None, max_windows=None, compile=None, amp=None):
+        """set up the model to evaluate or make predictions.
+        Called by evaluate, predict, and iter_predict, and by functions
+        that feed the same data to several models, e.g. ``vak.engine.ensemble``,
+        before they call ``forward_files``.
+
+        Moves the network to ``device``, compiles it, sets the dtype
+        used for mixed precision, and puts the network in evaluation mode.
+
+        Parameters
+        ----------
+        device : str
+            device on which to place tensors. Default is None,
+            in which case the default device is used.
+        max_windows : int
+            maximum number of windows fed to the network at once.
+            Default is None, in which case all windows in a batch are fed at once.
+        compile : str
+            one of {'script', 'compile'}. If specified, the network is compiled.
+            Default is None, in which case the network is run in eager mode.
+        amp : str
+            one of {'bfloat16', 'float16'}. If specified, the network is run
+            in mixed precision with ``torch.autocast``. Default is None,
+            in which case the network is run in float32.
+        """
         if device is None:
             device = get_default_device()
         self.device = device
+        self.max_windows = max_windows
         self.network.to(self.device)
+        self._compile_network(compile)
+        self._set_amp(amp)
+        self._network_train(False)
+
+    def evaluate(
+        self, eval_data, device=None, max_windows=None, compile=None, amp=None
+    ):
+        self.prepare_inference(device, max_windows, compile, amp)
         return self._eval(eval_data)
 
-    def predict(self, pred_data, device=None):
-        if device is None:
-            device = get_default_device()
-        self.device = device
-        self.network.to(self.device)
+    def predict(
+        self, pred_data, device=None, max_windows=None, compile=None, amp=None
+    ):
+        self.prepare_inference(device, max_windows, compile, amp)
         return self._predict(pred_data)
 
+    def iter_predict(
+        self, pred_data, device=None, max_windows=None, compile=None, amp=None
+    ):
+        """make predictions one batch at a time.
+
+        Unlike ``predict``, does not keep outputs for all of ``pred_data``,
+        so that each batch can be processed and discarded before the next.
+
+        Parameters
+        ----------
+        pred_data : torch.util.Dataloader
+            instance that will be iterated over.
+        device : str
+            device on which to place tensors. Default is None,
+            in which case the default device is used.
+        max_windows : int
+            maximum number of windows fed to the network at once.
+            Default is None, in which case all windows in a batch are fed at once.
+        compile : str
+            one of {'script', 'compile'}. If specified, the network is compiled
+            before making predictions. Default is None, in which case
+            the network is run in eager mode.
+        amp : str
+            one of {'bfloat16', 'float16'}. If specified, the network is run
+            in mixed precision with ``torch.autocast``. Default is None,
+            in which case the network is run in float32.
+
+        Yields
+        ------
+        batch : dict
+            returned by pred_data
+        y_pred : torch.Tensor
+            output of network for batch
+        """
+        self.prepare_inference(device, max_windows, compile, amp)
+        yield from self._iter_predict(pred_data)
+
     @classmethod
     def from_config(cls, config, logger=None):
         """any model that inherits from this class should do whatever it needs to
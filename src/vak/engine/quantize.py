@@ -0,0 +1,118 @@
+"""functions that quantize networks of trained models,
+to make predictions faster on the CPU."""
+import copy
+
+import torch
+from torch import nn
+
+from . import ensemble
+from ..constants import VALID_QUANTIZE_MODES
+
+
+def quantize_dynamic(model, layer_types=(nn.LSTM, nn.Linear), dtype=torch.qint8):
+    """get a copy of a model whose network has dynamic quantization applied.
+
+    Weights of the specified layer types are converted to ``dtype``,
+    and activations are quantized on the fly during inference.
+    Quantized networks can only be run on the CPU.
+
+    Parameters
+    ----------
+    model : vak.Model
+        trained model.
+    layer_types : tuple
+        of ``torch.nn.Module`` subclasses that are quantized.
+        Default is (torch.nn.LSTM, torch.nn.Linear).
+    dtype : torch.dtype
+        data type of quantized weights. Default is torch.qint8.
+
+    Returns
+    -------
+    quantized_model : vak.Model
+        copy of model, with quantized network.
+        The network of ``model`` is not changed.
+    """
+    quantized_model = copy.copy(model)
+    # copy network before moving it to the CPU, so the network of ``model`` stays
+    # on its device, then quantize the copy in place instead of copying it again
+    quantized_model.network = torch.quantization.quantize_dynamic(
+        copy.deepcopy(model.network).to("cpu"),
+        set(layer_types),
+        dtype=dtype,
+        inplace=True,
+    )
+    quantized_model.device = "cpu"
+    # the compiled network, if any, still uses the weights that were not quantized
+    quantized_model.compile = None
+    quantized_model._compiled_network = None
+    return quantized_model
+
+
+def quantize(model, mode):
+    """get a copy of a model whose network is quantized.
+
+    Parameters
+    ----------
+    model : vak.Model
+        trained model.
+    mode : str
+        type of quantization, one of ``vak.constants.VALID_QUANTIZE_MODES``.
+
+    Returns
+    -------
+    quantized_model : vak.Model
+        copy of model, with quantized network.
+    """
+    if mode == "dynamic":
+        return quantize_dynamic(model)
+    else:
+        raise ValueError(
+            f"invalid quantize mode: {mode}. Valid modes are: {VALID_QUANTIZE_MODES}"
+        )
+
+
+def frame_agreement(model, quantized_model, pred_data, max_files=10, max_windows=None):
+    """compute the fraction of frames, i.e. time bins, where the label predicted by
+    a quantized model is the same as the label predicted by the original model.
+
+    Parameters
+    ----------
+    model : vak.Model
+        trained model, that has not been quantized.
+    quantized_model : vak.Model
+        returned by ``vak.engine.quantize.quantize``.
+    pred_data : torch.util.Dataloader
+        that yields items with a 'padding_mask', e.g. from a ``VocalDataset``
+        used to make predictions.
+    max_files : int
+        number of files from the start of ``pred_data`` used to compute agreement.
+        Default is 10.
+    max_windows : int
+        maximum number of windows fed to a network at once. Default is None.
+
+    Returns
+    -------
+    agreement : float
+        fraction of frames where labels agree, between 0. and 1.
+        NaN if ``pred_data`` has no frames, e.g. if it is empty.
+    n_files : int
+        number of files used to compute agreement.
+    """
+    models_map = {"float": model, "quantized": quantized_model}
+    n_agree, n_frames, n_files = 0, 0, 0
+    for batch, outputs in ensemble.iter_predict(
+        models_map, pred_data, device="cpu", max_windows=max_windows
+    ):
+        padding_mask = batch["padding_mask"].flatten()
+        labels = {
+            name: torch.argmax(out, dim=1).flatten()[padding_mask]
+            for name, out in outputs.items()
+        }
+        n_agree += int((labels["float"] == labels["quantized"]).sum())
+        n_frames += labels["float"].numel()
+        n_files += 1
+        if n_files >= max_files:
+            break
+    if n_frames == 0:
+        return float("nan"), n_files
+    return n_agree / n_frames, n_files
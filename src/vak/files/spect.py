@@ -1,11 +1,9 @@
 from pathlib import Path
 
 import numpy as np
-from dask import bag as db
-from dask.diagnostics import ProgressBar
-
 from .. import constants
 from ..logging import log_or_print
+from ..parallel import bag_map
 from .files import find_fname
 from ..timebins import timebin_dur_from_vec
 
@@ -120,6 +118,7 @@ def is_valid_set_of_spect_files(
     timebins_key="t",
     spect_key="s",
     n_decimals_trunc=5,
+    partition_size=None,
     logger=None,
 ):
     """validate a set of spectrogram files that will be used as a dataset.
@@ -146,6 +145,10 @@ def is_valid_set_of_spect_files(
         number of decimal places to keep when truncating the timebin duration calculated from
         the vector of time bins.
         Default is 3, i.e. assumes milliseconds is the last significant digit.
+    partition_size : int
+        number of files in each partition of the dask bag used to validate files
+        in parallel. Default is None, in which case dask divides files
+        into at most 100 partitions.
 
     Other Parameters
     ----------------
@@ -188,12 +191,15 @@ def is_valid_set_of_spect_files(
 
         return spect_path, freq_bins, timebin_dur
 
-    spect_paths_bag = db.from_sequence(spect_paths)
-
     log_or_print("validating set of spectrogram files", logger=logger, level="info")
 
-    with ProgressBar():
-        path_freqbins_timebin_dur_tups = list(spect_paths_bag.map(_validate))
+    path_freqbins_timebin_dur_tups = bag_map(
+        _validate,
+        spect_paths,
+        partition_size=partition_size,
+        desc="validated",
+        logger=logger,
+    )
 
     all_freq_bins = np.stack([tup[1] for tup in path_freqbins_timebin_dur_tups])
     uniq_freq_bins = np.unique(all_freq_bins, axis=0)
@@ -1,9 +1,10 @@
 import os
 from pathlib import Path
+import tempfile
 
 import numpy as np
-import dask.bag as db
-from dask.diagnostics import ProgressBar
+import evfuncs
+import soundfile
 
 from .. import constants
 from .. import files
@@ -11,7 +12,8 @@ from ..annotation import source_annot_map
 from ..converters import labelset_to_set
 from ..config.spect_params import SpectParamsConfig
 from ..logging import log_or_print
-from ..spect import spectrogram
+from ..parallel import bag_map
+from ..spect import spectrogram, spectrogram_bins, spectrogram_blocks
 
 
 def files_from_dir(audio_dir, audio_format):
@@ -37,6 +39,50 @@ def files_from_dir(audio_dir, audio_format):
     return audio_files
 
 
+def audio_blocks(audio_path, audio_format, block_size):
+    """get blocks of samples from an audio file, without loading the whole file.
+
+    Parameters
+    ----------
+    audio_path : str, Path
+        path to audio file.
+    audio_format : str
+        valid audio file format. One of {'wav', 'cbin'}.
+    block_size : int
+        number of samples in each block.
+
+    Returns
+    -------
+    blocks : generator
+        that yields blocks of samples, as one-dimensional numpy.ndarray,
+        with the same type as returned when the whole file is loaded.
+    n_samples : int
+        number of samples in audio file.
+    samp_freq : int
+        sampling frequency in Hz.
+    """
+    if audio_format == "wav":
+        info = soundfile.info(audio_path)
+        blocks = soundfile.blocks(audio_path, blocksize=block_size)
+        return blocks, info.frames, info.samplerate
+    elif audio_format == "cbin":
+        # same as ``evfuncs.load_cbin``, but samples stay on disk until read,
+        # .cbin files are big endian, 16 bit signed int, with channels interleaved
+        audio_path = Path(audio_path)
+        rec_dict = evfuncs.readrecf(
+            audio_path.parent.joinpath(audio_path.stem + ".rec")
+        )
+        data = np.memmap(audio_path, dtype=">i2", mode="r")
+        data = data[:: rec_dict["num_channels"]]  # channel 0
+        blocks = (
+            np.array(data[start : start + block_size])
+            for start in range(0, data.shape[0], block_size)
+        )
+        return blocks, data.shape[0], rec_dict["sample_freq"]
+    else:
+        raise ValueError(f"'{audio_format}' is not a valid audio format")
+
+
 def to_spect(
     audio_format,
     spect_params,
@@ -46,6 +92,8 @@ def to_spect(
     annot_list=None,
     audio_annot_map=None,
     labelset=None,
+    partition_size=None,
+    spect_cache=None,
     logger=None,
 ):
     """makes spectrograms from audio files and saves in array files
@@ -79,6 +127,15 @@ def to_spect(
         If not None, skip files where the associated annotations contain labels not in ``labelset``.
         ``labelset`` is converted to a Python ``set`` using ``vak.converters.labelset_to_set``.
         See help for that function for details on how to specify labelset.
+    partition_size : int
+        number of files in each partition of the dask bag used to make spectrograms
+        in parallel. Default is None, in which case dask divides files
+        into at most 100 partitions.
+    spect_cache : vak.io.spect_cache.SpectFileCache
+        cache of spectrogram files. Spectrograms that are in the cache
+        are linked or copied to ``output_dir`` instead of being made again,
+        and new spectrograms are added to the cache.
+        Default is None, in which case all spectrograms are made.
 
     Other Parameters
     ----------------
@@ -207,7 +264,30 @@ def to_spect(
     def _spect_file(audio_file):
         """helper function that enables parallelized creation of array
         files containing spectrograms.
-        Accepts path to audio file, saves .npz file with spectrogram"""
+        Accepts path to audio file, saves .npz file with spectrogram,
+        or gets it from ``spect_cache``.
+        Returns path to .npz file, and whether it was found in the cache"""
+        basename = os.path.basename(audio_file)
+        npz_fname = os.path.join(os.path.normpath(output_dir), basename + ".spect.npz")
+        if spect_cache is not None:
+            key = spect_cache.key(audio_file, spect_params)
+            if spect_cache.get(key, npz_fname):
+                return npz_fname, True
+            if os.path.exists(npz_fname):
+                # could be a link to a cached file, that saving would overwrite
+                os.remove(npz_fname)
+
+        if spect_params.block_size:
+            _spect_file_blocks(audio_file, npz_fname)
+        else:
+            _spect_file_whole(audio_file, npz_fname)
+
+        if spect_cache is not None:
+            spect_cache.put(key, npz_fname)
+        return npz_fname, False
+
+    def _spect_file_whole(audio_file, npz_fname):
+        """helper function that makes spectrogram from an entire audio file"""
         dat, fs = constants.AUDIO_FORMAT_FUNC_MAP[audio_format](audio_file)
         s, f, t = spectrogram(
             dat,
@@ -217,6 +297,7 @@ def to_spect(
             spect_params.thresh,
             spect_params.transform_type,
             spect_params.freq_cutoffs,
+            spect_params.dtype,
         )
         spect_dict = {
             spect_params.spect_key: s,
@@ -224,14 +305,72 @@ def to_spect(
             spect_params.timebins_key: t,
             spect_params.audio_path_key: audio_file,
         }
-        basename = os.path.basename(audio_file)
-        npz_fname = os.path.join(os.path.normpath(output_dir), basename + ".spect.npz")
         np.savez(npz_fname, **spect_dict)
-        return npz_fname
 
-    bag = db.from_sequence(audio_files)
-    with ProgressBar():
-        spect_files = list(bag.map(_spect_file))
+    def _spect_file_blocks(audio_file, npz_fname):
+        """helper function that makes spectrogram from blocks of audio.
+        Columns of the spectrogram are written to a temporary .npy file
+        as they are computed, and then copied into the .npz file in chunks,
+        so neither the audio nor the spectrogram is ever all in memory"""
+        blocks, n_samples, fs = audio_blocks(
+            audio_file, audio_format, spect_params.block_size
+        )
+        f, t = spectrogram_bins(
+            n_samples,
+            fs,
+            spect_params.fft_size,
+            spect_params.step_size,
+            spect_params.freq_cutoffs,
+        )
+        fd, tmp_path = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(npz_fname))
+        os.close(fd)
+        s = None
+        try:
+            s = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=spect_params.dtype, shape=(len(f), len(t))
+            )
+            s, f, t = spectrogram_blocks(
+                blocks,
+                n_samples,
+                fs,
+                spect_params.fft_size,
+                spect_params.step_size,
+                spect_params.thresh,
+                spect_params.transform_type,
+                spect_params.freq_cutoffs,
+                spect_params.dtype,
+                out=s,
+            )
+            np.savez(
+                npz_fname,
+                **{
+                    spect_params.spect_key: s,
+                    spect_params.freqbins_key: f,
+                    spect_params.timebins_key: t,
+                    spect_params.audio_path_key: audio_file,
+                },
+            )
+        finally:
+            # close memory map before removing file it maps
+            del s
+            os.remove(tmp_path)
+
+    results = bag_map(
+        _spect_file,
+        audio_files,
+        partition_size=partition_size,
+        desc="made spectrograms from",
+        logger=logger,
+    )
+    if spect_cache is not None:
+        n_cached = sum(from_cache for _, from_cache in results)
+        log_or_print(
+            f"found {n_cached} of {len(results)} spectrograms "
+            f"in cache: {spect_cache.cache_dir}",
+            logger=logger,
+            level="info",
+        )
+        spect_cache.evict(logger=logger)
     # sort because ordering from Dask not guaranteed
-    spect_files = sorted(spect_files)
+    spect_files = sorted(spect_file for spect_file, _ in results)
     return spect_files
@@ -1,7 +1,11 @@
 from datetime import datetime
+from glob import glob
+import os
+from pathlib import Path
 
 from crowsetta import Transcriber
 import numpy as np
+import pandas as pd
 
 from . import audio, spect
 from .. import annotation
@@ -18,6 +22,9 @@ def from_files(
     spect_format=None,
     spect_params=None,
     spect_output_dir=None,
+    partition_size=None,
+    spect_cache=None,
+    exclude_files=None,
     logger=None,
 ):
     """create a pandas DataFrame representing a dataset for machine learning
@@ -67,6 +74,20 @@ def from_files(
         Default is None, in which case it defaults to ``data_dir``.
         A new directory will be created in ``spect_output_dir`` with
         the name 'spectrograms_generated_{time stamp}'.
+    partition_size : int
+        number of files in each partition of the dask bags used to make
+        spectrograms, validate files, and make records in parallel.
+        Default is None, in which case dask divides files
+        into at most 100 partitions.
+    spect_cache : vak.io.spect_cache.SpectFileCache
+        cache of spectrogram files, used when making spectrograms from audio files.
+        Default is None, in which case all spectrograms are made.
+    exclude_files : set
+        of str, absolute paths to audio files (if ``audio_format`` is specified)
+        or spectrogram files (if ``spect_format`` is specified) in ``data_dir``
+        that should not be added to the dataset, e.g. because they are
+        already in a dataset that is being appended to.
+        Default is None, in which case all files are used.
 
     Other Parameters
     ----------------
@@ -124,6 +145,10 @@ def from_files(
             level="info",
         )
         audio_files = audio.files_from_dir(data_dir, audio_format)
+        if exclude_files:
+            audio_files = _exclude(audio_files, exclude_files, logger)
+            if not audio_files:
+                return pd.DataFrame(columns=spect.DF_COLUMNS)
 
         timenow = datetime.now().strftime("%y%m%d_%H%M%S")
         spect_dirname = f"spectrograms_generated_{timenow}"
@@ -137,6 +162,9 @@ def from_files(
             audio_files=audio_files,
             annot_list=annot_list,
             labelset=labelset,
+            partition_size=partition_size,
+            spect_cache=spect_cache,
+            logger=logger,
         )
         spect_format = "npz"
     else:  # if audio format is None
@@ -147,6 +175,7 @@ def from_files(
         "labelset": labelset,
         "annot_list": annot_list,
         "annot_format": annot_format,
+        "partition_size": partition_size,
     }
 
     if spect_files:  # because we just made them, and put them in spect_output_dir
@@ -156,6 +185,19 @@ def from_files(
             logger=logger,
             level="info",
         )
+    elif exclude_files:
+        # get files from data_dir here, instead of in ``spect.to_dataframe``,
+        # so excluded files can be removed
+        spect_files = glob(os.path.join(data_dir, f"*{spect_format}"))
+        spect_files = _exclude(spect_files, exclude_files, logger)
+        if not spect_files:
+            return pd.DataFrame(columns=spect.DF_COLUMNS)
+        to_dataframe_kwargs["spect_files"] = spect_files
+        log_or_print(
+            f"creating dataset from spectrogram files in: {data_dir}",
+            logger=logger,
+            level="info",
+        )
     else:
         to_dataframe_kwargs["spect_dir"] = data_dir
         log_or_print(
@@ -168,6 +210,22 @@ def from_files(
     return vak_df
 
 
+def _exclude(files, exclude_files, logger=None):
+    """remove files whose absolute paths are in ``exclude_files``"""
+    exclude_files = set(str(Path(a_file).absolute()) for a_file in exclude_files)
+    n_files = len(files)
+    files = [
+        a_file for a_file in files if str(Path(a_file).absolute()) not in exclude_files
+    ]
+    log_or_print(
+        f"found {len(files)} files in data_dir that are not already in dataset, "
+        f"excluded {n_files - len(files)} files",
+        logger=logger,
+        level="info",
+    )
+    return files
+
+
 def add_split_col(df, split):
     """add a 'split' column to a pandas DataFrame.
     Useful for assigning an entire dataset to the same "split",
@@ -225,6 +283,57 @@ def validate_and_get_timebin_dur(df, expected_timebin_dur=None):
     return timebin_dur
 
 
+def has_spect_metadata(df):
+    """check whether a DataFrame that represents a dataset has columns
+    with the shape and data type of each spectrogram, and its time bins:
+    'n_timebins', 'n_freqbins', 'dtype', 't0', and 't_step'.
+
+    These columns are added by ``vak.io.spect.to_dataframe``,
+    so that datasets can be built without opening every spectrogram file.
+    Datasets prepared with earlier versions of vak do not have them,
+    in which case files must be loaded to get the shape of spectrograms.
+
+    Parameters
+    ----------
+    df : pandas.Dataframe
+        created by dataframe.from_files or spect.to_dataframe
+
+    Returns
+    -------
+    has_spect_metadata : bool
+    """
+    return all([col in df.columns for col in spect.SPECT_METADATA_COLUMNS])
+
+
+def timebins_from_metadata(df):
+    """get vector of time bins for each spectrogram in a dataset,
+    from the 't0', 't_step', and 'n_timebins' columns of a DataFrame,
+    without opening spectrogram files.
+
+    Parameters
+    ----------
+    df : pandas.Dataframe
+        created by dataframe.from_files or spect.to_dataframe,
+        for which ``has_spect_metadata`` is True.
+
+    Returns
+    -------
+    timebins : list
+        of numpy.ndarray, vector of time bins for each row in ``df``.
+    """
+    if not has_spect_metadata(df):
+        raise ValueError(
+            "dataframe does not have columns with metadata about spectrograms: "
+            f"{spect.SPECT_METADATA_COLUMNS}"
+        )
+    return [
+        t0 + np.arange(n_timebins) * t_step
+        for t0, t_step, n_timebins in zip(
+            df["t0"].values, df["t_step"].values, df["n_timebins"].values
+        )
+    ]
+
+
 def split_dur(df, split):
     """get duration of a split in the dataset"""
     return df[df["split"] == split]["duration"].sum()
@@ -7,8 +7,6 @@ from glob import glob
 import os
 from pathlib import Path
 
-import dask.bag as db
-from dask.diagnostics import ProgressBar
 import numpy as np
 import pandas as pd
 
@@ -17,6 +15,7 @@ from .. import files
 from ..annotation import source_annot_map
 from ..converters import labelset_to_set
 from ..logging import log_or_print
+from ..parallel import bag_map
 
 
 # constant, used for names of columns in DataFrame below
@@ -27,7 +26,15 @@ DF_COLUMNS = [
     "annot_format",
     "duration",
     "timebin_dur",
+    "n_timebins",
+    "n_freqbins",
+    "dtype",
+    "t0",
+    "t_step",
 ]
+# columns with metadata about each spectrogram, so that datasets can be built
+# without opening spectrogram files, see vak.io.dataframe.has_spect_metadata
+SPECT_METADATA_COLUMNS = ["n_timebins", "n_freqbins", "dtype", "t0", "t_step"]
 
 
 def to_dataframe(
@@ -43,6 +50,7 @@ def to_dataframe(
     timebins_key="t",
     spect_key="s",
     audio_path_key="audio_path",
+    partition_size=None,
     logger=None,
 ):
     """convert spectrogram files into a dataset of vocalizations represented as a Pandas DataFrame.
@@ -87,6 +95,10 @@ def to_dataframe(
     audio_path_key : str
         key for accessing path to source audio file for spectogram in files.
         Default is 'audio_path'.
+    partition_size : int
+        number of files in each partition of the dask bags used to validate files
+        and make records in parallel. Default is None, in which case dask divides files
+        into at most 100 partitions.
 
     Other Parameters
     ----------------
@@ -203,6 +215,7 @@ def to_dataframe(
         timebins_key,
         spect_key,
         n_decimals_trunc,
+        partition_size=partition_size,
         logger=logger,
     )
 
@@ -222,8 +235,20 @@ def to_dataframe(
         and (2) annotation for that file"""
         spect_path, annot = spect_annot_tuple
         spect_dict = files.spect.load(spect_path, spect_format)
-
-        spect_dur = spect_dict[spect_key].shape[-1] * timebin_dur
+        spect = spect_dict[spect_key]
+
+        # save shape and dtype so that datasets can be built without opening files again
+        n_freqbins, n_timebins = spect.shape
+        # and save first time bin and exact step between time bins,
+        # so time bins can be computed without opening files.
+        # Can't use timebin_dur, that is truncated
+        timebins = np.ravel(spect_dict[timebins_key])
+        t0 = float(timebins[0])
+        if n_timebins > 1:
+            t_step = float((timebins[-1] - timebins[0]) / (n_timebins - 1))
+        else:
+            t_step = float(timebin_dur)
+        spect_dur = n_timebins * timebin_dur
         if audio_path_key in spect_dict:
             audio_path = spect_dict[audio_path_key]
             if type(audio_path) == np.ndarray:
@@ -254,17 +279,26 @@ def to_dataframe(
                 annot_format if annot_format else constants.NO_ANNOTATION_FORMAT,
                 spect_dur,
                 timebin_dur,
+                n_timebins,
+                n_freqbins,
+                str(spect.dtype),
+                t0,
+                t_step,
             ]
         )
         return record
 
-    spect_path_annot_tuples = db.from_sequence(spect_annot_map.items())
     log_or_print(
         "creating pandas.DataFrame representing dataset from spectrogram files",
         logger=logger,
         level="info",
     )
-    with ProgressBar():
-        records = list(spect_path_annot_tuples.map(_to_record))
+    records = bag_map(
+        _to_record,
+        list(spect_annot_map.items()),
+        partition_size=partition_size,
+        desc="made records for",
+        logger=logger,
+    )
 
     return pd.DataFrame.from_records(data=records, columns=DF_COLUMNS)
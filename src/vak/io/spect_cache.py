@@ -0,0 +1,212 @@
+"""cache of spectrogram files made from audio files,
+so that ``vak prep`` does not make the same spectrograms again
+when it is run on the same audio files with the same parameters"""
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+import attr
+
+from ..__about__ import __version__
+from ..logging import log_or_print
+
+
+SPECT_CACHE_SUFFIX = ".spect.npz"
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class SpectFileCache:
+    """directory of spectrogram files made from audio files,
+    where the name of each file is a hash of the audio file,
+    the parameters used to make the spectrogram, and the version of vak.
+
+    Files are hard-linked into and out of the cache when possible,
+    so that a cached spectrogram does not take up space twice.
+    When a hard link can't be made, e.g. because the cache is on another
+    file system, the file is copied instead.
+
+    The key of each audio file includes its absolute path, because the path is saved
+    in the spectrogram file. Changes to an audio file are detected from
+    its size and modification time, or from a hash of its contents
+    if ``hash_audio`` is True.
+
+    Files that have not been used for ``max_age_days``, and then the
+    least recently used files until the cache is smaller than ``max_bytes``,
+    are removed by ``evict``.
+
+    Attributes
+    ----------
+    cache_dir : pathlib.Path
+        directory where spectrogram files are cached.
+    max_bytes : int
+        maximum size of all files in cache, in bytes. Default is None,
+        in which case files are not removed because of the size of the cache.
+    max_age_days : float
+        number of days since a file was last used after which it is removed.
+        Default is None, in which case files are not removed because of their age.
+    hash_audio : bool
+        if True, use a hash of the contents of an audio file in its key,
+        instead of its size and modification time. Slower, but detects
+        changes that keep the same size and modification time,
+        e.g. when files are copied without preserving their modification time.
+        Default is False.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None, max_age_days=None, hash_audio=False):
+        cache_dir = Path(cache_dir)
+        if not cache_dir.is_dir():
+            raise NotADirectoryError(f"spect_cache_dir not found: {cache_dir}")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(
+                f"max_bytes must be a non-negative integer but was: {max_bytes}"
+            )
+        if max_age_days is not None and max_age_days < 0:
+            raise ValueError(
+                f"max_age_days must be a non-negative number but was: {max_age_days}"
+            )
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hash_audio = hash_audio
+
+    def key(self, audio_path, spect_params):
+        """get key of the spectrogram file made from an audio file
+
+        Parameters
+        ----------
+        audio_path : str, Path
+            path to audio file.
+        spect_params : vak.config.SpectParamsConfig
+            parameters used to make spectrogram.
+
+        Returns
+        -------
+        key : str
+            hex digest of a SHA-256 hash
+        """
+        audio_path = Path(audio_path)
+        if self.hash_audio:
+            audio_hash = hashlib.sha256()
+            with audio_path.open("rb") as fp:
+                for chunk in iter(lambda: fp.read(2**20), b""):
+                    audio_hash.update(chunk)
+            audio_id = audio_hash.hexdigest()
+        else:
+            stat = audio_path.stat()
+            audio_id = [stat.st_size, stat.st_mtime_ns]
+
+        key_dict = {
+            "vak_version": __version__,
+            "audio_path": str(audio_path.absolute()),
+            "audio": audio_id,
+            "spect_params": attr.asdict(spect_params),
+        }
+        key_json = json.dumps(key_dict, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode()).hexdigest()
+
+    def path(self, key):
+        """path to cached file with ``key``"""
+        return self.cache_dir.joinpath(key + SPECT_CACHE_SUFFIX)
+
+    def get(self, key, dst):
+        """link or copy cached file with ``key`` to ``dst``, if it is in the cache
+
+        Parameters
+        ----------
+        key : str
+            returned by ``SpectFileCache.key``.
+        dst : str, Path
+            path where spectrogram file should be.
+            An existing file at this path is replaced.
+
+        Returns
+        -------
+        found : bool
+            if True, file was found in cache and linked or copied to ``dst``.
+        """
+        cached_path = self.path(key)
+        try:
+            # mark as used, so that file is evicted last
+            os.utime(cached_path)
+        except FileNotFoundError:
+            return False
+        _link_or_copy(cached_path, dst)
+        return True
+
+    def put(self, key, src):
+        """add a spectrogram file to the cache, by linking or copying it
+
+        Parameters
+        ----------
+        key : str
+            returned by ``SpectFileCache.key``.
+        src : str, Path
+            path to spectrogram file.
+        """
+        _link_or_copy(src, self.path(key))
+
+    def evict(self, logger=None):
+        """remove files that have not been used for ``max_age_days``,
+        then remove least recently used files until the cache
+        is smaller than ``max_bytes``.
+
+        Other Parameters
+        ----------------
+        logger : logging.Logger
+            instance created by vak.logging.get_logger. Default is None.
+
+        Returns
+        -------
+        n_removed : int
+            number of files removed from cache.
+        """
+        entries = []
+        for cached_path in self.cache_dir.glob("*" + SPECT_CACHE_SUFFIX):
+            stat = cached_path.stat()
+            entries.append((stat.st_mtime, stat.st_size, cached_path))
+        entries.sort()  # least recently used first
+
+        to_remove = []
+        if self.max_age_days is not None:
+            oldest = time.time() - self.max_age_days * SECONDS_PER_DAY
+            while entries and entries[0][0] < oldest:
+                to_remove.append(entries.pop(0))
+        if self.max_bytes is not None:
+            nbytes = sum(size for _, size, _ in entries)
+            while entries and nbytes > self.max_bytes:
+                entry = entries.pop(0)
+                nbytes -= entry[1]
+                to_remove.append(entry)
+
+        for _, _, cached_path in to_remove:
+            # unlinking only removes the cache's link, files in datasets are kept
+            cached_path.unlink()
+        if to_remove:
+            log_or_print(
+                f"removed {len(to_remove)} files "
+                f"from spectrogram cache: {self.cache_dir}",
+                logger=logger,
+                level="info",
+            )
+        return len(to_remove)
+
+
+def _link_or_copy(src, dst):
+    """hard link ``src`` to ``dst``, or copy it if a link can't be made.
+    Replaces ``dst`` atomically, so concurrent readers never see part of a file,
+    and an existing link at ``dst`` is replaced instead of being written through"""
+    dst = Path(dst)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=dst.parent)
+    os.close(fd)
+    os.remove(tmp_path)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        # e.g. different file systems, or file system without hard links
+        shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
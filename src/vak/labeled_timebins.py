@@ -6,6 +6,48 @@ from .timebins import timebin_dur_from_vec
 from .validators import row_or_1d, column_or_1d
 
 
+def _nearest_timebin_inds(time_bins, times_s):
+    """find index of time bin whose center is nearest to each time
+
+    Gives the same result as ``np.argmin(np.abs(time_bins - time))``
+    for each time, including returning the lower index when a time
+    is equally close to two bins, but uses ``np.searchsorted``
+    so that it is fast for many times and time bins.
+    If time bins are not strictly increasing, falls back to ``np.argmin``.
+
+    Parameters
+    ----------
+    time_bins : numpy.ndarray
+        1-d vector of floats, time in seconds for center of each time bin of a spectrogram
+    times_s : numpy.ndarray
+        1-d vector of floats, e.g. segment onsets in seconds
+
+    Returns
+    -------
+    inds : numpy.ndarray
+        of int, index of time bin nearest to each time
+    """
+    time_bins = np.ravel(time_bins)
+    times_s = np.ravel(times_s)
+    if times_s.shape[-1] == 0:
+        return np.zeros((0,), dtype=np.intp)
+
+    if time_bins.shape[-1] < 2 or not np.all(np.diff(time_bins) > 0):
+        return np.array(
+            [np.argmin(np.abs(time_bins - time_s)) for time_s in times_s],
+            dtype=np.intp,
+        )
+
+    # nearest bin is either the first bin >= time, or the one before it
+    upper = np.clip(
+        np.searchsorted(time_bins, times_s, side="left"), 1, time_bins.shape[-1] - 1
+    )
+    lower = upper - 1
+    # use <= so that ties go to lower index, like argmin
+    use_lower = np.abs(time_bins[lower] - times_s) <= np.abs(time_bins[upper] - times_s)
+    return np.where(use_lower, lower, upper)
+
+
 def has_unlabeled(labels_int, onsets_s, offsets_s, time_bins):
     """determine whether there are unlabeled segments in a spectrogram,
     given labels, onsets, and offsets of vocalizations, and vector of
@@ -38,15 +80,20 @@ def has_unlabeled(labels_int, onsets_s, offsets_s, time_bins):
     ):
         raise TypeError("labels_int must be a list or numpy.ndarray of integers")
 
-    dummy_unlabeled_label = np.max(labels_int) + 1
-    label_vec = np.ones((time_bins.shape[-1], 1), dtype="int8") * dummy_unlabeled_label
-    onset_inds = [np.argmin(np.abs(time_bins - onset)) for onset in onsets_s]
-    offset_inds = [np.argmin(np.abs(time_bins - offset)) for offset in offsets_s]
-    for label, onset, offset in zip(labels_int, onset_inds, offset_inds):
-        # offset_inds[ind]+1 because offset time bin is still "part of" syllable
-        label_vec[onset : offset + 1] = label
+    n_segments = min(len(labels_int), len(onsets_s), len(offsets_s))
+    onset_inds = _nearest_timebin_inds(time_bins, onsets_s[:n_segments])
+    offset_inds = _nearest_timebin_inds(time_bins, offsets_s[:n_segments])
+
+    # count how many segments cover each time bin, using a difference array.
+    # offset_inds+1 because offset time bin is still "part of" syllable.
+    # Segments with offset before onset don't cover any time bins
+    not_empty = offset_inds >= onset_inds
+    n_covering = np.zeros((time_bins.shape[-1] + 1,), dtype=np.int64)
+    np.add.at(n_covering, onset_inds[not_empty], 1)
+    np.add.at(n_covering, offset_inds[not_empty] + 1, -1)
+    n_covering = np.cumsum(n_covering[:-1])
 
-    if dummy_unlabeled_label in label_vec:
+    if np.any(n_covering == 0):
         return True
     else:
         return False
@@ -87,11 +134,30 @@ def label_timebins(labels_int, onsets_s, offsets_s, time_bins, unlabeled_label=0
         raise TypeError("labels_int must be a list or numpy.ndarray of integers")
 
     label_vec = np.ones((time_bins.shape[-1],), dtype="int8") * unlabeled_label
-    onset_inds = [np.argmin(np.abs(time_bins - onset)) for onset in onsets_s]
-    offset_inds = [np.argmin(np.abs(time_bins - offset)) for offset in offsets_s]
-    for label, onset, offset in zip(labels_int, onset_inds, offset_inds):
-        # offset_inds[ind]+1 because offset time bin is still "part of" syllable
-        label_vec[onset : offset + 1] = label
+    n_segments = min(len(labels_int), len(onsets_s), len(offsets_s))
+    labels_int = np.asarray(labels_int[:n_segments], dtype=np.int64)
+    onset_inds = _nearest_timebin_inds(time_bins, onsets_s[:n_segments])
+    offset_inds = _nearest_timebin_inds(time_bins, offsets_s[:n_segments])
+
+    if np.all(np.diff(onset_inds) >= 0) and np.all(np.diff(offset_inds) >= 0):
+        # when segments are in order, the last segment with an onset at or before
+        # a time bin is the one that labels it -- if any segment includes that bin.
+        # This gives the same result as assigning segments in a loop,
+        # where later segments overwrite earlier ones that overlap them
+        last_segment = np.full((time_bins.shape[-1],), -1, dtype=np.int64)
+        np.maximum.at(last_segment, onset_inds, np.arange(n_segments))
+        last_segment = np.maximum.accumulate(last_segment)
+        timebin_inds = np.arange(time_bins.shape[-1])
+        has_segment = last_segment > -1
+        # offset_inds+1 because offset time bin is still "part of" syllable
+        has_segment[has_segment] = (
+            offset_inds[last_segment[has_segment]] >= timebin_inds[has_segment]
+        )
+        label_vec[has_segment] = labels_int[last_segment[has_segment]]
+    else:
+        for label, onset, offset in zip(labels_int, onset_inds, offset_inds):
+            # offset_inds[ind]+1 because offset time bin is still "part of" syllable
+            label_vec[onset : offset + 1] = label
 
     return label_vec
 
@@ -1,4 +1,4 @@
-from .models import find, from_model_config_map
+from .models import find, from_checkpoints, from_model_config_map
 from . import teenytweetynet
 
-__all__ = ["find", "from_model_config_map", "teenytweetynet"]
+__all__ = ["find", "from_checkpoints", "from_model_config_map", "teenytweetynet"]
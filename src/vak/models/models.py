@@ -19,6 +19,7 @@ https://setuptools.readthedocs.io/en/latest/setuptools.html#dynamic-discovery-of
 https://amir.rachum.com/blog/2017/07/28/python-entry-points/
 """
 from .. import entry_points
+from ..logging import log_or_print
 
 MODELS_ENTRY_POINT = "vak.models"
 
@@ -73,3 +74,63 @@ def from_model_config_map(model_config_map, num_classes, input_shape, logger=Non
             )
         models_map[model_name] = model
     return models_map
+
+
+def from_checkpoints(
+    model_config_map,
+    checkpoint_paths,
+    num_classes,
+    input_shape,
+    device=None,
+    logger=None,
+):
+    """get models with networks loaded from one or more checkpoints,
+    e.g. to evaluate them or make predictions with them in a single pass through a dataset.
+
+    Parameters
+    ----------
+    model_config_map : dict
+        where each key-value pair is model name : dict of config parameters
+    checkpoint_paths : str, pathlib.Path, list
+        path to a checkpoint file saved by Torch, or a list of paths.
+        Each model in ``model_config_map`` is loaded from every checkpoint.
+    num_classes : int
+        number of classes model will be trained to classify
+    input_shape : tuple, list
+        e.g. (channels, height, width).
+        Batch size is not required for input shape.
+    device : str
+        device on which to load checkpoints. Default is None.
+    logger : logging.Logger
+        instance created by vak.logging.get_logger. Default is None.
+
+    Returns
+    -------
+    models_map : dict
+        where keys are names and values are instances of the models.
+        If there is only one checkpoint, the names are the model names.
+        Otherwise the index of the checkpoint is appended to the model name,
+        e.g. 'TweetyNet_ckpt0'.
+    checkpoint_path_map : dict
+        that maps the same names to the path of the checkpoint
+        that each model was loaded from.
+    """
+    if not isinstance(checkpoint_paths, (list, tuple)):
+        checkpoint_paths = [checkpoint_paths]
+
+    models_map, checkpoint_path_map = {}, {}
+    for ckpt_ind, checkpoint_path in enumerate(checkpoint_paths):
+        for model_name, model in from_model_config_map(
+            model_config_map, num_classes, input_shape, logger=logger
+        ).items():
+            if len(checkpoint_paths) > 1:
+                model_name = f"{model_name}_ckpt{ckpt_ind}"
+            log_or_print(
+                f"loading checkpoint for {model_name} from path: {checkpoint_path}",
+                logger=logger,
+                level="info",
+            )
+            model.load(checkpoint_path, device=device)
+            models_map[model_name] = model
+            checkpoint_path_map[model_name] = checkpoint_path
+    return models_map, checkpoint_path_map
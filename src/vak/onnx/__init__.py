@@ -0,0 +1,9 @@
+from . import export
+from . import runtime
+from .runtime import OnnxPredictor
+
+__all__ = [
+    "export",
+    "OnnxPredictor",
+    "runtime",
+]
@@ -0,0 +1,157 @@
+"""export trained networks to ONNX graphs,
+that can be used to make predictions with onnxruntime, see ``vak.onnx.runtime``.
+
+The exported graph is self-contained: it takes a spectrogram as input,
+standardizes it with a fit ``StandardizeSpect`` if there is one,
+pads it and reshapes it into windows, feeds the windows to the network,
+and returns the network outputs for each time bin in the spectrogram.
+The labelmap and window size are saved in the metadata of the graph.
+"""
+import inspect
+import io
+import json
+
+import numpy as np
+import torch
+from torch import nn
+
+from .runtime import (
+    INPUT_NAME,
+    LABELMAP_KEY,
+    OUTPUT_NAME,
+    VERSION_KEY,
+    WINDOW_SIZE_KEY,
+)
+from ..__about__ import __version__
+
+
+class SpectToLogits(nn.Module):
+    """module that wraps a trained network,
+    so that it maps a spectrogram to the network outputs
+    for each of its time bins.
+
+    Applies the same transforms as ``vak.transforms.defaults.PredictItemTransform``,
+    then converts the output of the network back into a single array,
+    as is done in ``vak.core.predict``.
+
+    Parameters
+    ----------
+    network : torch.nn.Module
+        trained network, e.g. the ``network`` attribute of a ``vak.Model``.
+    window_size : int
+        size of windows taken from spectrograms, in number of time bins.
+    spect_standardizer : vak.transforms.StandardizeSpect
+        instance that has already been fit to dataset.
+        Default is None, in which case spectrograms are not standardized.
+    """
+
+    def __init__(self, network, window_size, spect_standardizer=None):
+        super().__init__()
+        self.network = network
+        self.window_size = window_size
+        if spect_standardizer is not None:
+            # standardize in double precision,
+            # like StandardizeSpect does with numpy arrays
+            mean_freqs = torch.from_numpy(
+                np.asarray(spect_standardizer.mean_freqs, dtype=np.float64)
+            )
+            # divide frequency bins whose standard deviation is zero by 1, instead,
+            # like ``vak.transforms.functional.standardize_spect``
+            std_freqs = np.asarray(spect_standardizer.std_freqs, dtype=np.float64)
+            divisor = np.ones_like(std_freqs)
+            non_zero_std = spect_standardizer.non_zero_std
+            divisor[non_zero_std] = std_freqs[non_zero_std]
+            self.register_buffer("mean_freqs", mean_freqs[:, None])
+            self.register_buffer("std_freqs", torch.from_numpy(divisor)[:, None])
+        else:
+            self.mean_freqs = None
+            self.std_freqs = None
+
+    def forward(self, spect):
+        """map spectrogram with dimensions (frequency bins, time bins)
+        to output of network with dimensions (classes, time bins)"""
+        if self.mean_freqs is not None:
+            spect = (spect - self.mean_freqs) / self.std_freqs
+        spect = spect.float()
+
+        n_freqbins, n_timebins = spect.shape[0], spect.shape[1]
+        n_windows = (n_timebins + self.window_size - 1) // self.window_size
+        n_padding = n_windows * self.window_size - n_timebins
+        padded = nn.functional.pad(spect, (0, n_padding))
+        # reshape into windows, with dims (windows, channel, freq. bins, time bins)
+        windows = padded.reshape(n_freqbins, n_windows, self.window_size)
+        windows = windows.permute(1, 0, 2).unsqueeze(1)
+
+        out = self.network(windows)
+        # stack outputs for windows, then crop off padding
+        out = out.permute(1, 0, 2).reshape(out.shape[1], -1)
+        return out[:, :n_timebins]
+
+
+def export(
+    network, onnx_path, labelmap, window_size, n_freqbins, spect_standardizer=None
+):
+    """export a trained network to an ONNX graph
+    that maps a spectrogram to the network outputs for each time bin.
+
+    Requires the ``onnx`` package, to save metadata in the graph.
+
+    Parameters
+    ----------
+    network : torch.nn.Module
+        trained network, e.g. the ``network`` attribute of a ``vak.Model``.
+    onnx_path : str, pathlib.Path
+        path where graph should be saved, e.g. 'TweetyNet.onnx'.
+    labelmap : dict
+        that maps labels to the consecutive integers output by the network.
+    window_size : int
+        size of windows taken from spectrograms, in number of time bins,
+        shown to the network.
+    n_freqbins : int
+        number of frequency bins in spectrograms.
+    spect_standardizer : vak.transforms.StandardizeSpect
+        instance that has already been fit to dataset.
+        Default is None, in which case spectrograms are not standardized.
+    """
+    try:
+        import onnx
+    except ImportError as e:
+        raise ImportError(
+            "the onnx package is required to export networks to ONNX graphs, "
+            "install it with `pip install onnx`"
+        ) from e
+
+    module = SpectToLogits(network, window_size, spect_standardizer)
+    module.to("cpu")
+    module.eval()
+
+    # use a number of time bins that is not a multiple of the window size,
+    # so that padding is traced
+    dummy_spect = torch.zeros(n_freqbins, window_size + 1, dtype=torch.float64)
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # the TorchScript-based exporter does not require any other packages
+        kwargs["dynamo"] = False
+    f = io.BytesIO()
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            (dummy_spect,),
+            f,
+            input_names=[INPUT_NAME],
+            output_names=[OUTPUT_NAME],
+            dynamic_axes={
+                INPUT_NAME: {1: "n_timebins"},
+                OUTPUT_NAME: {1: "n_timebins"},
+            },
+            **kwargs,
+        )
+
+    model_proto = onnx.load_model_from_string(f.getvalue())
+    metadata = {
+        LABELMAP_KEY: json.dumps(labelmap),
+        WINDOW_SIZE_KEY: str(window_size),
+        VERSION_KEY: __version__,
+    }
+    onnx.helper.set_model_props(model_proto, metadata)
+    onnx.save(model_proto, str(onnx_path))
@@ -0,0 +1,86 @@
+"""make predictions with ONNX graphs exported by ``vak.onnx.export``,
+using onnxruntime on the CPU.
+Only numpy and onnxruntime are used to run the graph, not torch."""
+import json
+
+import numpy as np
+
+# keys for metadata saved in exported graphs
+LABELMAP_KEY = "vak_labelmap"
+WINDOW_SIZE_KEY = "vak_window_size"
+VERSION_KEY = "vak_version"
+
+INPUT_NAME = "spect"
+OUTPUT_NAME = "logits"
+
+
+class OnnxPredictor:
+    """runs a graph exported by ``vak.onnx.export.export`` with onnxruntime.
+
+    Requires the ``onnxruntime`` package.
+
+    Parameters
+    ----------
+    onnx_path : str, pathlib.Path
+        path to graph saved by ``vak export-onnx``.
+    providers : list
+        of onnxruntime execution providers. Default is ``['CPUExecutionProvider']``.
+
+    Attributes
+    ----------
+    labelmap : dict
+        that maps labels to the consecutive integers output by the network,
+        loaded from metadata of the graph.
+    window_size : int
+        size of windows shown to the network, loaded from metadata of the graph.
+
+    Examples
+    --------
+    >>> predictor = vak.onnx.OnnxPredictor('TweetyNet.onnx')
+    >>> spect = vak.files.spect.load('gy6or6_032312_081416.wav.spect.npz')['s']
+    >>> logits = predictor(spect)  # (classes, time bins)
+    >>> y_pred = logits.argmax(axis=0)
+    """
+
+    def __init__(self, onnx_path, providers=None):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "the onnxruntime package is required to make predictions "
+                "with ONNX graphs, install it with `pip install onnxruntime`"
+            ) from e
+
+        if providers is None:
+            providers = ["CPUExecutionProvider"]
+        self.onnx_path = onnx_path
+        self.session = onnxruntime.InferenceSession(
+            str(onnx_path), providers=providers
+        )
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if LABELMAP_KEY not in metadata:
+            raise ValueError(
+                f"no labelmap found in metadata of ONNX graph: {onnx_path}. "
+                "Graphs should be exported with `vak export-onnx`."
+            )
+        self.labelmap = json.loads(metadata[LABELMAP_KEY])
+        self.window_size = int(metadata[WINDOW_SIZE_KEY])
+
+    def __call__(self, spect):
+        """get outputs of network for a spectrogram.
+
+        Parameters
+        ----------
+        spect : numpy.ndarray
+            with dimensions (frequency bins, time bins).
+
+        Returns
+        -------
+        logits : numpy.ndarray
+            outputs of network, with dimensions (classes, time bins).
+        """
+        (logits,) = self.session.run(
+            None, {INPUT_NAME: np.asarray(spect, dtype=np.float64)}
+        )
+        return logits
@@ -0,0 +1,130 @@
+"""functions that run steps of preparing datasets in parallel with dask,
+using the scheduler, number of workers, and partition size specified in config files"""
+import contextlib
+import time
+
+import dask
+import dask.bag as db
+from dask.diagnostics import ProgressBar
+
+from .constants import VALID_DASK_SCHEDULERS
+from .logging import log_or_print
+
+
+@contextlib.contextmanager
+def dask_scheduler(scheduler=None, num_workers=None, memory_limit=None, logger=None):
+    """context manager that sets the scheduler used to compute dask bags,
+    e.g. by ``vak.parallel.bag_map``.
+
+    Parameters
+    ----------
+    scheduler : str
+        one of ``vak.constants.VALID_DASK_SCHEDULERS``.
+        'threads' runs functions in a pool of threads, which is only faster than
+        running in one process when functions release the GIL.
+        'processes' runs functions in a pool of processes.
+        'distributed' starts a local cluster of worker processes
+        with ``dask.distributed``, that must be installed;
+        the cluster limits the memory each worker can use.
+        Default is None, in which case the default scheduler
+        for dask bags is used, a pool of processes.
+    num_workers : int
+        number of threads or processes. Default is None, in which case
+        dask uses the number of CPU cores.
+    memory_limit : str, int
+        memory limit for each worker of a 'distributed' cluster,
+        in bytes or as a string, e.g. '4GB'. Ignored by other schedulers.
+        Default is None, in which case the memory of the machine
+        is divided between workers.
+
+    Other Parameters
+    ----------------
+    logger : logging.Logger
+        instance created by vak.logging.get_logger. Default is None.
+    """
+    if scheduler is not None and scheduler not in VALID_DASK_SCHEDULERS:
+        raise ValueError(
+            f"invalid scheduler: {scheduler}. "
+            f"Valid schedulers are: {VALID_DASK_SCHEDULERS}"
+        )
+
+    if scheduler == "distributed":
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as e:
+            raise ImportError(
+                "the distributed package is required to use the 'distributed' "
+                "scheduler, install it with `pip install distributed`"
+            ) from e
+
+        cluster = LocalCluster(
+            n_workers=num_workers,
+            threads_per_worker=1,
+            memory_limit=memory_limit if memory_limit is not None else "auto",
+        )
+        # client sets itself as the scheduler for dask collections while open
+        with cluster, Client(cluster) as client:
+            log_or_print(
+                f"started dask cluster with {len(cluster.workers)} workers, "
+                f"dashboard at: {client.dashboard_link}",
+                logger=logger,
+                level="info",
+            )
+            yield
+    else:
+        if memory_limit is not None:
+            log_or_print(
+                "memory_limit only applies to 'distributed' scheduler, "
+                f"ignoring for scheduler: {scheduler}",
+                logger=logger,
+                level="warning",
+            )
+        config = {"num_workers": num_workers}
+        if scheduler is not None:
+            config["scheduler"] = scheduler
+        with dask.config.set(config):
+            yield
+
+
+def bag_map(func, seq, partition_size=None, desc="processed", logger=None):
+    """apply a function to each element of a sequence in parallel, using a dask bag,
+    and log the throughput.
+
+    Computed with the current dask scheduler, set with ``vak.parallel.dask_scheduler``.
+
+    Parameters
+    ----------
+    func : callable
+        function applied to each element.
+    seq : iterable
+        of elements, e.g. paths to files.
+    partition_size : int
+        number of elements in each partition of the bag, i.e., in each task
+        sent to a worker. Default is None, in which case dask divides ``seq``
+        into at most 100 partitions.
+    desc : str
+        description of what ``func`` does, used when logging throughput.
+        Default is 'processed'.
+
+    Other Parameters
+    ----------------
+    logger : logging.Logger
+        instance created by vak.logging.get_logger. Default is None.
+
+    Returns
+    -------
+    results : list
+        returned by ``func`` for each element of ``seq``, in order.
+    """
+    bag = db.from_sequence(seq, partition_size=partition_size)
+    tic = time.perf_counter()
+    with ProgressBar():
+        results = list(bag.map(func))
+    elapsed = time.perf_counter() - tic
+    log_or_print(
+        f"{desc} {len(results)} files in {elapsed:.2f} s, "
+        f"{len(results) / elapsed:.2f} files per second",
+        logger=logger,
+        level="info",
+    )
+    return results
@@ -4,11 +4,12 @@ filters adapted from SciPy cookbook
 https://scipy-cookbook.readthedocs.io/items/ButterworthBandpass.html
 spectrogram adapted from code by Kyle Kastner and Tim Sainburg
 https://github.com/timsainb/python_spectrograms_and_inversion
+power spectral density computed as in ``matplotlib.mlab.specgram``,
+with its default arguments
 """
 import numpy as np
-
+import scipy.fft
 from scipy.signal import butter, lfilter
-from matplotlib.mlab import specgram
 
 
 def butter_bandpass(lowcut, highcut, fs, order=5):
@@ -25,6 +26,114 @@ def butter_bandpass_filter(data, lowcut, highcut, fs, order=5):
     return y
 
 
+def stft_power(dat, samp_freq, fft_size=512, step_size=64, dtype=np.float32):
+    """compute power spectral density of audio with a short-time Fourier transform.
+
+    Gives the same result as ``matplotlib.mlab.specgram`` with its default
+    arguments (Hanning window, no detrending, one-sided, scaled by frequency),
+    but computes in ``dtype``, takes the real FFT of all frames at once,
+    and can compute spectrograms for several signals of the same length in one call.
+
+    Parameters
+    ----------
+    dat : numpy.ndarray
+        audio signal, with samples in the last dimension, e.g. with shape
+        (samples,) for one signal or (signals, samples) for several signals.
+        Signals shorter than ``fft_size`` are padded with zeros.
+    samp_freq : int
+        sampling frequency in Hz
+    fft_size : int
+        size of window for Fast Fourier transform, number of time bins.
+    step_size : int
+        step size for Fast Fourier transform
+    dtype : numpy.dtype
+        floating point type used to compute the spectrogram. Default is numpy.float32.
+
+    Returns
+    -------
+    power : numpy.ndarray
+        power spectral density, with shape (..., time bins, frequency bins).
+        Note that time bins are before frequency bins.
+    freqbins : numpy.ndarray
+        vector of centers of frequency bins from spectrogram
+    timebins : numpy.ndarray
+        vector of centers of time bins from spectrogram
+    """
+    dtype = np.dtype(dtype)
+    dat = np.asarray(dat)
+    n_samples = dat.shape[-1]
+    if n_samples < fft_size:
+        pad_width = [(0, 0)] * (dat.ndim - 1) + [(0, fft_size - n_samples)]
+        dat = np.pad(dat, pad_width)
+        n_samples = fft_size
+
+    window = np.hanning(fft_size)
+    # strided view of frames, without copying
+    frames = np.lib.stride_tricks.sliding_window_view(dat, fft_size, axis=-1)[
+        ..., ::step_size, :
+    ]
+    # only copy of frames, already in dtype
+    windowed = np.multiply(frames, window.astype(dtype), dtype=dtype)
+    spect = scipy.fft.rfft(windowed, axis=-1, overwrite_x=True)
+    del windowed
+
+    # |X|**2 = real**2 + imag**2, squaring in place on a real view of the complex array
+    spect_view = spect.view(dtype)
+    np.square(spect_view, out=spect_view)
+    power = spect_view[..., ::2]
+    power += spect_view[..., 1::2]
+
+    # scale all bins but DC (and Nyquist, for even fft_size) by 2 for one-sided density,
+    # and all bins by sampling frequency and norm of window
+    n_freqbins = power.shape[-1]
+    scale = np.full(n_freqbins, 2.0)
+    scale[0] = 1.0
+    if fft_size % 2 == 0:
+        scale[-1] = 1.0
+    scale /= samp_freq * (window**2).sum()
+    power *= scale.astype(dtype)
+
+    freqbins = np.fft.rfftfreq(fft_size, 1 / samp_freq)
+    timebins = _timebins(n_samples, samp_freq, fft_size, step_size)
+    return power, freqbins, timebins
+
+
+def _timebins(n_samples, samp_freq, fft_size, step_size):
+    """centers of time bins, for the frames that fit in ``n_samples``.
+    Audio shorter than ``fft_size`` is padded to make one frame"""
+    n_samples = max(n_samples, fft_size)
+    return np.arange(fft_size / 2, n_samples - fft_size / 2 + 1, step_size) / samp_freq
+
+
+def _freq_slice(freqbins, freq_cutoffs):
+    """slice of frequency bins that are within ``freq_cutoffs``.
+    Frequency bins are sorted, so indices are one slice, and slicing is a view"""
+    f_inds = np.nonzero(
+        (freqbins >= freq_cutoffs[0]) & (freqbins < freq_cutoffs[1])
+    )[0]
+    return slice(f_inds[0], f_inds[-1] + 1) if f_inds.size else slice(0, 0)
+
+
+def _transform(spect, transform_type, thresh):
+    """apply transform and threshold to a spectrogram in place.
+    For 'log_spect', spectrogram must already be normalized"""
+    if transform_type:
+        if transform_type == "log_spect":
+            np.log10(spect, out=spect)  # take log
+            if thresh:
+                # I know this is weird, maintaining 'legacy' behavior
+                np.maximum(spect, -thresh, out=spect)
+        elif transform_type == "log_spect_plus_one":
+            spect += 1
+            np.log10(spect, out=spect)
+            if thresh:
+                np.maximum(spect, thresh, out=spect)
+    else:
+        if thresh:
+            # set anything less than the threshold as the threshold
+            np.maximum(spect, thresh, out=spect)
+
+
 def spectrogram(
     dat,
     samp_freq,
@@ -33,13 +142,15 @@ def spectrogram(
     thresh=None,
     transform_type=None,
     freq_cutoffs=None,
+    dtype=np.float32,
 ):
     """creates a spectrogram
 
     Parameters
     ----------
     dat : numpy.ndarray
-        audio signal
+        audio signal. Can have shape (signals, samples) to create spectrograms
+        for several signals of the same length in one call.
     samp_freq : int
         sampling frequency in Hz
     fft_size : int
@@ -55,50 +166,213 @@ def spectrogram(
         threshold minimum power for log spectrogram
     freq_cutoffs : tuple
         of two elements, lower and higher frequencies.
+    dtype : numpy.dtype
+        floating point type of spectrogram. Default is numpy.float32.
 
     Return
     ------
     spect : numpy.ndarray
-        spectrogram
+        spectrogram, with shape (frequency bins, time bins),
+        or (signals, frequency bins, time bins) if ``dat`` has two dimensions.
     freqbins : numpy.ndarray
         vector of centers of frequency bins from spectrogram
     timebins : numpy.ndarray
         vector of centers of time bins from spectrogram
     """
-    noverlap = fft_size - step_size
-
     if freq_cutoffs:
         dat = butter_bandpass_filter(dat, freq_cutoffs[0], freq_cutoffs[1], samp_freq)
 
-    # below only take [:3] from return of specgram because we don't need the image
-    spect, freqbins, timebins = specgram(dat, fft_size, samp_freq, noverlap=noverlap)[
-        :3
-    ]
+    # spect has dimensions (..., time bins, frequency bins) until the end,
+    # so the frequency bins are the last dimension, as output by the FFT
+    spect, freqbins, timebins = stft_power(dat, samp_freq, fft_size, step_size, dtype)
 
-    if transform_type:
-        if transform_type == "log_spect":
-            spect /= spect.max()  # volume normalize to max 1
-            spect = np.log10(spect)  # take log
-            if thresh:
-                # I know this is weird, maintaining 'legacy' behavior
-                spect[spect < -thresh] = -thresh
-        elif transform_type == "log_spect_plus_one":
-            spect = np.log10(spect + 1)
-            if thresh:
-                spect[spect < thresh] = thresh
-    else:
-        if thresh:
-            spect[
-                spect < thresh
-            ] = thresh  # set anything less than the threshold as the threshold
+    if transform_type == "log_spect":
+        # volume normalize to max 1, using max of each spectrogram
+        # before removing frequencies outside cutoffs
+        spect /= spect.max(axis=(-2, -1), keepdims=True)
 
     if freq_cutoffs:
-        f_inds = np.nonzero(
-            (freqbins >= freq_cutoffs[0]) & (freqbins < freq_cutoffs[1])
-        )[
-            0
-        ]  # returns tuple
-        spect = spect[f_inds, :]
-        freqbins = freqbins[f_inds]
+        f_slice = _freq_slice(freqbins, freq_cutoffs)
+        spect = spect[..., f_slice]
+        freqbins = freqbins[f_slice]
+
+    # copy with frequency bins first, the only copy of the spectrogram made here,
+    # then transform in place
+    spect = np.ascontiguousarray(np.swapaxes(spect, -2, -1))
+    _transform(spect, transform_type, thresh)
 
     return spect, freqbins, timebins
+
+
+def spectrogram_bins(
+    n_samples, samp_freq, fft_size=512, step_size=64, freq_cutoffs=None
+):
+    """get the frequency bins and time bins of the spectrogram
+    that ``spectrogram`` or ``spectrogram_blocks`` would create from audio,
+    without computing the spectrogram.
+
+    Parameters
+    ----------
+    n_samples : int
+        number of samples in audio signal.
+    samp_freq : int
+        sampling frequency in Hz
+    fft_size : int
+        size of window for Fast Fourier transform, number of time bins.
+    step_size : int
+        step size for Fast Fourier transform
+    freq_cutoffs : tuple
+        of two elements, lower and higher frequencies.
+
+    Returns
+    -------
+    freqbins : numpy.ndarray
+        vector of centers of frequency bins from spectrogram
+    timebins : numpy.ndarray
+        vector of centers of time bins from spectrogram
+    """
+    freqbins = np.fft.rfftfreq(fft_size, 1 / samp_freq)
+    if freq_cutoffs:
+        freqbins = freqbins[_freq_slice(freqbins, freq_cutoffs)]
+    timebins = _timebins(n_samples, samp_freq, fft_size, step_size)
+    return freqbins, timebins
+
+
+def spectrogram_blocks(
+    blocks,
+    n_samples,
+    samp_freq,
+    fft_size=512,
+    step_size=64,
+    thresh=None,
+    transform_type=None,
+    freq_cutoffs=None,
+    dtype=np.float32,
+    out=None,
+):
+    """creates a spectrogram from audio read in blocks,
+    so the whole audio signal never has to be in memory.
+
+    Gives the same spectrogram as ``spectrogram``, bit for bit.
+    Samples at the end of each block that do not fill a frame are carried over
+    and prepended to the next block, so frames that span two blocks are computed
+    from the same samples, and when ``freq_cutoffs`` are specified,
+    the state of the bandpass filter is carried over from block to block.
+    Boundaries are handled as by ``spectrogram``: samples after the last frame
+    that fits in the audio are dropped, and audio shorter than ``fft_size``
+    is padded with zeros to make one frame, the only time padding is applied.
+
+    Columns of the spectrogram are written to ``out`` as each block is computed.
+    For 'log_spect', the spectrogram is normalized by its maximum,
+    which is only known after the last block; so in that case
+    the log transform and threshold are applied in a second pass over ``out``,
+    one frequency bin at a time.
+
+    Parameters
+    ----------
+    blocks : iterable
+        of numpy.ndarray, one-dimensional blocks of consecutive samples from
+        an audio signal, e.g. returned by ``soundfile.blocks``.
+        Blocks can have any size.
+    n_samples : int
+        total number of samples in ``blocks``.
+    samp_freq : int
+        sampling frequency in Hz
+    fft_size : int
+        size of window for Fast Fourier transform, number of time bins.
+    step_size : int
+        step size for Fast Fourier transform
+    transform_type : str
+        one of {'log_spect', 'log_spect_plus_one'}.
+        'log_spect' transforms the spectrogram to log(spectrogram), and
+        'log_spect_plus_one' does the same thing but adds one to each element.
+        Default is None. If None, no transform is applied.
+    thresh: int
+        threshold minimum power for log spectrogram
+    freq_cutoffs : tuple
+        of two elements, lower and higher frequencies.
+    dtype : numpy.dtype
+        floating point type of spectrogram. Default is numpy.float32.
+    out : numpy.ndarray
+        array with shape (frequency bins, time bins) and type ``dtype``
+        that spectrogram is written to, e.g. a ``numpy.memmap``
+        so that the spectrogram is written to a file.
+        The shape can be found with ``spectrogram_bins``.
+        Default is None, in which case a new array is created.
+
+    Return
+    ------
+    spect : numpy.ndarray
+        spectrogram, with shape (frequency bins, time bins).
+        If ``out`` was specified, this is ``out``.
+    freqbins : numpy.ndarray
+        vector of centers of frequency bins from spectrogram
+    timebins : numpy.ndarray
+        vector of centers of time bins from spectrogram
+    """
+    freqbins, timebins = spectrogram_bins(
+        n_samples, samp_freq, fft_size, step_size, freq_cutoffs
+    )
+    shape = (freqbins.shape[0], timebins.shape[0])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(
+            f"shape of out should be {shape} for {n_samples} samples, "
+            f"but was {out.shape}"
+        )
+
+    if freq_cutoffs:
+        b, a = butter_bandpass(freq_cutoffs[0], freq_cutoffs[1], samp_freq)
+        zi = np.zeros(max(len(a), len(b)) - 1)
+        f_slice = _freq_slice(np.fft.rfftfreq(fft_size, 1 / samp_freq), freq_cutoffs)
+    else:
+        f_slice = slice(None)
+
+    spect_max = None
+    n_timebins = 0
+
+    def _write(dat):
+        nonlocal spect_max, n_timebins
+        power = stft_power(dat, samp_freq, fft_size, step_size, dtype)[0]
+        if transform_type == "log_spect":
+            # max before removing frequencies outside cutoffs, as in ``spectrogram``
+            block_max = power.max()
+            spect_max = block_max if spect_max is None else max(spect_max, block_max)
+        spect = np.ascontiguousarray(power[:, f_slice].T)
+        if transform_type != "log_spect":
+            _transform(spect, transform_type, thresh)
+        stop = n_timebins + spect.shape[1]
+        if stop > shape[1]:
+            raise ValueError(f"blocks contained more than {n_samples} samples")
+        out[:, n_timebins:stop] = spect
+        n_timebins = stop
+
+    remainder = None
+    for block in blocks:
+        if freq_cutoffs:
+            block, zi = lfilter(b, a, block, zi=zi)
+        if remainder is not None:
+            block = np.concatenate((remainder, block))
+        if block.shape[0] < fft_size:
+            remainder = block
+            continue
+        n_frames = (block.shape[0] - fft_size) // step_size + 1
+        _write(block[: (n_frames - 1) * step_size + fft_size])
+        remainder = block[n_frames * step_size :]
+    if n_timebins == 0 and remainder is not None:
+        # audio is shorter than one frame, padded by ``stft_power``
+        _write(remainder)
+
+    if n_timebins != shape[1]:
+        raise ValueError(
+            f"blocks contained audio for {n_timebins} time bins, "
+            f"but expected {shape[1]} for {n_samples} samples"
+        )
+
+    if transform_type == "log_spect":
+        for row in out:
+            row /= spect_max
+            _transform(row, transform_type, thresh)
+
+    return out, freqbins, timebins
@@ -16,7 +16,8 @@ def standardize_spect(spect, mean_freqs, std_freqs, non_zero_std):
     Parameters
     ----------
     spect : numpy.ndarray
-        with shape (frequencies, time bins)
+        with shape (frequencies, time bins), or (batch, frequencies, time bins)
+        for a batch of spectrograms or windows from spectrograms.
     mean_freqs : numpy.ndarray
         vector of mean values for each frequency bin across the fit set of spectrograms
     std_freqs : numpy.ndarray
@@ -31,8 +32,10 @@ def standardize_spect(spect, mean_freqs, std_freqs, non_zero_std):
         (mean and standard devation will still vary by batch).
     """
     tfm = spect - mean_freqs[:, np.newaxis]  # need axis for broadcasting
-    # keep any stds that are zero from causing NaNs
-    tfm[non_zero_std, :] = tfm[non_zero_std, :] / std_freqs[non_zero_std, np.newaxis]
+    # keep any stds that are zero from causing NaNs, by dividing those rows by 1
+    divisor = np.ones_like(std_freqs)
+    divisor[non_zero_std] = std_freqs[non_zero_std]
+    tfm /= divisor[:, np.newaxis]
     return tfm
 
 
@@ -1,3 +1,5 @@
+import dask.bag as db
+from dask.diagnostics import ProgressBar
 import numpy as np
 
 from .. import files
@@ -15,6 +17,35 @@ __all__ = [
 ]
 
 
+def _spect_stats(spect_path, spect_key="s"):
+    """get number of time bins, mean, and sum of squared deviations from the mean
+    of each frequency bin in a spectrogram file, used by StandardizeSpect.fit_df"""
+    spect = files.spect.load(spect_path)[spect_key]
+    # in files, spectrograms are in orientation (freq bins, time bins)
+    # so we take mean and variance across columns, i.e. time bins, i.e. axis 1
+    n_timebins = spect.shape[1]
+    mean_freqs = np.mean(spect, axis=1, dtype=np.float64)
+    m2_freqs = np.var(spect, axis=1, dtype=np.float64) * n_timebins
+    return n_timebins, mean_freqs, m2_freqs
+
+
+def _combine_spect_stats(stats_a, stats_b):
+    """combine statistics returned by ``_spect_stats`` for two sets of time bins,
+    using the pairwise update from Chan et al. 1979,
+    "Updating formulae and a pairwise algorithm for computing sample variances"."""
+    n_a, mean_a, m2_a = stats_a
+    n_b, mean_b, m2_b = stats_b
+    if n_a == 0:
+        return stats_b
+    if n_b == 0:
+        return stats_a
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+    return n, mean, m2
+
+
 # adapted from:
 # https://github.com/NickleDave/hybrid-vocal-classifier/blob/master/hvc/neuralnet/utils.py
 class StandardizeSpect:
@@ -65,9 +96,14 @@ class StandardizeSpect:
         self.non_zero_std = non_zero_std
 
     @classmethod
-    def fit_df(cls, df, spect_key="s"):
+    def fit_df(cls, df, spect_key="s", split=None, return_n_timebins=False):
         """fits StandardizeSpect instance, given a pandas DataFrame representing a dataset
 
+        Statistics are computed for each spectrogram file in parallel,
+        then combined into the mean and standard deviation of each frequency bin
+        across all time bins from all files, i.e. the same values that would be computed
+        if all spectrograms were concatenated into one array.
+
         Parameters
         ----------
         df : pandas.DataFrame
@@ -75,27 +111,42 @@ class StandardizeSpect:
         spect_key : str
             key in files in 'spect_path' column that maps to spectrograms in arrays.
             Default is 's'.
+        split : str
+            split of dataset to fit on, e.g. 'train'. Default is None,
+            in which case all spectrograms in ``df`` are used.
+        return_n_timebins : bool
+            if True, also return the total number of time bins in spectrograms
+            used to fit. Default is False.
 
         Returns
         -------
         standardize_spect : StandardizeSpect
             instance fit to spectrograms in df
+        n_timebins : int
+            total number of time bins in spectrograms used to fit.
+            Only returned if ``return_n_timebins`` is True.
         """
-        spect_paths = df["spect_path"]
-        spect = files.spect.load(spect_paths[0])[spect_key]
-        # in files, spectrograms are in orientation (freq bins, time bins)
-        # so we take mean and std across columns, i.e. time bins, i.e. axis 1
-        mean_freqs = np.mean(spect, axis=1)
-        std_freqs = np.std(spect, axis=1)
-
-        for spect_path in spect_paths[1:]:
-            spect = files.spect.load(spect_path)[spect_key]
-            mean_freqs += np.mean(spect, axis=1)
-            std_freqs += np.std(spect, axis=1)
-        mean_freqs = mean_freqs / len(spect_paths)
-        std_freqs = std_freqs / len(spect_paths)
+        if split is not None:
+            df = df[df["split"] == split]
+            if len(df) == 0:
+                raise ValueError(f"split {split} not found in dataset")
+
+        spect_paths_bag = db.from_sequence(df["spect_path"].values)
+        with ProgressBar():
+            # use threads, since loading arrays and computing statistics release the GIL,
+            # and this avoids starting processes that each import vak
+            n_timebins, mean_freqs, m2_freqs = (
+                spect_paths_bag.map(_spect_stats, spect_key=spect_key)
+                .fold(_combine_spect_stats)
+                .compute(scheduler="threads")
+            )
+        std_freqs = np.sqrt(m2_freqs / n_timebins)
         non_zero_std = np.argwhere(std_freqs != 0)
-        return cls(mean_freqs, std_freqs, non_zero_std)
+        standardize_spect = cls(mean_freqs, std_freqs, non_zero_std)
+        if return_n_timebins:
+            return standardize_spect, int(n_timebins)
+        else:
+            return standardize_spect
 
     @classmethod
     def fit(cls, spect):
@@ -129,7 +180,8 @@ class StandardizeSpect:
         Parameters
         ----------
         spect : numpy.ndarray
-            2-d array with dimensions (frequency bins, time bins).
+            2-d array with dimensions (frequency bins, time bins),
+            or 3-d array with dimensions (batch, frequency bins, time bins).
 
         Returns
         -------
@@ -150,9 +202,9 @@ class StandardizeSpect:
                 f"type of spect must be numpy.ndarray but was: {type(spect)}"
             )
 
-        if spect.shape[0] != self.mean_freqs.shape[0]:
+        if spect.shape[-2] != self.mean_freqs.shape[0]:
             raise ValueError(
-                f"number of rows in spects, {spect.shape[0]}, "
+                f"number of rows in spects, {spect.shape[-2]}, "
                 f"does not match number of elements in self.mean_freqs, {self.mean_freqs.shape[0]},"
                 "i.e. the number of frequency bins from the spectrogram"
                 "to which the scaler was fit originally"
@@ -1,4 +1,12 @@
 import pytest
+import torch
+
+import vak.models
+
+
+# input shape and number of classes of models made by ``teenytweetynet_model_factory``
+TEENYTWEETYNET_INPUT_SHAPE = (1, 128, 16)
+TEENYTWEETYNET_NUM_CLASSES = 3
 
 
 @pytest.fixture
@@ -10,3 +18,36 @@ def default_model():
     currently ``teenytweetynet``
     """
     return "teenytweetynet"
+
+
+@pytest.fixture
+def teenytweetynet_model_factory():
+    """factory that makes ``TeenyTweetyNetModel`` instances
+    with weights initialized from a random seed,
+    for tests that need a model but not a trained checkpoint.
+
+    Models have input shape ``TEENYTWEETYNET_INPUT_SHAPE``
+    and ``TEENYTWEETYNET_NUM_CLASSES`` classes, and their device is 'cpu'.
+    """
+
+    def _teenytweetynet_model_factory(seed=42):
+        torch.manual_seed(seed)
+        config = {
+            "network": {
+                "num_classes": TEENYTWEETYNET_NUM_CLASSES,
+                "input_shape": TEENYTWEETYNET_INPUT_SHAPE,
+            },
+            "optimizer": {},
+            "loss": {},
+            "metrics": {},
+        }
+        model = vak.models.teenytweetynet.TeenyTweetyNetModel.from_config(config)
+        model.device = "cpu"
+        return model
+
+    return _teenytweetynet_model_factory
+
+
+@pytest.fixture
+def teenytweetynet_model(teenytweetynet_model_factory):
+    return teenytweetynet_model_factory()
@@ -0,0 +1,93 @@
+"""benchmark training steps of TeenyTweetyNet on random data,
+with the network run in eager mode, or compiled with each mode
+in ``vak.constants.VALID_COMPILE_MODES``.
+
+Example
+-------
+$ python tests/scripts/benchmark_compile.py --n_steps 50 --device cuda
+"""
+from argparse import ArgumentParser
+import tempfile
+import time
+
+import torch
+
+import vak.constants
+import vak.models
+
+
+def time_train_steps(compile, n_steps, batch_size, input_shape, num_classes, device):
+    """time training steps of TeenyTweetyNet with the specified compile mode.
+
+    Returns
+    -------
+    first_step_s : float
+        duration of first step in seconds, that includes compiling.
+    mean_step_s : float
+        mean duration of the steps after the first, in seconds.
+    """
+    torch.manual_seed(42)
+    config = {
+        "network": {"num_classes": num_classes, "input_shape": input_shape},
+        "optimizer": {},
+        "loss": {},
+        "metrics": {},
+    }
+    model = vak.models.teenytweetynet.TeenyTweetyNetModel.from_config(config)
+    model.device = device
+    model.network.to(device)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model.compile_cache_dir = tmp_dir
+        model._compile_network(compile)
+        model._network_train(True)
+
+        x = torch.rand(batch_size, *input_shape, device=device)
+        y = torch.randint(num_classes, (batch_size, input_shape[-1]), device=device)
+        durations = []
+        for _ in range(n_steps):
+            tic = time.perf_counter()
+            y_pred = model._network_forward(x)
+            model.optimizer.zero_grad()
+            loss = model.loss(y_pred, y)
+            loss.backward()
+            model.optimizer.step()
+            if device == "cuda":
+                torch.cuda.synchronize()
+            durations.append(time.perf_counter() - tic)
+    return durations[0], sum(durations[1:]) / (len(durations) - 1)
+
+
+def main(n_steps, batch_size, window_size, n_freqbins, num_classes, device):
+    input_shape = (1, n_freqbins, window_size)
+    for compile in (None,) + vak.constants.VALID_COMPILE_MODES:
+        first_step_s, mean_step_s = time_train_steps(
+            compile, n_steps, batch_size, input_shape, num_classes, device
+        )
+        print(
+            f"compile={compile}: first step {first_step_s:.3f} s, "
+            f"mean of other steps {mean_step_s * 1000:.2f} ms"
+        )
+
+
+def get_parser():
+    parser = ArgumentParser()
+    parser.add_argument("--n_steps", type=int, default=20)
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--window_size", type=int, default=88)
+    parser.add_argument("--n_freqbins", type=int, default=257)
+    parser.add_argument("--num_classes", type=int, default=10)
+    parser.add_argument("--device", type=str, default=vak.device.get_default())
+    return parser
+
+
+if __name__ == "__main__":
+    parser = get_parser()
+    args = parser.parse_args()
+    main(
+        n_steps=args.n_steps,
+        batch_size=args.batch_size,
+        window_size=args.window_size,
+        n_freqbins=args.n_freqbins,
+        num_classes=args.num_classes,
+        device=args.device,
+    )
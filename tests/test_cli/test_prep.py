@@ -140,3 +140,53 @@ def test_prep_csv_path_raises(
 
     with pytest.raises(ValueError):
         vak.cli.prep.prep(toml_path)
+
+
+@pytest.mark.parametrize(
+    "config_type, audio_format, spect_format, annot_format",
+    [
+        ("predict", "wav", None, "koumura"),
+        ("train", "cbin", None, "notmat"),
+    ],
+)
+def test_prep_append_without_csv_path_raises(
+    config_type,
+    audio_format,
+    spect_format,
+    annot_format,
+    specific_config,
+    default_model,
+    tmp_path,
+):
+    output_dir = tmp_path.joinpath(
+        f"test_prep_{config_type}_{audio_format}_{spect_format}_{annot_format}"
+    )
+    output_dir.mkdir()
+
+    options_to_change = [
+        {"section": "PREP", "option": "output_dir", "value": str(output_dir)},
+        {
+            "section": config_type.upper(),
+            "option": "csv_path",
+            "value": None,
+        },
+    ]
+    toml_path = specific_config(
+        config_type=config_type,
+        model=default_model,
+        audio_format=audio_format,
+        annot_format=annot_format,
+        spect_format=spect_format,
+        options_to_change=options_to_change,
+    )
+
+    with pytest.raises(ValueError):
+        vak.cli.prep.prep(toml_path, append=True)
+    with pytest.raises(ValueError):
+        vak.cli.prep.prep(toml_path, resplit=True)
+
+
+@pytest.mark.parametrize("command", ["train", "eval", "predict", "learncurve"])
+def test_cli_append_not_prep_raises(command, tmp_path):
+    with pytest.raises(ValueError):
+        vak.cli.cli.cli(command, tmp_path / "config.toml", append=True)
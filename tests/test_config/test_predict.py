@@ -1,4 +1,6 @@
 """tests for vak.config.predict module"""
+import pytest
+
 import vak.config.predict
 import vak.split
 
@@ -9,3 +11,21 @@ def test_predict_attrs_class(all_generated_predict_configs_toml):
         predict_section = config_toml["PREDICT"]
         config = vak.config.predict.PredictConfig(**predict_section)
         assert isinstance(config, vak.config.predict.PredictConfig)
+
+
+def test_predict_attrs_class_onnx_path(tmp_path):
+    """test that checkpoint_path and labelmap_path are required without onnx_path"""
+    onnx_path = tmp_path / "TeenyTweetyNet.onnx"
+    onnx_path.touch()
+    config = vak.config.predict.PredictConfig(
+        models="TeenyTweetyNet", batch_size=1, onnx_path=str(onnx_path)
+    )
+    assert config.checkpoint_path is None
+    assert config.labelmap_path is None
+
+    labelmap_path = tmp_path / "labelmap.json"
+    labelmap_path.touch()
+    with pytest.raises(ValueError):
+        vak.config.predict.PredictConfig(
+            models="TeenyTweetyNet", batch_size=1, labelmap_path=str(labelmap_path)
+        )
@@ -21,9 +21,7 @@ def learncurve_output_matches_expected(cfg, model_config_map, results_path):
 
             assert replicate_path.joinpath("labelmap.json").exists()
 
-            assert replicate_path.joinpath("spect_id_vector.npy").exists()
-            assert replicate_path.joinpath("spect_inds_vector.npy").exists()
-            assert replicate_path.joinpath("x_inds.npy").exists()
+            assert replicate_path.joinpath("window_index.npz").exists()
 
             if cfg.learncurve.normalize_spectrograms:
                 assert replicate_path.joinpath("StandardizeSpect").exists()
@@ -1,9 +1,12 @@
 """tests for vak.core.prep module"""
 from pathlib import Path
+import time
 
+import numpy as np
 import pandas as pd
-from pandas.testing import assert_series_equal
+from pandas.testing import assert_frame_equal, assert_series_equal
 import pytest
+import soundfile
 
 import vak.config
 import vak.constants
@@ -91,3 +94,60 @@ def test_prep(
     )
 
     assert prep_output_matches_expected(csv_path, vak_df)
+
+
+def test_prep_append(tmp_path):
+    data_dir = tmp_path / "audio"
+    data_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    rng = np.random.default_rng(42)
+
+    def write_audio(inds):
+        for ind in inds:
+            soundfile.write(
+                data_dir / f"{ind}.wav", 0.1 * rng.standard_normal(16000 + ind), 32000
+            )
+
+    prep_kwargs = dict(
+        data_dir=data_dir,
+        audio_format="wav",
+        spect_params=vak.config.spect_params.SpectParamsConfig(),
+        output_dir=output_dir,
+        spect_output_dir=output_dir,
+        scheduler="threads",
+    )
+    write_audio(range(3))
+    vak_df, csv_path = vak.core.prep(purpose="predict", **prep_kwargs)
+    # as if dataset had been split
+    vak_df["split"] = ["train", "val", "test"]
+    vak_df.to_csv(csv_path, index=False)
+
+    write_audio(range(3, 5))
+    # names of dataset .csv and spectrogram directory have a timestamp in seconds
+    time.sleep(1)
+    appended_df, appended_csv_path = vak.core.prep(
+        purpose="train", append_csv_path=csv_path, **prep_kwargs
+    )
+    assert appended_csv_path != csv_path
+    assert prep_output_matches_expected(appended_csv_path, appended_df)
+    # files already in dataset are unchanged, and keep their split
+    assert_frame_equal(appended_df.iloc[:3], pd.read_csv(csv_path))
+    assert appended_df["split"].tolist() == ["train", "val", "test", "train", "train"]
+    assert sorted(Path(path).name for path in appended_df["audio_path"]) == [
+        f"{ind}.wav" for ind in range(5)
+    ]
+
+    # no new files
+    time.sleep(1)
+    appended_again_df, _ = vak.core.prep(
+        purpose="train", append_csv_path=appended_csv_path, **prep_kwargs
+    )
+    assert_frame_equal(appended_again_df, pd.read_csv(appended_csv_path))
+
+    time.sleep(1)
+    resplit_df, _ = vak.core.prep(
+        purpose="predict", append_csv_path=csv_path, resplit=True, **prep_kwargs
+    )
+    assert len(resplit_df) == 5
+    assert (resplit_df["split"] == "predict").all()
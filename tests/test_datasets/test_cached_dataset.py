@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+import torch
+
+import vak.datasets
+
+
+class CountingDataset:
+    """returns items like a ``VocalDataset`` and counts how often each is loaded"""
+
+    labelmap = {"unlabeled": 0, "a": 1}
+
+    def __init__(self, n_items):
+        self.n_items = n_items
+        self.n_loads = [0] * n_items
+
+    def __getitem__(self, idx):
+        self.n_loads[idx] += 1
+        return {
+            "source": torch.full((2, 1, 4, 5), float(idx)),  # 160 bytes
+            "annot": torch.zeros(10, dtype=torch.int64),  # 80 bytes
+            "spect_path": f"spect{idx}.npz",
+            "timebins": np.arange(10, dtype=np.float64),  # 80 bytes
+        }
+
+    def __len__(self):
+        return self.n_items
+
+
+def test_item_nbytes():
+    item = CountingDataset(1)[0]
+    assert vak.datasets.cached_dataset.item_nbytes(item) == 320
+
+
+def test_cached_dataset_loads_items_once():
+    dataset = CountingDataset(3)
+    cached = vak.datasets.CachedDataset(dataset, max_bytes=10_000)
+    for _ in range(3):
+        items = [cached[idx] for idx in range(len(cached))]
+    assert dataset.n_loads == [1, 1, 1]
+    assert cached.n_cached == 3
+    assert cached.nbytes == 960
+    assert [item["spect_path"] for item in items] == [
+        "spect0.npz",
+        "spect1.npz",
+        "spect2.npz",
+    ]
+    # attributes are looked up on the wrapped dataset
+    assert cached.labelmap == dataset.labelmap
+
+
+def test_cached_dataset_fill():
+    dataset = CountingDataset(4)
+    # only room for two items
+    cached = vak.datasets.CachedDataset(dataset, max_bytes=700)
+    assert cached.fill() == 2
+    assert cached.nbytes == 640
+    # loaded items that did not fit are not cached
+    assert dataset.n_loads == [1, 1, 1, 0]
+
+    for _ in range(2):
+        for idx in range(len(cached)):
+            item = cached[idx]
+            assert torch.all(item["source"] == idx)
+            # arrays are not converted to tensors when filling
+            assert isinstance(item["timebins"], np.ndarray)
+    # items that did not fit are loaded every time
+    assert dataset.n_loads == [1, 1, 3, 2]
+
+
+def test_cached_dataset_with_dataloader():
+    dataset = CountingDataset(3)
+    cached = vak.datasets.CachedDataset(dataset, max_bytes=10_000)
+    cached.fill()
+    loader = torch.utils.data.DataLoader(cached, batch_size=1, shuffle=False)
+    for _ in range(2):
+        batches = list(loader)
+    assert dataset.n_loads == [1, 1, 1]
+    assert batches[1]["source"].shape == (1, 2, 1, 4, 5)
+
+
+@pytest.mark.parametrize(
+    "max_bytes, expected_exception",
+    [
+        (-1, ValueError),
+        (1.5, TypeError),
+        (True, TypeError),
+    ],
+)
+def test_cached_dataset_invalid_max_bytes_raises(max_bytes, expected_exception):
+    with pytest.raises(expected_exception):
+        vak.datasets.CachedDataset(CountingDataset(1), max_bytes=max_bytes)
@@ -0,0 +1,27 @@
+import torch
+
+import vak.datasets
+
+
+def test_collate_window_batch():
+    window_size = 8
+    items = [
+        {
+            "source": torch.rand(n_windows, 1, 16, window_size),
+            "padding_mask": torch.ones(n_windows * window_size, dtype=torch.bool),
+            "spect_path": f"spect{ind}.npz",
+        }
+        for ind, n_windows in enumerate((3, 1, 5))
+    ]
+    batch = vak.datasets.collate.collate_window_batch(items)
+    assert batch["source"].shape == (9, 1, 16, window_size)
+    assert batch["n_windows"].tolist() == [3, 1, 5]
+
+    # use source as "output" so we can check it is split back up correctly
+    unpacked = list(vak.datasets.collate.unpack_window_batch(batch, batch["source"]))
+    assert len(unpacked) == len(items)
+    for item, (item_batch, item_out) in zip(items, unpacked):
+        assert torch.equal(item_out, item["source"])
+        # other values are collated as if batch size was 1
+        assert item_batch["spect_path"] == [item["spect_path"]]
+        assert torch.equal(item_batch["padding_mask"], item["padding_mask"][None, :])
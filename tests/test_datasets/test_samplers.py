@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import torch
+
+import vak.datasets
+
+
+@pytest.mark.parametrize(
+    "batch_size, files_per_group, drop_last",
+    [
+        (4, 1, False),
+        (4, 2, False),
+        (5, 2, True),
+        (8, 100, False),
+    ],
+)
+def test_file_locality_batch_sampler(batch_size, files_per_group, drop_last):
+    # 6 files with different numbers of windows
+    spect_ids = np.repeat(np.arange(6), [10, 3, 7, 12, 5, 8])
+    sampler = vak.datasets.FileLocalityBatchSampler(
+        spect_ids,
+        batch_size=batch_size,
+        files_per_group=files_per_group,
+        drop_last=drop_last,
+        generator=torch.Generator().manual_seed(0),
+    )
+    batches = list(sampler)
+    assert len(batches) == len(sampler)
+    assert all([len(batch) == batch_size for batch in batches[:-1]])
+
+    inds = np.concatenate(batches)
+    if drop_last:
+        assert len(inds) == (spect_ids.shape[0] // batch_size) * batch_size
+    else:
+        # every window is sampled exactly once
+        assert np.array_equal(np.sort(inds), np.arange(spect_ids.shape[0]))
+
+    # all windows from a group of files are sampled before windows from the next group
+    file_order = spect_ids[inds]
+    _, first_inds = np.unique(file_order, return_index=True)
+    files_in_sampled_order = file_order[np.sort(first_inds)]
+    for group_start in range(0, len(files_in_sampled_order), files_per_group):
+        group = files_in_sampled_order[group_start : group_start + files_per_group]
+        group_window_inds = np.nonzero(np.isin(file_order, group))[0]
+        assert np.array_equal(
+            group_window_inds,
+            np.arange(group_window_inds[0], group_window_inds[0] + len(group_window_inds)),
+        )
+
+
+def test_file_locality_batch_sampler_invalid_files_per_group_raises():
+    with pytest.raises(ValueError):
+        vak.datasets.FileLocalityBatchSampler(
+            np.zeros(10, dtype=int), batch_size=2, files_per_group=0
+        )
+
+
+@pytest.mark.parametrize(
+    "max_windows",
+    [1, 10, 12, 25, 1000],
+)
+def test_window_packing_batch_sampler(max_windows):
+    n_windows = [10, 3, 7, 12, 5, 8]
+    sampler = vak.datasets.WindowPackingBatchSampler(n_windows, max_windows)
+    batches = list(sampler)
+    assert len(batches) == len(sampler)
+    # files are in order, and each is in exactly one batch
+    assert [ind for batch in batches for ind in batch] == list(range(len(n_windows)))
+    for batch in batches:
+        n_windows_batch = sum([n_windows[ind] for ind in batch])
+        # only a file that is bigger than max_windows can make a bigger batch, by itself
+        assert n_windows_batch <= max_windows or len(batch) == 1
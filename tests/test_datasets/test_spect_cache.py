@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import vak.datasets
+
+
+def test_spect_cache_hits_misses():
+    cache = vak.datasets.SpectCache(max_bytes=1000)
+    assert cache.get(0) is None
+    arrs = (np.zeros((10, 10)), np.zeros(10))  # 880 bytes
+    cache.put(0, arrs)
+    assert cache.get(0) is arrs
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.nbytes == 880
+
+
+def test_spect_cache_evicts_least_recently_used():
+    cache = vak.datasets.SpectCache(max_bytes=300)
+    for key in range(3):
+        cache.put(key, (np.zeros(10),))  # 80 bytes each
+    cache.get(0)  # so 1 is least recently used
+    cache.put(3, (np.zeros(10),))
+    assert 1 not in cache
+    assert all([key in cache for key in (0, 2, 3)])
+    assert cache.nbytes == 240
+
+
+def test_spect_cache_does_not_cache_item_larger_than_max_bytes():
+    cache = vak.datasets.SpectCache(max_bytes=100)
+    cache.put(0, (np.zeros(10),))
+    cache.put(1, (np.zeros(100),))
+    assert 1 not in cache
+    assert 0 in cache
+
+
+@pytest.mark.parametrize(
+    "max_bytes, expected_exception",
+    [
+        (-1, ValueError),
+        (1.5, TypeError),
+        (None, TypeError),
+    ],
+)
+def test_spect_cache_invalid_max_bytes_raises(max_bytes, expected_exception):
+    with pytest.raises(expected_exception):
+        vak.datasets.SpectCache(max_bytes=max_bytes)
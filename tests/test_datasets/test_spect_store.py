@@ -0,0 +1,66 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import vak.datasets
+
+
+@pytest.fixture
+def spect_paths(tmp_path):
+    rng = np.random.default_rng(42)
+    spect_paths = []
+    for ind, n_timebins in enumerate((10, 25, 17)):
+        spect_path = tmp_path.joinpath(f"spect{ind}.spect.npz")
+        np.savez(spect_path, s=rng.random((8, n_timebins)))
+        spect_paths.append(str(spect_path))
+    return spect_paths
+
+
+def test_spect_store_write(spect_paths, tmp_path):
+    store_dir = tmp_path.joinpath("spect_store")
+    spect_store = vak.datasets.SpectStore.write(spect_paths, store_dir)
+    assert store_dir.joinpath(vak.datasets.SpectStore.DATA_FILENAME).exists()
+    assert store_dir.joinpath(vak.datasets.SpectStore.INDEX_FILENAME).exists()
+    assert np.array_equal(spect_store.offsets, np.array([0, 10, 35]))
+    assert spect_store.data.shape == (8, 52)
+
+    for store_ind, spect_path in enumerate(spect_paths):
+        spect = np.load(spect_path)["s"]
+        assert np.array_equal(spect_store.spect(store_ind), spect)
+        assert np.array_equal(spect_store.window(store_ind, 2, 5), spect[:, 2:7])
+
+
+def test_spect_store_from_dir(spect_paths, tmp_path):
+    store_dir = tmp_path.joinpath("spect_store")
+    vak.datasets.SpectStore.write(spect_paths, store_dir)
+    spect_store = vak.datasets.SpectStore.from_dir(store_dir)
+    assert spect_store.n_freqbins == 8
+    assert spect_store.dtype == np.dtype("float64")
+    assert np.array_equal(
+        spect_store.inds_from_paths(spect_paths[::-1]), np.array([2, 1, 0])
+    )
+    spect = np.load(spect_paths[1])["s"]
+    assert np.array_equal(spect_store.spect(1), spect)
+
+    # memmap should be re-opened after unpickling, not copied
+    spect_store = pickle.loads(pickle.dumps(spect_store))
+    assert spect_store._data is None
+    assert np.array_equal(spect_store.spect(1), spect)
+
+
+def test_spect_store_path_not_in_store_raises(spect_paths, tmp_path):
+    spect_store = vak.datasets.SpectStore.write(
+        spect_paths[:2], tmp_path.joinpath("spect_store")
+    )
+    with pytest.raises(ValueError):
+        spect_store.inds_from_paths(spect_paths)
+
+
+def test_spect_store_different_freqbins_raises(spect_paths, tmp_path):
+    spect_path = tmp_path.joinpath("different.spect.npz")
+    np.savez(spect_path, s=np.zeros((4, 10)))
+    with pytest.raises(ValueError):
+        vak.datasets.SpectStore.write(
+            spect_paths + [spect_path], tmp_path.joinpath("spect_store")
+        )
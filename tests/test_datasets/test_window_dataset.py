@@ -0,0 +1,203 @@
+import crowsetta
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+import torchvision.transforms
+
+import vak.annotation
+import vak.datasets
+import vak.files.spect
+import vak.labeled_timebins
+import vak.transforms
+
+
+TIMEBIN_DUR = 0.001
+WINDOW_SIZE = 8
+LABELMAP = {"unlabeled": 0, "a": 1, "b": 2}
+
+
+@pytest.fixture
+def window_dataset_args(tmp_path):
+    rng = np.random.default_rng(42)
+    spect_paths, annots = [], []
+    for ind, n_timebins in enumerate((30, 45, 20)):
+        spect_path = tmp_path.joinpath(f"spect{ind}.wav.spect.npz")
+        t = np.arange(n_timebins) * TIMEBIN_DUR
+        np.savez(spect_path, s=rng.random((16, n_timebins)), t=t)
+        spect_paths.append(str(spect_path))
+        seq = crowsetta.Sequence.from_keyword(
+            labels=["a", "b"],
+            # annotations differ between files, and segments end at file boundaries
+            onsets_s=np.array([t[2 + ind], t[12 + ind]]),
+            offsets_s=np.array([t[8 + ind], t[-1] + TIMEBIN_DUR]),
+        )
+        annots.append(
+            crowsetta.Annotation(
+                annot_path=spect_path,
+                audio_path=tmp_path.joinpath(f"spect{ind}.wav"),
+                seq=seq,
+            )
+        )
+    window_index = vak.datasets.WindowIndex.from_n_timebins([30, 45, 20], WINDOW_SIZE)
+    spect_standardizer = vak.transforms.StandardizeSpect.fit(
+        np.load(spect_paths[0])["s"]
+    )
+    return spect_paths, annots, window_index, spect_standardizer
+
+
+@pytest.mark.parametrize("batch_transform", [True, False])
+def test_getitems(window_dataset_args, batch_transform):
+    spect_paths, annots, window_index, spect_standardizer = window_dataset_args
+    transform, target_transform = vak.transforms.get_defaults(
+        "train", spect_standardizer
+    )
+    if not batch_transform:
+        # a transform that can only be applied to one window at a time
+        transform = torchvision.transforms.Compose(
+            [transform, lambda window: window[:, :, ::2]]
+        )
+    dataset = vak.datasets.WindowDataset(
+        root=None,
+        window_index=window_index,
+        spect_paths=np.array(spect_paths),
+        annots=annots,
+        labelmap=LABELMAP,
+        timebin_dur=TIMEBIN_DUR,
+        window_size=WINDOW_SIZE,
+        transform=transform,
+        target_transform=target_transform,
+    )
+
+    indices = [0, 50, 1, 70, len(dataset) - 1, 23, 50]
+    items = dataset.__getitems__(indices)
+    assert len(items) == len(indices)
+    for idx, (window, labelvec) in zip(indices, items):
+        expected_window, expected_labelvec = dataset[idx]
+        assert torch.equal(window, expected_window)
+        assert torch.equal(labelvec, expected_labelvec)
+
+    # DataLoader calls __getitems__ to get batches
+    data_loader = torch.utils.data.DataLoader(dataset, batch_size=10, shuffle=False)
+    windows, labelvecs = next(iter(data_loader))
+    assert windows.shape == (10,) + tuple(dataset.shape)
+    assert torch.equal(windows, torch.stack([dataset[idx][0] for idx in range(10)]))
+    assert torch.equal(labelvecs, torch.stack([dataset[idx][1] for idx in range(10)]))
+
+
+def test_labelvec_matches_label_timebins(window_dataset_args):
+    spect_paths, annots, window_index, _ = window_dataset_args
+    dataset = vak.datasets.WindowDataset(
+        root=None,
+        window_index=window_index,
+        spect_paths=np.array(spect_paths),
+        annots=annots,
+        labelmap=LABELMAP,
+        timebin_dur=TIMEBIN_DUR,
+        window_size=WINDOW_SIZE,
+    )
+
+    spect_ids, window_start_inds = window_index.lookup(np.arange(len(dataset)))
+    # first and last windows of each file, and some from the middle of files
+    boundary_inds = np.flatnonzero(np.diff(spect_ids)) + 1
+    indices = np.unique(
+        np.concatenate(
+            [[0, len(dataset) - 1], boundary_inds - 1, boundary_inds, [5, 40, 70]]
+        )
+    ).tolist()
+
+    items = dataset.__getitems__(indices)
+    for idx, (_, labelvec) in zip(indices, items):
+        spect_id, window_start_ind = spect_ids[idx], window_start_inds[idx]
+        annot = annots[spect_id]
+        lbl_tb = vak.labeled_timebins.label_timebins(
+            [LABELMAP[lbl] for lbl in annot.seq.labels],
+            annot.seq.onsets_s,
+            annot.seq.offsets_s,
+            np.load(spect_paths[spect_id])["t"],
+            unlabeled_label=LABELMAP["unlabeled"],
+        )
+        expected = lbl_tb[window_start_ind : window_start_ind + WINDOW_SIZE]
+        assert np.array_equal(dataset[idx][1], expected)
+        assert np.array_equal(labelvec, expected)
+
+
+@pytest.fixture
+def spect_metadata_df(window_dataset_args):
+    spect_paths = window_dataset_args[0]
+    records = []
+    for spect_path in spect_paths:
+        spect_dict = np.load(spect_path)
+        spect, t = spect_dict["s"], spect_dict["t"]
+        records.append(
+            {
+                "spect_path": spect_path,
+                "split": "train",
+                "duration": t.shape[-1] * TIMEBIN_DUR,
+                "timebin_dur": TIMEBIN_DUR,
+                "n_timebins": spect.shape[-1],
+                "n_freqbins": spect.shape[0],
+                "dtype": str(spect.dtype),
+                "t0": t[0],
+                "t_step": TIMEBIN_DUR,
+            }
+        )
+    return pd.DataFrame.from_records(records)
+
+
+def raise_error(*args, **kwargs):
+    raise AssertionError("spectrogram file was loaded")
+
+
+def test_from_csv_does_not_load_spect_files(
+    window_dataset_args, spect_metadata_df, monkeypatch, tmp_path
+):
+    spect_paths, annots, window_index, _ = window_dataset_args
+    csv_path = tmp_path / "dataset.csv"
+    spect_metadata_df.to_csv(csv_path, index=False)
+    expected = vak.datasets.WindowDataset(
+        root=None,
+        window_index=window_index,
+        spect_paths=np.array(spect_paths),
+        annots=annots,
+        labelmap=LABELMAP,
+        timebin_dur=TIMEBIN_DUR,
+        window_size=WINDOW_SIZE,
+    )
+    monkeypatch.setattr(vak.annotation, "from_df", lambda df: annots)
+    monkeypatch.setattr(vak.files.spect, "load", raise_error)
+    dataset = vak.datasets.WindowDataset.from_csv(
+        csv_path, split="train", labelmap=LABELMAP, window_size=WINDOW_SIZE
+    )
+    assert len(dataset) == len(expected)
+    assert dataset.shape == expected.shape
+    assert np.array_equal(dataset.lbl_tb, expected.lbl_tb)
+    assert np.array_equal(dataset.lbl_tb_offsets, expected.lbl_tb_offsets)
+
+
+def test_window_index_from_df_crop_does_not_load_spect_files(
+    window_dataset_args, spect_metadata_df, monkeypatch
+):
+    annots = window_dataset_args[1]
+    monkeypatch.setattr(vak.annotation, "from_df", lambda df: annots)
+    kwargs = dict(
+        split="train",
+        window_size=WINDOW_SIZE,
+        crop_dur=60 * TIMEBIN_DUR,
+        timebin_dur=TIMEBIN_DUR,
+        labelmap=LABELMAP,
+    )
+    # without metadata, time bins are loaded from files
+    expected = vak.datasets.WindowDataset.window_index_from_df(
+        spect_metadata_df[["spect_path", "split"]], **kwargs
+    )
+
+    monkeypatch.setattr(vak.files.spect, "load", raise_error)
+    window_index = vak.datasets.WindowDataset.window_index_from_df(
+        spect_metadata_df, **kwargs
+    )
+    assert len(window_index) == len(expected)
+    assert np.array_equal(
+        window_index.lookup(np.arange(len(window_index))),
+        expected.lookup(np.arange(len(expected))),
+    )
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import vak.datasets
+
+
+def _windows_from_n_timebins(n_timebins, window_size):
+    """brute-force list of (spect_id, start) for every window"""
+    return [
+        (spect_id, start)
+        for spect_id, n_tb in enumerate(n_timebins)
+        for start in range(n_tb - window_size + 1)
+    ]
+
+
+@pytest.mark.parametrize(
+    "n_timebins, window_size",
+    [
+        ([10, 20, 30], 5),
+        ([10, 3, 30], 5),
+        ([1, 1, 1], 1),
+        ([100], 100),
+    ],
+)
+def test_from_n_timebins(n_timebins, window_size):
+    window_index = vak.datasets.WindowIndex.from_n_timebins(n_timebins, window_size)
+    expected = _windows_from_n_timebins(n_timebins, window_size)
+
+    assert len(window_index) == len(expected)
+    spect_ids, starts = window_index.lookup(np.arange(len(window_index)))
+    assert list(zip(spect_ids.tolist(), starts.tolist())) == expected
+    # scalar lookup gives same result as vectorized
+    for idx in (0, len(window_index) - 1, -1):
+        spect_id, start = window_index.lookup(idx)
+        assert (int(spect_id), int(start)) == expected[idx]
+    assert np.array_equal(
+        window_index.window_spect_ids(), [spect_id for spect_id, _ in expected]
+    )
+    assert window_index.n_timebins.sum() == sum(n_timebins)
+    assert window_index.spect_ids.dtype == np.int32
+
+
+def test_lookup_out_of_range():
+    window_index = vak.datasets.WindowIndex.from_n_timebins([10, 20], 5)
+    with pytest.raises(IndexError):
+        window_index.lookup(len(window_index))
+
+
+def test_valid_mask_round_trip():
+    rng = np.random.default_rng(42)
+    n_timebins = np.array([15, 7, 30, 1])
+    spect_offsets = np.concatenate(([0], np.cumsum(n_timebins)[:-1]))
+    valid = rng.random(n_timebins.sum()) > 0.3
+    window_index = vak.datasets.WindowIndex.from_valid_mask(
+        valid, spect_offsets, n_timebins
+    )
+    assert np.array_equal(window_index.valid_mask(spect_offsets), valid)
+    assert len(window_index) == valid.sum()
+    # windows are in order of position, and records never span two spectrograms
+    spect_ids, starts = window_index.lookup(np.arange(len(window_index)))
+    assert np.array_equal(spect_offsets[spect_ids] + starts, np.flatnonzero(valid))
+    assert np.all(starts < n_timebins[spect_ids])
+
+
+def test_save_load(tmp_path):
+    window_index = vak.datasets.WindowIndex.from_n_timebins([10, 20, 30], 5)
+    path = tmp_path / vak.datasets.WindowIndex.FILENAME
+    window_index.save(path)
+    loaded = vak.datasets.WindowIndex.load(path)
+    for attr in ("spect_ids", "starts", "n_windows", "n_timebins"):
+        assert np.array_equal(getattr(loaded, attr), getattr(window_index, attr))
+    assert len(loaded) == len(window_index)
+
+
+@pytest.mark.parametrize(
+    "crop_dur, reverse",
+    [
+        (50, False),  # crop from end
+        (50, True),  # crop from front
+        (60, False),  # no crop
+    ],
+)
+def test_crop_keeps_classes(crop_dur, reverse):
+    labelmap = {"unlabeled": 0, "a": 1, "b": 2}
+    n_timebins = np.array([20, 20, 20])
+    lbl_tb = np.zeros(n_timebins.sum(), dtype=int)
+    lbl_tb[2:5] = 1
+    lbl_tb[45:50] = 2
+    if reverse:
+        lbl_tb = lbl_tb[::-1]
+    window_size = 5
+    window_index = vak.datasets.WindowIndex.from_n_timebins(n_timebins, window_size)
+    cropped = vak.datasets.WindowDataset.crop_spect_vectors_keep_classes(
+        lbl_tb, window_index, crop_dur, 1.0, labelmap, window_size
+    )
+    assert cropped.n_timebins.sum() == crop_dur
+    spect_ids, starts = cropped.lookup(np.arange(len(cropped)))
+    # all windows fit inside their spectrogram
+    assert np.all(starts + window_size <= n_timebins[spect_ids])
+    # and windows still contain all classes
+    window_lbl_inds = (spect_ids * 20 + starts)[:, np.newaxis] + np.arange(window_size)
+    assert np.array_equal(np.unique(lbl_tb[window_lbl_inds]), [0, 1, 2])
@@ -0,0 +1,65 @@
+import pytest
+import torch
+
+import vak.engine
+
+from ..fixtures.model import TEENYTWEETYNET_INPUT_SHAPE as INPUT_SHAPE
+
+
+@pytest.fixture
+def models_map(teenytweetynet_model_factory):
+    models_map = {}
+    for ind in range(2):
+        model = teenytweetynet_model_factory(seed=ind)
+        models_map[f"TeenyTweetyNet_ckpt{ind}"] = model
+    return models_map
+
+
+@pytest.mark.parametrize("max_windows", [None, 2])
+def test_iter_predict(models_map, max_windows):
+    items = [
+        {
+            "source": torch.rand(n_windows, *INPUT_SHAPE),
+            "spect_path": f"spect{ind}.npz",
+        }
+        for ind, n_windows in enumerate((3, 1, 5))
+    ]
+    pred_data = torch.utils.data.DataLoader(items, batch_size=1, shuffle=False)
+
+    expected = {
+        name: [y_pred for _, y_pred in model.iter_predict(pred_data, device="cpu")]
+        for name, model in models_map.items()
+    }
+
+    results = list(
+        vak.engine.ensemble.iter_predict(
+            models_map,
+            pred_data,
+            device="cpu",
+            max_windows=max_windows,
+            average_logits=True,
+        )
+    )
+    assert len(results) == len(items)
+    for ind, (batch, outputs) in enumerate(results):
+        assert batch["spect_path"] == [items[ind]["spect_path"]]
+        assert set(outputs.keys()) == set(models_map.keys()) | {
+            vak.engine.ensemble.ENSEMBLE_NAME
+        }
+        for name in models_map:
+            assert torch.allclose(outputs[name], expected[name][ind])
+        expected_mean = torch.mean(
+            torch.stack([expected[name][ind] for name in models_map]), dim=0
+        )
+        assert torch.allclose(outputs[vak.engine.ensemble.ENSEMBLE_NAME], expected_mean)
+
+
+def test_iter_predict_grad_enabled_between_items(models_map):
+    items = [{"source": torch.rand(2, *INPUT_SHAPE), "spect_path": "spect.npz"}] * 3
+    pred_data = torch.utils.data.DataLoader(items, batch_size=1, shuffle=False)
+    for _, outputs in vak.engine.ensemble.iter_predict(
+        models_map, pred_data, device="cpu", average_logits=True
+    ):
+        # no_grad only applies while outputs are computed, not in the caller
+        assert torch.is_grad_enabled()
+        assert all(not out.requires_grad for out in outputs.values())
@@ -0,0 +1,366 @@
+import os
+
+import pytest
+import torch
+
+import vak.constants
+
+from ..fixtures.model import (
+    TEENYTWEETYNET_INPUT_SHAPE as INPUT_SHAPE,
+    TEENYTWEETYNET_NUM_CLASSES as NUM_CLASSES,
+)
+
+
+def test_compile_network_script(teenytweetynet_model):
+    teenytweetynet_model._compile_network("script")
+    assert teenytweetynet_model.compile == "script"
+    assert isinstance(teenytweetynet_model._compiled_network, torch.jit.ScriptModule)
+
+    x = torch.rand(4, *INPUT_SHAPE)
+    teenytweetynet_model._network_train(False)
+    assert not teenytweetynet_model._compiled_network.training
+    with torch.no_grad():
+        out = teenytweetynet_model._network_forward(x)
+        expected = teenytweetynet_model.network(x)
+    assert torch.allclose(out, expected)
+
+    # compiling again with the same mode re-uses the compiled network
+    compiled_network = teenytweetynet_model._compiled_network
+    teenytweetynet_model._compile_network("script")
+    assert teenytweetynet_model._compiled_network is compiled_network
+
+
+def test_compile_network_script_cache(
+    teenytweetynet_model, teenytweetynet_model_factory, monkeypatch, tmp_path
+):
+    ckpt_path = tmp_path / "checkpoint.pt"
+    teenytweetynet_model.save(ckpt_path)
+    x = torch.rand(4, *INPUT_SHAPE)
+    with torch.no_grad():
+        expected = teenytweetynet_model.network.eval()(x)
+
+    model = teenytweetynet_model_factory()
+    model.load(ckpt_path, device="cpu")
+    model._compile_network("script")
+    script_path = tmp_path.joinpath(
+        vak.constants.COMPILE_CACHE_DIRNAME,
+        "checkpoint" + vak.constants.COMPILE_SCRIPT_SUFFIX,
+    )
+    assert script_path.exists()
+
+    # later runs with the same checkpoint load the compiled network instead
+    def raise_error(network):
+        raise RuntimeError("should not compile again")
+
+    monkeypatch.setattr(torch.jit, "script", raise_error)
+    model = teenytweetynet_model_factory()
+    model.load(ckpt_path, device="cpu")
+    model._compile_network("script")
+    assert isinstance(model._compiled_network, torch.jit.ScriptModule)
+    model._network_train(False)
+    with torch.no_grad():
+        out = model._network_forward(x)
+    assert torch.allclose(out, expected)
+
+    # compiled again if checkpoint changed after compiled network was saved
+    stat = script_path.stat()
+    os.utime(ckpt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    model = teenytweetynet_model_factory()
+    model.load(ckpt_path, device="cpu")
+    model._compile_network("script")
+    assert model._compiled_network is None
+
+
+def test_compile_network_script_not_cached_when_training(
+    teenytweetynet_model, tmp_path
+):
+    ckpt_path = tmp_path / "checkpoint.pt"
+    teenytweetynet_model.save(ckpt_path)
+    teenytweetynet_model.load(ckpt_path, device="cpu")
+    teenytweetynet_model._compile_network("script")
+
+    items = [
+        (torch.rand(*INPUT_SHAPE), torch.randint(NUM_CLASSES, (INPUT_SHAPE[-1],)))
+        for _ in range(2)
+    ]
+    ckpt_root = tmp_path / "results"
+    ckpt_root.mkdir()
+    teenytweetynet_model.fit(
+        torch.utils.data.DataLoader(items, batch_size=2),
+        num_epochs=1,
+        ckpt_root=ckpt_root,
+        ckpt_step=100,
+        device="cpu",
+        compile="script",
+    )
+    # network that is trained is scripted again, so it shares its parameters
+    assert not ckpt_root.joinpath(vak.constants.COMPILE_CACHE_DIRNAME).exists()
+    compiled_params = list(teenytweetynet_model._compiled_network.parameters())
+    for param, compiled_param in zip(
+        teenytweetynet_model.network.parameters(), compiled_params
+    ):
+        assert param is compiled_param
+
+
+def test_compile_network_none(teenytweetynet_model):
+    teenytweetynet_model._compile_network("script")
+    teenytweetynet_model._compile_network(None)
+    assert teenytweetynet_model.compile is None
+    assert teenytweetynet_model._compiled_network is None
+
+
+def test_compile_network_invalid_mode_raises(teenytweetynet_model):
+    with pytest.raises(ValueError):
+        teenytweetynet_model._compile_network("trace")
+
+
+def test_compile_network_falls_back_to_eager(teenytweetynet_model, monkeypatch):
+    def raise_error(network):
+        raise RuntimeError("can't compile")
+
+    monkeypatch.setattr(torch.jit, "script", raise_error)
+    teenytweetynet_model._compile_network("script")
+    assert teenytweetynet_model._compiled_network is None
+
+    x = torch.rand(2, *INPUT_SHAPE)
+    with torch.no_grad():
+        out = teenytweetynet_model._network_forward(x)
+    assert out.shape == (2, NUM_CLASSES, INPUT_SHAPE[-1])
+
+
+def test_network_forward_falls_back_to_eager(teenytweetynet_model):
+    def raise_error(x):
+        raise RuntimeError("compiled network failed")
+
+    teenytweetynet_model._compiled_network = raise_error
+    x = torch.rand(2, *INPUT_SHAPE)
+    with torch.no_grad():
+        out = teenytweetynet_model._network_forward(x)
+    assert out.shape == (2, NUM_CLASSES, INPUT_SHAPE[-1])
+    assert teenytweetynet_model._compiled_network is None
+
+
+@pytest.mark.parametrize("amp", ["bfloat16", "float16"])
+def test_network_forward_amp(teenytweetynet_model, amp):
+    teenytweetynet_model._set_amp(amp)
+    assert teenytweetynet_model.amp == amp
+
+    x = torch.rand(4, *INPUT_SHAPE)
+    teenytweetynet_model._network_train(False)
+    with torch.no_grad():
+        out = teenytweetynet_model._network_forward(x)
+        expected = teenytweetynet_model.network(x)
+    # outputs are converted back to float32
+    assert out.dtype == torch.float32
+    assert torch.allclose(out, expected, atol=0.05)
+
+
+def test_set_amp_invalid_dtype_raises(teenytweetynet_model):
+    with pytest.raises(ValueError):
+        teenytweetynet_model._set_amp("float64")
+
+
+def test_set_amp_without_autocast_raises(teenytweetynet_model, monkeypatch):
+    monkeypatch.delattr(torch, "autocast")
+    with pytest.raises(ValueError):
+        teenytweetynet_model._set_amp("bfloat16")
+
+
+def test_make_grad_scaler_without_amp_grad_scaler(teenytweetynet_model, monkeypatch):
+    # torch.amp.GradScaler was added in torch 2.3
+    monkeypatch.delattr(torch.amp, "GradScaler")
+    teenytweetynet_model.device = "cuda"
+    grad_scaler = teenytweetynet_model._make_grad_scaler()
+    assert isinstance(grad_scaler, torch.cuda.amp.GradScaler)
+
+    teenytweetynet_model.device = "cpu"
+    with pytest.raises(ValueError):
+        teenytweetynet_model._make_grad_scaler()
+
+
+@pytest.mark.parametrize("amp", [None, "bfloat16", "float16"])
+def test_fit_amp(teenytweetynet_model, amp, tmp_path):
+    items = [
+        (torch.rand(*INPUT_SHAPE), torch.randint(NUM_CLASSES, (INPUT_SHAPE[-1],)))
+        for _ in range(4)
+    ]
+    train_data = torch.utils.data.DataLoader(items, batch_size=2)
+    params_before = [
+        param.clone() for param in teenytweetynet_model.network.parameters()
+    ]
+
+    teenytweetynet_model.fit(
+        train_data,
+        num_epochs=1,
+        ckpt_root=tmp_path,
+        ckpt_step=100,
+        device="cpu",
+        amp=amp,
+    )
+    assert teenytweetynet_model.amp == amp
+    if amp == "float16":
+        assert teenytweetynet_model._grad_scaler is not None
+    else:
+        assert teenytweetynet_model._grad_scaler is None
+    # parameters are still float32, and were updated
+    params_after = list(teenytweetynet_model.network.parameters())
+    assert all(param.dtype == torch.float32 for param in params_after)
+    assert any(
+        not torch.equal(before, after)
+        for before, after in zip(params_before, params_after)
+    )
+
+
+def test_iter_predict_grad_enabled_between_items(teenytweetynet_model):
+    items = [{"source": torch.rand(2, *INPUT_SHAPE), "spect_path": "spect.npz"}] * 3
+    pred_data = torch.utils.data.DataLoader(items, batch_size=1, shuffle=False)
+    for _, y_pred in teenytweetynet_model.iter_predict(pred_data, device="cpu"):
+        # no_grad only applies while outputs are computed, not in the caller
+        assert torch.is_grad_enabled()
+        assert not y_pred.requires_grad
+
+
+class ScalarRecorder:
+    """records calls to add_scalar, like a ``SummaryWriter``"""
+
+    def __init__(self):
+        self.scalars = []
+
+    def add_scalar(self, tag, value, step):
+        self.scalars.append((tag, value, step))
+
+
+@pytest.mark.parametrize("log_step", [None, 1, 3, 10])
+def test_fit_log_step(teenytweetynet_model, log_step, tmp_path):
+    items = [
+        (torch.rand(*INPUT_SHAPE), torch.randint(NUM_CLASSES, (INPUT_SHAPE[-1],)))
+        for _ in range(8)
+    ]
+    train_data = torch.utils.data.DataLoader(items, batch_size=2)
+    teenytweetynet_model.summary_writer = ScalarRecorder()
+
+    teenytweetynet_model.fit(
+        train_data,
+        num_epochs=2,
+        ckpt_root=tmp_path,
+        ckpt_step=100,
+        device="cpu",
+        log_step=log_step,
+    )
+    # loss from every step is written, even when steps are logged together
+    scalars = teenytweetynet_model.summary_writer.scalars
+    assert [step for _, _, step in scalars] == list(range(8))
+    assert all(tag == "loss/train" for tag, _, _ in scalars)
+    assert all(isinstance(value, float) for _, value, _ in scalars)
+
+
+class ValDataset(torch.utils.data.Dataset):
+    """windows and labeled time bins from several files, like a ``VocalDataset``"""
+
+    labelmap = {"unlabeled": 0, "a": 1, "b": 2}
+
+    def __init__(self, n_windows_per_file):
+        self.items = [
+            {
+                "source": torch.rand(n_windows, *INPUT_SHAPE),
+                "annot": torch.randint(NUM_CLASSES, (n_windows * INPUT_SHAPE[-1],)),
+            }
+            for n_windows in n_windows_per_file
+        ]
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __len__(self):
+        return len(self.items)
+
+
+def test_fit_async_validation(teenytweetynet_model_factory, tmp_path):
+    torch.manual_seed(42)
+    items = [
+        (torch.rand(*INPUT_SHAPE), torch.randint(NUM_CLASSES, (INPUT_SHAPE[-1],)))
+        for _ in range(8)
+    ]
+    train_data = torch.utils.data.DataLoader(items, batch_size=2)
+    val_data = torch.utils.data.DataLoader(ValDataset((2, 3)), batch_size=1)
+
+    scalars = {}
+    networks = {}
+    for async_validation in (False, True):
+        model = teenytweetynet_model_factory(seed=42)
+        model.summary_writer = ScalarRecorder()
+        ckpt_root = tmp_path / f"async_{async_validation}"
+        ckpt_root.mkdir()
+        model.fit(
+            train_data,
+            num_epochs=2,
+            ckpt_root=ckpt_root,
+            val_data=val_data,
+            val_step=3,
+            ckpt_step=100,
+            device="cpu",
+            async_validation=async_validation,
+        )
+        assert model._val_future is None
+        assert model._val_executor is None
+        assert ckpt_root.joinpath("max-val-acc-checkpoint.pt").exists()
+        scalars[async_validation] = [
+            scalar
+            for scalar in model.summary_writer.scalars
+            if scalar[0] != "loss/train"
+        ]
+        networks[async_validation] = model.network
+
+    # metrics are computed for snapshots taken on the same steps as inline validation,
+    # and validating in the background does not change training
+    assert [step for _, _, step in scalars[False]] == [3] * 4 + [6] * 4
+    assert [step for _, _, step in scalars[True]] == [3] * 4 + [6] * 4
+    for (tag, value, _), (expected_tag, expected_value, _) in zip(
+        scalars[True], scalars[False]
+    ):
+        assert tag == expected_tag
+        assert value == pytest.approx(expected_value)
+    for param, expected_param in zip(
+        networks[True].parameters(), networks[False].parameters()
+    ):
+        assert torch.equal(param, expected_param)
+    # max-val-acc checkpoint is saved from the snapshot that was validated
+    ckpts = [
+        torch.load(tmp_path / f"async_{async_validation}" / "max-val-acc-checkpoint.pt")
+        for async_validation in (False, True)
+    ]
+    assert ckpts[0]["global_step"] == ckpts[1]["global_step"]
+    for key, tensor in ckpts[0]["network_state_dict"].items():
+        assert torch.equal(ckpts[1]["network_state_dict"][key], tensor)
+
+
+def test_compile_cache_restores_environ(teenytweetynet_model, monkeypatch, tmp_path):
+    monkeypatch.delenv("TORCHINDUCTOR_CACHE_DIR", raising=False)
+    teenytweetynet_model.compile = "compile"
+    teenytweetynet_model.compile_cache_dir = tmp_path / "compile_cache"
+    with teenytweetynet_model._compile_cache():
+        assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "compile_cache")
+    # not left set for other models, e.g. later replicates in a learning curve
+    assert "TORCHINDUCTOR_CACHE_DIR" not in os.environ
+
+    monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", str(tmp_path / "previous"))
+    with teenytweetynet_model._compile_cache():
+        assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "compile_cache")
+    assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "previous")
+
+    teenytweetynet_model.compile = "script"
+    with teenytweetynet_model._compile_cache():
+        assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "previous")
+
+
+def test_prepare_inference(teenytweetynet_model):
+    teenytweetynet_model.network.train(True)
+    teenytweetynet_model.prepare_inference(
+        device="cpu", max_windows=2, compile="script", amp="bfloat16"
+    )
+    assert teenytweetynet_model.device == "cpu"
+    assert teenytweetynet_model.max_windows == 2
+    assert teenytweetynet_model.compile == "script"
+    assert teenytweetynet_model.amp == "bfloat16"
+    assert not teenytweetynet_model.network.training
+    assert not teenytweetynet_model._compiled_network.training
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+import torch
+
+import vak.engine
+
+from ..fixtures.model import TEENYTWEETYNET_INPUT_SHAPE as INPUT_SHAPE
+
+
+def test_quantize_dynamic(teenytweetynet_model):
+    quantized_model = vak.engine.quantize.quantize(teenytweetynet_model, "dynamic")
+    assert quantized_model is not teenytweetynet_model
+    # network of original model is not changed
+    assert isinstance(teenytweetynet_model.network.rnn, torch.nn.LSTM)
+    assert not isinstance(quantized_model.network.rnn, torch.nn.LSTM)
+    assert not isinstance(quantized_model.network.fc, torch.nn.Linear)
+
+    x = torch.rand(4, *INPUT_SHAPE)
+    with torch.no_grad():
+        out = quantized_model.network(x)
+    assert out.shape == teenytweetynet_model.network(x).shape
+
+
+def test_quantize_dynamic_does_not_move_network(teenytweetynet_model, monkeypatch):
+    moved = []
+    module_to = torch.nn.Module.to
+
+    def record_to(self, *args, **kwargs):
+        moved.append(self)
+        return module_to(self, *args, **kwargs)
+
+    monkeypatch.setattr(torch.nn.Module, "to", record_to)
+    params_before = [
+        param.clone() for param in teenytweetynet_model.network.parameters()
+    ]
+    quantized_model = vak.engine.quantize.quantize(teenytweetynet_model, "dynamic")
+    # only the copy of the network is moved to the CPU, a network on a GPU stays there
+    assert all(module is not teenytweetynet_model.network for module in moved)
+    assert quantized_model.network is not teenytweetynet_model.network
+    for before, after in zip(params_before, teenytweetynet_model.network.parameters()):
+        assert torch.equal(before, after)
+
+
+def test_quantize_invalid_mode_raises(teenytweetynet_model):
+    with pytest.raises(ValueError):
+        vak.engine.quantize.quantize(teenytweetynet_model, "static")
+
+
+@pytest.mark.parametrize("max_files", [1, 2, 10])
+def test_frame_agreement(teenytweetynet_model, max_files):
+    items = [
+        {
+            "source": torch.rand(n_windows, *INPUT_SHAPE),
+            "padding_mask": torch.arange(n_windows * INPUT_SHAPE[-1]) < 20,
+        }
+        for n_windows in (3, 2, 4)
+    ]
+    pred_data = torch.utils.data.DataLoader(items, batch_size=1, shuffle=False)
+
+    agreement, n_files = vak.engine.quantize.frame_agreement(
+        teenytweetynet_model, teenytweetynet_model, pred_data, max_files=max_files
+    )
+    assert agreement == 1.0
+    assert n_files == min(max_files, len(items))
+
+    quantized_model = vak.engine.quantize.quantize(teenytweetynet_model, "dynamic")
+    agreement, _ = vak.engine.quantize.frame_agreement(
+        teenytweetynet_model, quantized_model, pred_data, max_files=max_files
+    )
+    assert 0.0 <= agreement <= 1.0
+
+
+def test_frame_agreement_no_frames(teenytweetynet_model):
+    quantized_model = vak.engine.quantize.quantize(teenytweetynet_model, "dynamic")
+    pred_data = torch.utils.data.DataLoader([], batch_size=1)
+    agreement, n_files = vak.engine.quantize.frame_agreement(
+        teenytweetynet_model, quantized_model, pred_data
+    )
+    assert math.isnan(agreement)
+    assert n_files == 0
+
+    # files where every frame is padding
+    items = [
+        {
+            "source": torch.rand(2, *INPUT_SHAPE),
+            "padding_mask": torch.zeros(2 * INPUT_SHAPE[-1], dtype=torch.bool),
+        }
+    ]
+    pred_data = torch.utils.data.DataLoader(items, batch_size=1)
+    agreement, n_files = vak.engine.quantize.frame_agreement(
+        teenytweetynet_model, quantized_model, pred_data
+    )
+    assert math.isnan(agreement)
+    assert n_files == 1
@@ -1,8 +1,10 @@
 """tests for ``vak.io.audio`` module"""
 from pathlib import Path
 
+import evfuncs
 import numpy as np
 import pytest
+import soundfile
 
 import vak.io.audio
 
@@ -392,3 +394,51 @@ def test_both_annot_list_and_audio_annot_map_raises(
             audio_annot_map=audio_annot_map,
             labelset=labelset_notmat,
         )
+
+
+@pytest.mark.parametrize("block_size", [1000, 32000])
+def test_to_spect_block_size(default_spect_params, tmp_path, block_size):
+    """test that ``vak.io.audio.to_spect`` makes the same spectrograms
+    when it reads audio files in blocks"""
+    rng = np.random.default_rng(42)
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for ind in range(2):
+        soundfile.write(
+            audio_dir / f"{ind}.wav", 0.1 * rng.standard_normal(48000 + ind), 32000
+        )
+
+    spect_files = {}
+    for spect_block_size in (None, block_size):
+        output_dir = tmp_path / f"block_size_{spect_block_size}"
+        output_dir.mkdir()
+        spect_files[spect_block_size] = vak.io.audio.to_spect(
+            audio_format="wav",
+            spect_params={**default_spect_params, "block_size": spect_block_size},
+            output_dir=output_dir,
+            audio_dir=audio_dir,
+        )
+        # temporary files that spectrograms are written to are removed
+        assert sorted(output_dir.iterdir()) == [
+            Path(spect_file) for spect_file in spect_files[spect_block_size]
+        ]
+
+    for spect_file, expected_spect_file in zip(
+        spect_files[block_size], spect_files[None]
+    ):
+        spect_dict = np.load(spect_file)
+        expected_spect_dict = np.load(expected_spect_file)
+        for key in ["s", "f", "t", "audio_path"]:
+            assert np.array_equal(spect_dict[key], expected_spect_dict[key])
+
+
+def test_audio_blocks_cbin(audio_list_cbin):
+    blocks, n_samples, samp_freq = vak.io.audio.audio_blocks(
+        audio_list_cbin[0], "cbin", 10000
+    )
+    expected, expected_samp_freq = evfuncs.load_cbin(audio_list_cbin[0])
+    dat = np.concatenate(list(blocks))
+    assert np.array_equal(dat, expected)
+    assert dat.dtype == expected.dtype
+    assert n_samples == expected.shape[0]
+    assert samp_freq == expected_samp_freq
@@ -1,7 +1,9 @@
 """tests for vak.io.dataframe module"""
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 
 import vak.annotation
 import vak.constants
@@ -333,3 +335,44 @@ def test_add_split_col(audio_dir_cbin, default_spect_params, labelset_notmat, tm
     assert "split" in vak_df.columns
 
     assert vak_df["split"].unique().item() == "train"
+
+
+def test_has_spect_metadata():
+    vak_df = pd.DataFrame(
+        {
+            "spect_path": ["a.spect.npz", "b.spect.npz"],
+            "n_timebins": [100, 200],
+            "n_freqbins": [257, 257],
+            "dtype": ["float32", "float32"],
+            "t0": [0.001, 0.002],
+            "t_step": [0.002, 0.002],
+        }
+    )
+    assert vak.io.dataframe.has_spect_metadata(vak_df)
+    # datasets prepared with earlier versions do not have metadata columns
+    assert not vak.io.dataframe.has_spect_metadata(
+        vak_df.drop(columns=["n_timebins", "n_freqbins", "dtype"])
+    )
+    assert not vak.io.dataframe.has_spect_metadata(
+        vak_df.drop(columns=["t0", "t_step"])
+    )
+
+
+def test_timebins_from_metadata():
+    vak_df = pd.DataFrame(
+        {
+            "spect_path": ["a.spect.npz", "b.spect.npz"],
+            "n_timebins": [100, 200],
+            "n_freqbins": [257, 257],
+            "dtype": ["float32", "float32"],
+            "t0": [0.001, 0.002],
+            "t_step": [0.002, 0.002],
+        }
+    )
+    timebins = vak.io.dataframe.timebins_from_metadata(vak_df)
+    assert [len(timebins_) for timebins_ in timebins] == [100, 200]
+    np.testing.assert_allclose(timebins[0], 0.001 + np.arange(100) * 0.002)
+    np.testing.assert_allclose(timebins[1], 0.002 + np.arange(200) * 0.002)
+
+    with pytest.raises(ValueError):
+        vak.io.dataframe.timebins_from_metadata(vak_df.drop(columns=["t0"]))
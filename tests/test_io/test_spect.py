@@ -1,9 +1,11 @@
 """tests for ``vak.io.spect`` module"""
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
+import vak.io.dataframe
 import vak.io.spect
 import vak.files.spect
 
@@ -47,6 +49,23 @@ def expected_spect_paths_in_dataframe(
     return True  # all asserts passed
 
 
+def spect_metadata_matches_files(vak_df):
+    """tests that the 'n_timebins', 'n_freqbins', 'dtype', 't0', and 't_step' columns
+    of a dataframe ``vak_df`` match the spectrograms in its ``spect_path`` column.
+    If so, returns True.
+    """
+    timebins_from_metadata = vak.io.dataframe.timebins_from_metadata(vak_df)
+    for (_, row), timebins in zip(vak_df.iterrows(), timebins_from_metadata):
+        spect_dict = vak.files.spect.load(row["spect_path"])
+        spect = spect_dict["s"]
+        assert row["n_freqbins"] == spect.shape[0]
+        assert row["n_timebins"] == spect.shape[-1]
+        assert row["dtype"] == str(spect.dtype)
+        np.testing.assert_allclose(timebins, np.ravel(spect_dict["t"]), atol=1e-9)
+
+    return True  # all asserts passed
+
+
 @pytest.mark.parametrize(
     "spect_format, annot_format",
     [
@@ -85,6 +104,7 @@ def test_to_dataframe_spect_dir(
     assert expected_spect_paths_in_dataframe(
         vak_df, spect_list_all_labels_in_labelset, spect_list_labels_not_in_labelset
     )
+    assert spect_metadata_matches_files(vak_df)
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,133 @@
+"""tests for ``vak.io.spect_cache`` module"""
+import os
+import time
+
+import numpy as np
+import pytest
+import soundfile
+
+import vak.config.spect_params
+import vak.io.audio
+import vak.io.spect_cache
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    rng = np.random.default_rng(42)
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for ind in range(3):
+        soundfile.write(
+            audio_dir / f"{ind}.wav", 0.1 * rng.standard_normal(16000 + ind), 32000
+        )
+    return audio_dir
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    return cache_dir
+
+
+@pytest.mark.parametrize("hash_audio", [False, True])
+def test_key(audio_dir, cache_dir, hash_audio):
+    spect_cache = vak.io.spect_cache.SpectFileCache(cache_dir, hash_audio=hash_audio)
+    spect_params = vak.config.spect_params.SpectParamsConfig()
+    audio_path = audio_dir / "0.wav"
+
+    key = spect_cache.key(audio_path, spect_params)
+    assert key == spect_cache.key(audio_path, spect_params)
+    assert key != spect_cache.key(audio_dir / "1.wav", spect_params)
+    assert key != spect_cache.key(
+        audio_path, vak.config.spect_params.SpectParamsConfig(fft_size=256)
+    )
+
+    # change contents, keeping size and modification time
+    stat = audio_path.stat()
+    dat, samp_freq = soundfile.read(audio_path)
+    soundfile.write(audio_path, -dat, samp_freq)
+    os.utime(audio_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    if hash_audio:
+        assert key != spect_cache.key(audio_path, spect_params)
+    else:
+        assert key == spect_cache.key(audio_path, spect_params)
+
+    # change modification time
+    os.utime(audio_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert key != spect_cache.key(audio_path, spect_params)
+
+
+def test_get_put(tmp_path, cache_dir):
+    spect_cache = vak.io.spect_cache.SpectFileCache(cache_dir)
+    src = tmp_path / "src.spect.npz"
+    np.savez(src, s=np.ones((2, 3)))
+    dst = tmp_path / "dst.spect.npz"
+
+    assert not spect_cache.get("key", dst)
+    assert not dst.exists()
+    spect_cache.put("key", src)
+    assert spect_cache.path("key").exists()
+    # an existing file is replaced, not written through
+    np.savez(dst, s=np.zeros((2, 3)))
+    assert spect_cache.get("key", dst)
+    assert np.array_equal(np.load(dst)["s"], np.ones((2, 3)))
+    # hard-linked, so cached file does not take up space twice
+    assert os.path.samefile(dst, spect_cache.path("key"))
+
+
+def test_evict(tmp_path, cache_dir):
+    now = time.time()
+    sizes = {}
+    for ind in range(4):
+        src = tmp_path / f"{ind}.spect.npz"
+        np.savez(src, s=np.ones((10, 10)))
+        cached_path = cache_dir / f"{ind}.spect.npz"
+        os.link(src, cached_path)
+        # last used 0, 1, 2, and 3 days ago
+        used = now - ind * vak.io.spect_cache.SECONDS_PER_DAY
+        os.utime(cached_path, (used, used))
+        sizes[ind] = cached_path.stat().st_size
+
+    spect_cache = vak.io.spect_cache.SpectFileCache(
+        cache_dir, max_bytes=sizes[0] + sizes[1], max_age_days=2.5
+    )
+    assert spect_cache.evict() == 2
+    # removed because of age, then because of size
+    assert sorted(path.name for path in cache_dir.iterdir()) == [
+        "0.spect.npz",
+        "1.spect.npz",
+    ]
+    # files in datasets are kept
+    assert all((tmp_path / f"{ind}.spect.npz").exists() for ind in range(4))
+
+
+def test_invalid_args_raise(tmp_path, cache_dir):
+    with pytest.raises(NotADirectoryError):
+        vak.io.spect_cache.SpectFileCache(tmp_path / "not_a_dir")
+    with pytest.raises(ValueError):
+        vak.io.spect_cache.SpectFileCache(cache_dir, max_bytes=-1)
+    with pytest.raises(ValueError):
+        vak.io.spect_cache.SpectFileCache(cache_dir, max_age_days=-1)
+
+
+def test_to_spect_spect_cache(default_spect_params, tmp_path, audio_dir, cache_dir):
+    spect_cache = vak.io.spect_cache.SpectFileCache(cache_dir)
+    spect_files = {}
+    for run in ("first", "second"):
+        output_dir = tmp_path / run
+        output_dir.mkdir()
+        spect_files[run] = vak.io.audio.to_spect(
+            audio_format="wav",
+            spect_params=default_spect_params,
+            output_dir=output_dir,
+            audio_dir=audio_dir,
+            spect_cache=spect_cache,
+        )
+    assert len(list(cache_dir.iterdir())) == 3
+
+    for spect_file, expected_spect_file in zip(
+        spect_files["second"], spect_files["first"]
+    ):
+        # file made by first run was linked from cache, instead of made again
+        assert os.path.samefile(spect_file, expected_spect_file)
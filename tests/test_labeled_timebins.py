@@ -27,6 +27,59 @@ def test_has_unlabeled():
     assert has_ is False
 
 
+def _label_timebins_argmin(labels_int, onsets_s, offsets_s, time_bins, unlabeled_label=0):
+    """reference implementation of label_timebins, that finds the nearest time bin
+    to each onset and offset with argmin and labels segments in a loop"""
+    lbl_tb = np.ones((time_bins.shape[-1],), dtype="int8") * unlabeled_label
+    onset_inds = [np.argmin(np.abs(time_bins - onset)) for onset in onsets_s]
+    offset_inds = [np.argmin(np.abs(time_bins - offset)) for offset in offsets_s]
+    for label, onset, offset in zip(labels_int, onset_inds, offset_inds):
+        lbl_tb[onset : offset + 1] = label
+    return lbl_tb
+
+
+@pytest.mark.parametrize(
+    "sort_onsets, shuffle_time_bins",
+    [
+        (True, False),
+        (False, False),
+        (True, True),
+    ],
+)
+def test_label_timebins_matches_argmin(sort_onsets, shuffle_time_bins):
+    rng = np.random.default_rng(42)
+    timebin_dur = 0.002
+    for _ in range(50):
+        time_bins = np.arange(rng.integers(1, 500)) * timebin_dur
+        if shuffle_time_bins:
+            time_bins = rng.permutation(time_bins)
+        n_segments = rng.integers(1, 20)
+        # include onsets exactly halfway between time bins, to test ties
+        onsets_s = np.concatenate(
+            (
+                rng.uniform(-0.1, time_bins.max() + 0.1, n_segments),
+                rng.choice(time_bins, 3) + timebin_dur / 2,
+            )
+        )
+        if sort_onsets:
+            onsets_s = np.sort(onsets_s)
+        # segments can overlap
+        offsets_s = onsets_s + rng.uniform(-timebin_dur, 0.05, onsets_s.shape[-1])
+        labels_int = rng.integers(1, 5, onsets_s.shape[-1]).tolist()
+
+        lbl_tb = vak.labeled_timebins.label_timebins(
+            labels_int, onsets_s, offsets_s, time_bins
+        )
+        expected = _label_timebins_argmin(labels_int, onsets_s, offsets_s, time_bins)
+        assert np.array_equal(lbl_tb, expected)
+        assert lbl_tb.dtype == expected.dtype
+
+        has_ = vak.labeled_timebins.has_unlabeled(
+            labels_int, onsets_s, offsets_s, time_bins
+        )
+        assert has_ is bool(np.any(expected == 0))
+
+
 def test_segment_lbl_tb():
     lbl_tb = np.asarray([0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0])
     labels, onset_inds, offset_inds = vak.labeled_timebins._segment_lbl_tb(lbl_tb)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+import torch
+
+import vak.models
+import vak.onnx
+import vak.transforms
+
+
+N_FREQBINS = 128
+WINDOW_SIZE = 16
+LABELMAP = {"unlabeled": 0, "a": 1, "b": 2}
+
+
+@pytest.fixture
+def network():
+    torch.manual_seed(42)
+    network = vak.models.teenytweetynet.TeenyTweetyNet(
+        num_classes=len(LABELMAP), input_shape=(1, N_FREQBINS, WINDOW_SIZE)
+    )
+    return network.eval()
+
+
+@pytest.fixture
+def spect_standardizer():
+    rng = np.random.default_rng(42)
+    return vak.transforms.StandardizeSpect.fit(rng.random((N_FREQBINS, 100)))
+
+
+def predict_with_torch(network, spect, spect_standardizer):
+    """get outputs of network the way that vak.core.predict does"""
+    item_transform = vak.transforms.get_defaults(
+        "predict",
+        spect_standardizer,
+        window_size=WINDOW_SIZE,
+        return_padding_mask=True,
+    )
+    item = item_transform(spect)
+    with torch.no_grad():
+        y_pred = network(item["source"])
+    return torch.hstack(y_pred.unbind())[:, item["padding_mask"]].numpy()
+
+
+@pytest.mark.parametrize("n_timebins", [2 * WINDOW_SIZE, 3 * WINDOW_SIZE + 5])
+@pytest.mark.parametrize("use_standardizer", [True, False])
+def test_spect_to_logits(network, spect_standardizer, n_timebins, use_standardizer):
+    if not use_standardizer:
+        spect_standardizer = None
+    spect = np.random.default_rng(0).random((N_FREQBINS, n_timebins))
+
+    module = vak.onnx.export.SpectToLogits(network, WINDOW_SIZE, spect_standardizer)
+    with torch.no_grad():
+        logits = module(torch.from_numpy(spect)).numpy()
+
+    expected = predict_with_torch(network, spect, spect_standardizer)
+    assert logits.shape == (len(LABELMAP), n_timebins)
+    np.testing.assert_allclose(logits, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_export_and_predict(network, spect_standardizer, tmp_path):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+
+    onnx_path = tmp_path / "TeenyTweetyNet.onnx"
+    vak.onnx.export.export(
+        network,
+        onnx_path,
+        labelmap=LABELMAP,
+        window_size=WINDOW_SIZE,
+        n_freqbins=N_FREQBINS,
+        spect_standardizer=spect_standardizer,
+    )
+    predictor = vak.onnx.OnnxPredictor(onnx_path)
+    assert predictor.labelmap == LABELMAP
+    assert predictor.window_size == WINDOW_SIZE
+
+    rng = np.random.default_rng(0)
+    # number of time bins, and so number of windows, varies across files
+    for n_timebins in (2 * WINDOW_SIZE, 3 * WINDOW_SIZE + 5, 5 * WINDOW_SIZE + 1):
+        spect = rng.random((N_FREQBINS, n_timebins)).astype(np.float32)
+        logits = predictor(spect)
+        expected = predict_with_torch(network, spect, spect_standardizer)
+        assert logits.shape == (len(LABELMAP), n_timebins)
+        np.testing.assert_allclose(logits, expected, rtol=1e-4, atol=1e-5)
+
+
+def test_constant_freqbin(network, tmp_path):
+    rng = np.random.default_rng(42)
+    mean_freqs = rng.random(N_FREQBINS)
+    std_freqs = rng.random(N_FREQBINS) + 0.1
+    # frequency bins with zero standard deviation are divided by 1, not by 0
+    std_freqs[[0, 10]] = 0.0
+    spect_standardizer = vak.transforms.StandardizeSpect(
+        mean_freqs, std_freqs, non_zero_std=std_freqs != 0
+    )
+    spect = rng.random((N_FREQBINS, 3 * WINDOW_SIZE + 5))
+    expected = predict_with_torch(network, spect, spect_standardizer)
+    assert not np.isnan(expected).any()
+
+    module = vak.onnx.export.SpectToLogits(network, WINDOW_SIZE, spect_standardizer)
+    with torch.no_grad():
+        logits = module(torch.from_numpy(spect)).numpy()
+    np.testing.assert_allclose(logits, expected, rtol=1e-5, atol=1e-6)
+
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    onnx_path = tmp_path / "TeenyTweetyNet.onnx"
+    vak.onnx.export.export(
+        network,
+        onnx_path,
+        labelmap=LABELMAP,
+        window_size=WINDOW_SIZE,
+        n_freqbins=N_FREQBINS,
+        spect_standardizer=spect_standardizer,
+    )
+    logits = vak.onnx.OnnxPredictor(onnx_path)(spect)
+    np.testing.assert_allclose(logits, expected, rtol=1e-4, atol=1e-5)
@@ -0,0 +1,40 @@
+import operator
+import sys
+
+import dask
+import pytest
+
+import vak.parallel
+
+
+@pytest.mark.parametrize(
+    "scheduler, num_workers",
+    [
+        (None, None),
+        ("threads", 2),
+        ("processes", 2),
+    ],
+)
+@pytest.mark.parametrize("partition_size", [None, 1, 3])
+def test_bag_map(scheduler, num_workers, partition_size):
+    seq = list(range(10))
+    with vak.parallel.dask_scheduler(scheduler, num_workers):
+        if scheduler is not None:
+            assert dask.config.get("scheduler") == scheduler
+        assert dask.config.get("num_workers") == num_workers
+        results = vak.parallel.bag_map(operator.neg, seq, partition_size=partition_size)
+    assert results == [-element for element in seq]
+
+
+def test_dask_scheduler_invalid_scheduler_raises():
+    with pytest.raises(ValueError):
+        with vak.parallel.dask_scheduler("gpu"):
+            pass
+
+
+def test_dask_scheduler_distributed_not_installed_raises(monkeypatch):
+    # setting a module to None in sys.modules makes importing it raise ImportError
+    monkeypatch.setitem(sys.modules, "dask.distributed", None)
+    with pytest.raises(ImportError):
+        with vak.parallel.dask_scheduler("distributed"):
+            pass
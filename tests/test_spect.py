@@ -0,0 +1,201 @@
+from matplotlib.mlab import specgram
+import numpy as np
+import pytest
+
+import vak.spect
+
+
+SAMP_FREQ = 32000
+
+
+@pytest.fixture
+def audio():
+    rng = np.random.default_rng(42)
+    n_samples = SAMP_FREQ // 2
+    return 0.1 * rng.standard_normal(n_samples) + np.sin(np.arange(n_samples) * 0.3)
+
+
+@pytest.mark.parametrize(
+    "n_samples, fft_size, step_size",
+    [
+        (None, 512, 64),
+        (None, 511, 33),
+        (100, 512, 64),
+    ],
+)
+def test_stft_power_matches_specgram(audio, n_samples, fft_size, step_size):
+    if n_samples is not None:
+        audio = audio[:n_samples]
+    expected, expected_freqbins, expected_timebins = specgram(
+        audio, fft_size, SAMP_FREQ, noverlap=fft_size - step_size
+    )[:3]
+    power, freqbins, timebins = vak.spect.stft_power(
+        audio, SAMP_FREQ, fft_size, step_size, dtype=np.float64
+    )
+    assert np.allclose(power.T, expected, rtol=1e-9, atol=0)
+    assert np.array_equal(freqbins, expected_freqbins)
+    assert np.allclose(timebins, expected_timebins)
+
+
+def legacy_spectrogram(
+    dat,
+    samp_freq,
+    fft_size=512,
+    step_size=64,
+    thresh=None,
+    transform_type=None,
+    freq_cutoffs=None,
+):
+    """spectrogram made with matplotlib.mlab.specgram, as before vak.spect.stft_power"""
+    if freq_cutoffs:
+        dat = vak.spect.butter_bandpass_filter(
+            dat, freq_cutoffs[0], freq_cutoffs[1], samp_freq
+        )
+    spect, freqbins, timebins = specgram(
+        dat, fft_size, samp_freq, noverlap=fft_size - step_size
+    )[:3]
+    if transform_type == "log_spect":
+        spect /= spect.max()
+        spect = np.log10(spect)
+        if thresh:
+            spect[spect < -thresh] = -thresh
+    elif transform_type == "log_spect_plus_one":
+        spect = np.log10(spect + 1)
+        if thresh:
+            spect[spect < thresh] = thresh
+    elif thresh:
+        spect[spect < thresh] = thresh
+    if freq_cutoffs:
+        f_inds = np.nonzero(
+            (freqbins >= freq_cutoffs[0]) & (freqbins < freq_cutoffs[1])
+        )[0]
+        spect = spect[f_inds, :]
+        freqbins = freqbins[f_inds]
+    return spect, freqbins, timebins
+
+
+@pytest.mark.parametrize(
+    "thresh, transform_type, freq_cutoffs",
+    [
+        (None, None, None),
+        (6.25, "log_spect", [500, 10000]),
+        (0.0001, "log_spect_plus_one", None),
+        (1e-9, None, [500, 10000]),
+    ],
+)
+@pytest.mark.parametrize(
+    "dtype, atol",
+    [
+        (np.float32, 1e-3),
+        (np.float64, 1e-9),
+    ],
+)
+def test_spectrogram(audio, thresh, transform_type, freq_cutoffs, dtype, atol):
+    expected, expected_freqbins, expected_timebins = legacy_spectrogram(
+        audio,
+        SAMP_FREQ,
+        thresh=thresh,
+        transform_type=transform_type,
+        freq_cutoffs=freq_cutoffs,
+    )
+    spect, freqbins, timebins = vak.spect.spectrogram(
+        audio,
+        SAMP_FREQ,
+        thresh=thresh,
+        transform_type=transform_type,
+        freq_cutoffs=freq_cutoffs,
+        dtype=dtype,
+    )
+    assert spect.dtype == dtype
+    assert spect.flags["C_CONTIGUOUS"]
+    assert spect.shape == expected.shape
+    if transform_type is None:
+        # compare power relative to largest value
+        assert np.allclose(spect / expected.max(), expected / expected.max(), atol=atol)
+    else:
+        assert np.allclose(spect, expected, atol=atol)
+    assert np.array_equal(freqbins, expected_freqbins)
+    assert np.allclose(timebins, expected_timebins)
+
+
+def test_spectrogram_several_signals(audio):
+    dat = np.stack([audio, audio[::-1], 2 * audio])
+    spects, freqbins, timebins = vak.spect.spectrogram(
+        dat,
+        SAMP_FREQ,
+        thresh=6.25,
+        transform_type="log_spect",
+        freq_cutoffs=[500, 10000],
+    )
+    assert spects.shape[0] == 3
+    for signal, spect in zip(dat, spects):
+        expected, _, _ = vak.spect.spectrogram(
+            signal,
+            SAMP_FREQ,
+            thresh=6.25,
+            transform_type="log_spect",
+            freq_cutoffs=[500, 10000],
+        )
+        assert np.allclose(spect, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "thresh, transform_type, freq_cutoffs",
+    [
+        (None, None, None),
+        (6.25, "log_spect", [500, 10000]),
+        (0.0001, "log_spect_plus_one", None),
+        (1e-9, None, [500, 10000]),
+    ],
+)
+@pytest.mark.parametrize("block_size", [100, 4096, 10007, SAMP_FREQ])
+def test_spectrogram_blocks(audio, thresh, transform_type, freq_cutoffs, block_size):
+    expected, expected_freqbins, expected_timebins = vak.spect.spectrogram(
+        audio,
+        SAMP_FREQ,
+        thresh=thresh,
+        transform_type=transform_type,
+        freq_cutoffs=freq_cutoffs,
+    )
+    blocks = (
+        audio[start : start + block_size]
+        for start in range(0, audio.shape[0], block_size)
+    )
+    spect, freqbins, timebins = vak.spect.spectrogram_blocks(
+        blocks,
+        audio.shape[0],
+        SAMP_FREQ,
+        thresh=thresh,
+        transform_type=transform_type,
+        freq_cutoffs=freq_cutoffs,
+    )
+    assert spect.flags["C_CONTIGUOUS"]
+    assert np.array_equal(spect, expected)
+    assert np.array_equal(freqbins, expected_freqbins)
+    assert np.array_equal(timebins, expected_timebins)
+
+
+def test_spectrogram_blocks_shorter_than_fft_size(audio):
+    audio = audio[:300]
+    expected, _, expected_timebins = vak.spect.spectrogram(
+        audio, SAMP_FREQ, thresh=6.25, transform_type="log_spect"
+    )
+    out = np.empty_like(expected)
+    blocks = (audio[start : start + 128] for start in range(0, 300, 128))
+    spect, _, timebins = vak.spect.spectrogram_blocks(
+        blocks, 300, SAMP_FREQ, thresh=6.25, transform_type="log_spect", out=out
+    )
+    assert spect is out
+    assert np.array_equal(spect, expected)
+    assert np.array_equal(timebins, expected_timebins)
+
+
+def test_spectrogram_blocks_wrong_n_samples_raises(audio):
+    with pytest.raises(ValueError):
+        vak.spect.spectrogram_blocks([audio], audio.shape[0] + 1000, SAMP_FREQ)
+    with pytest.raises(ValueError):
+        vak.spect.spectrogram_blocks([audio], audio.shape[0] - 1000, SAMP_FREQ)
+    with pytest.raises(ValueError):
+        vak.spect.spectrogram_blocks(
+            [audio], audio.shape[0], SAMP_FREQ, out=np.empty((257, 10))
+        )
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import vak.transforms
+
+
+@pytest.fixture
+def spect_df(tmp_path):
+    rng = np.random.default_rng(42)
+    records = []
+    for ind, (n_timebins, split) in enumerate(
+        ((30, "train"), (45, "train"), (1, "train"), (20, "val"))
+    ):
+        spect_path = tmp_path.joinpath(f"spect{ind}.spect.npz")
+        # give each file a different mean and variance, so that averaging
+        # statistics across files would not give the pooled statistics
+        spect = rng.normal(loc=ind, scale=ind + 1, size=(16, n_timebins))
+        np.savez(spect_path, s=spect, t=np.arange(n_timebins) * 0.001)
+        records.append((str(spect_path), split, spect))
+    return pd.DataFrame.from_records(
+        [record[:2] for record in records], columns=["spect_path", "split"]
+    ), [record[2] for record in records]
+
+
+@pytest.mark.parametrize("split", [None, "train", "val"])
+def test_standardize_spect_fit_df(spect_df, split):
+    df, spects = spect_df
+    if split is not None:
+        spects = [spect for spect, df_split in zip(spects, df["split"]) if df_split == split]
+    spect_standardizer, n_timebins = vak.transforms.StandardizeSpect.fit_df(
+        df, split=split, return_n_timebins=True
+    )
+    concatenated = np.concatenate(spects, axis=1)
+    assert n_timebins == concatenated.shape[1]
+    np.testing.assert_allclose(spect_standardizer.mean_freqs, concatenated.mean(axis=1))
+    np.testing.assert_allclose(spect_standardizer.std_freqs, concatenated.std(axis=1))
+
+    # gives same result as fitting to all spectrograms at once
+    expected = vak.transforms.StandardizeSpect.fit(concatenated)
+    np.testing.assert_allclose(
+        spect_standardizer(spects[0]), expected(spects[0]), rtol=1e-10
+    )
+
+
+def test_standardize_spect_fit_df_split_not_found(spect_df):
+    df, _ = spect_df
+    with pytest.raises(ValueError):
+        vak.transforms.StandardizeSpect.fit_df(df, split="test")